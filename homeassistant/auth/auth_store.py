@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional  # noqa: F401
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import JournalCollection
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -38,7 +39,15 @@ class AuthStore:
         self._groups = None  # type: Optional[Dict[str, models.Group]]
         self._perm_lookup = None  # type: Optional[PermissionLookup]
         self._store = hass.helpers.storage.Store(
-            STORAGE_VERSION, STORAGE_KEY, private=True
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            private=True,
+            journal=True,
+            journal_collections={
+                "refresh_tokens": JournalCollection(
+                    ["refresh_tokens"], ["id"], self._refresh_token_data
+                )
+            },
         )
         self._lock = asyncio.Lock()
 
@@ -224,7 +233,7 @@ class AuthStore:
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
 
-        self._async_schedule_save()
+        self._async_schedule_save(refresh_token.id)
         return refresh_token
 
     async def async_remove_refresh_token(
@@ -237,7 +246,7 @@ class AuthStore:
 
         for user in self._users.values():
             if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
+                self._async_schedule_save(refresh_token.id)
                 break
 
     async def async_get_refresh_token(
@@ -279,7 +288,7 @@ class AuthStore:
         """Update refresh token last used information."""
         refresh_token.last_used_at = dt_util.utcnow()
         refresh_token.last_used_ip = remote_ip
-        self._async_schedule_save()
+        self._async_schedule_save(refresh_token.id)
 
     async def _async_load(self) -> None:
         """Load the users."""
@@ -476,12 +485,33 @@ class AuthStore:
         self._users = users
 
     @callback
-    def _async_schedule_save(self) -> None:
-        """Save users."""
+    def _async_schedule_save(self, *refresh_token_ids: str) -> None:
+        """Save users.
+
+        If only refresh tokens changed, pass their ids to only write those.
+        """
         if self._users is None:
             return
 
-        self._store.async_delay_save(self._data_to_save, 1)
+        self._store.async_delay_save(
+            self._data_to_save,
+            1,
+            changed={"refresh_tokens": list(refresh_token_ids)}
+            if refresh_token_ids
+            else None,
+        )
+
+    @callback
+    def _refresh_token_data(self, token_id: str) -> Optional[Dict]:
+        """Return the data of a refresh token to store, None if removed."""
+        assert self._users is not None
+
+        for user in self._users.values():
+            refresh_token = user.refresh_tokens.get(token_id)
+            if refresh_token is not None:
+                return _refresh_token_data(user, refresh_token)
+
+        return None
 
     @callback
     def _data_to_save(self) -> Dict:
@@ -527,22 +557,7 @@ class AuthStore:
         ]
 
         refresh_tokens = [
-            {
-                "id": refresh_token.id,
-                "user_id": user.id,
-                "client_id": refresh_token.client_id,
-                "client_name": refresh_token.client_name,
-                "client_icon": refresh_token.client_icon,
-                "token_type": refresh_token.token_type,
-                "created_at": refresh_token.created_at.isoformat(),
-                "access_token_expiration": refresh_token.access_token_expiration.total_seconds(),
-                "token": refresh_token.token,
-                "jwt_key": refresh_token.jwt_key,
-                "last_used_at": refresh_token.last_used_at.isoformat()
-                if refresh_token.last_used_at
-                else None,
-                "last_used_ip": refresh_token.last_used_ip,
-            }
+            _refresh_token_data(user, refresh_token)
             for user in self._users.values()
             for refresh_token in user.refresh_tokens.values()
         ]
@@ -596,3 +611,25 @@ def _system_read_only_group() -> models.Group:
         policy=system_policies.READ_ONLY_POLICY,
         system_generated=True,
     )
+
+
+def _refresh_token_data(
+    user: models.User, refresh_token: models.RefreshToken
+) -> Dict[str, Any]:
+    """Return the data of a refresh token to store."""
+    return {
+        "id": refresh_token.id,
+        "user_id": user.id,
+        "client_id": refresh_token.client_id,
+        "client_name": refresh_token.client_name,
+        "client_icon": refresh_token.client_icon,
+        "token_type": refresh_token.token_type,
+        "created_at": refresh_token.created_at.isoformat(),
+        "access_token_expiration": refresh_token.access_token_expiration.total_seconds(),
+        "token": refresh_token.token,
+        "jwt_key": refresh_token.jwt_key,
+        "last_used_at": refresh_token.last_used_at.isoformat()
+        if refresh_token.last_used_at
+        else None,
+        "last_used_ip": refresh_token.last_used_ip,
+    }
@@ -23,6 +23,8 @@ from homeassistant.const import (
     URL_API_DISCOVERY_INFO,
     URL_API_ERROR_LOG,
     URL_API_EVENTS,
+    URL_API_EXECUTORS,
+    URL_API_EXPORTERS,
     URL_API_SERVICES,
     URL_API_STATES,
     URL_API_STATES_ENTITY,
@@ -33,7 +35,7 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.exceptions import TemplateError, Unauthorized, ServiceNotFound
-from homeassistant.helpers import template
+from homeassistant.helpers import state_exporter, template
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.state import AsyncTrackStates
 from homeassistant.helpers.json import JSONEncoder
@@ -64,6 +66,8 @@ def setup(hass, config):
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIComponentsView)
     hass.http.register_view(APITemplateView)
+    hass.http.register_view(APIExecutorsView)
+    hass.http.register_view(APIExportersView)
 
     if DATA_LOGGING in hass.data:
         hass.http.register_view(APIErrorLog)
@@ -204,7 +208,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            return self.json_encoded(
+                b"[" + b",".join(state.as_json() for state in states) + b"]"
+            )
+        except (ValueError, TypeError):
+            return self.json(states)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -222,7 +231,10 @@ class APIEntityStateView(HomeAssistantView):
 
         state = request.app["hass"].states.get(entity_id)
         if state:
-            return self.json(state)
+            try:
+                return self.json_encoded(state.as_json())
+            except (ValueError, TypeError):
+                return self.json(state)
         return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -372,6 +384,34 @@ class APIComponentsView(HomeAssistantView):
         return self.json(request.app["hass"].config.components)
 
 
+class APIExecutorsView(HomeAssistantView):
+    """View to handle executor metrics requests."""
+
+    url = URL_API_EXECUTORS
+    name = "api:executors"
+
+    @ha.callback
+    def get(self, request):
+        """Get the metrics of the executors."""
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+        return self.json(request.app["hass"].async_executor_metrics())
+
+
+class APIExportersView(HomeAssistantView):
+    """View to handle state exporter metrics requests."""
+
+    url = URL_API_EXPORTERS
+    name = "api:exporters"
+
+    @ha.callback
+    def get(self, request):
+        """Get the counters of the state exporters."""
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+        return self.json(state_exporter.async_export_stats(request.app["hass"]))
+
+
 class APITemplateView(HomeAssistantView):
     """View to handle Template requests."""
 
@@ -1,5 +1,6 @@
 """Allow to set up simple automation rules via the config file."""
 import asyncio
+from collections import Counter, OrderedDict
 from functools import partial
 import importlib
 import logging
@@ -19,7 +20,7 @@ from homeassistant.const import (
     SERVICE_TURN_ON,
     STATE_ON,
 )
-from homeassistant.core import Context, CoreState
+from homeassistant.core import Context, CoreState, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import condition, extract_domain_configs, script
 import homeassistant.helpers.config_validation as cv
@@ -163,8 +164,8 @@ async def async_setup(hass, config):
             await asyncio.wait(tasks)
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Update the automations that changed in the config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -369,54 +370,65 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations are identified by their id, or by their name if they have no id.
+    Only automations of which the config changed are set up again.
+
     This method is a coroutine.
     """
-    entities = []
+    configs = OrderedDict()
+    seen = Counter()
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf = config[config_key]
 
         for list_no, config_block in enumerate(conf):
-            automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
+            base_key = config_block.get(CONF_ID) or name
+            # Automations can share a name, these are matched in order
+            seen[base_key] += 1
+            configs[(base_key, seen[base_key])] = (name, config_block)
 
-            hidden = config_block[CONF_HIDE_ENTITY]
-            initial_state = config_block.get(CONF_INITIAL_STATE)
+    @callback
+    def create_entity(key, name_config):
+        """Create an automation entity."""
+        return _async_create_entity(hass, config, *name_config)
 
-            action = _async_get_action(hass, config_block.get(CONF_ACTION, {}), name)
+    await component.async_update_config_entities(configs, create_entity)
 
-            if CONF_CONDITION in config_block:
-                cond_func = _async_process_if(hass, config, config_block)
 
-                if cond_func is None:
-                    continue
-            else:
+@callback
+def _async_create_entity(hass, config, name, config_block):
+    """Create an automation entity from its config."""
+    automation_id = config_block.get(CONF_ID)
+    hidden = config_block[CONF_HIDE_ENTITY]
+    initial_state = config_block.get(CONF_INITIAL_STATE)
 
-                def cond_func(variables):
-                    """Condition will always pass."""
-                    return True
+    action = _async_get_action(hass, config_block.get(CONF_ACTION, {}), name)
 
-            async_attach_triggers = partial(
-                _async_process_trigger,
-                hass,
-                config,
-                config_block.get(CONF_TRIGGER, []),
-                name,
-            )
-            entity = AutomationEntity(
-                automation_id,
-                name,
-                async_attach_triggers,
-                cond_func,
-                action,
-                hidden,
-                initial_state,
-            )
+    if CONF_CONDITION in config_block:
+        cond_func = _async_process_if(hass, config, config_block)
 
-            entities.append(entity)
+        if cond_func is None:
+            return None
+    else:
+
+        def cond_func(variables):
+            """Condition will always pass."""
+            return True
+
+    async_attach_triggers = partial(
+        _async_process_trigger, hass, config, config_block.get(CONF_TRIGGER, []), name
+    )
 
-    if entities:
-        await component.async_add_entities(entities)
+    return AutomationEntity(
+        automation_id,
+        name,
+        async_attach_triggers,
+        cond_func,
+        action,
+        hidden,
+        initial_state,
+    )
 
 
 def _async_get_action(hass, config, name):
@@ -1,9 +1,10 @@
 """Offer event listening automation rules."""
 import logging
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import voluptuous as vol
 
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import CONF_PLATFORM
 from homeassistant.helpers import config_validation as cv
 
@@ -13,6 +14,8 @@ from homeassistant.helpers import config_validation as cv
 CONF_EVENT_TYPE = "event_type"
 CONF_EVENT_DATA = "event_data"
 
+DATA_EVENT_TRIGGERS = "automation_event_triggers"
+
 _LOGGER = logging.getLogger(__name__)
 
 TRIGGER_SCHEMA = vol.Schema(
@@ -23,33 +26,170 @@ TRIGGER_SCHEMA = vol.Schema(
     }
 )
 
+# Values that voluptuous compares by equality and that can be used as dict keys
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+
 
 async def async_trigger(hass, config, action, automation_info):
     """Listen for events based on configuration."""
     event_type = config.get(CONF_EVENT_TYPE)
-    event_data_schema = (
-        vol.Schema(config.get(CONF_EVENT_DATA), extra=vol.ALLOW_EXTRA)
-        if config.get(CONF_EVENT_DATA)
-        else None
-    )
+    dispatchers = hass.data.setdefault(DATA_EVENT_TRIGGERS, {})
+    dispatcher = dispatchers.get(event_type)
+
+    if dispatcher is None:
+        dispatcher = dispatchers[event_type] = EventTriggerDispatcher(hass, event_type)
+
+    return dispatcher.async_add_trigger(config.get(CONF_EVENT_DATA), action)
+
+
+class EventTrigger:
+    """An event trigger and the event data it matches."""
+
+    def __init__(
+        self, trigger_id: int, event_data: Optional[Dict], action: Callable
+    ) -> None:
+        """Initialize the event trigger."""
+        self.trigger_id = trigger_id
+        self.action = action
+        self.items = None  # type: Optional[Tuple[Tuple[Any, Any], ...]]
+        self.schema = None  # type: Optional[vol.Schema]
+
+        if not event_data:
+            self.items = ()
+        elif all(isinstance(value, _LITERAL_TYPES) for value in event_data.values()):
+            self.items = tuple(event_data.items())
+        else:
+            self.schema = vol.Schema(event_data, extra=vol.ALLOW_EXTRA)
+
+    def matches(self, data):
+        """Return if the event data matches.
+
+        Like the schema, keys missing from the event data are not checked.
+        """
+        if self.schema is None:
+            return all(
+                key not in data or data[key] == value for key, value in self.items
+            )
+
+        try:
+            self.schema(data)
+        except vol.Invalid:
+            return False
+
+        return True
+
+
+class EventTriggerDispatcher:
+    """Dispatch the events of one type to the triggers they can match.
+
+    Triggers that only match literal values are indexed by one of their key and
+    value pairs, so an event only needs to be checked against the triggers of
+    the values it carries. Other triggers are checked against every event.
+    """
+
+    def __init__(self, hass: HomeAssistant, event_type: str) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self.event_type = event_type
+        self._next_id = 0
+        # Triggers checked against every event
+        self._unindexed = {}  # type: Dict[int, EventTrigger]
+        # Key -> value -> triggers indexed by that pair
+        self._indexed = {}  # type: Dict[Any, Dict[Any, Dict[int, EventTrigger]]]
+        self._unsub = None
 
     @callback
-    def handle_event(event):
-        """Listen for events and calls the action when data matches."""
-        if event_data_schema:
-            # Check that the event data matches the configured
-            # schema if one was provided
-            try:
-                event_data_schema(event.data)
-            except vol.Invalid:
-                # If event data doesn't match requested schema, skip event
-                return
-
-        hass.async_run_job(
-            action(
-                {"trigger": {"platform": "event", "event": event}},
-                context=event.context,
+    def async_add_trigger(self, event_data, action):
+        """Add a trigger and return a function that removes it."""
+        trigger = EventTrigger(self._next_id, event_data, action)
+        self._next_id += 1
+
+        if trigger.items:
+            key, value = self._pick_index_item(trigger.items)
+            triggers = self._indexed.setdefault(key, {}).setdefault(value, {})
+        else:
+            triggers = self._unindexed
+
+        triggers[trigger.trigger_id] = trigger
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                self.event_type, self._async_handle_event
             )
-        )
 
-    return hass.bus.async_listen(event_type, handle_event)
+        @callback
+        def async_remove():
+            """Remove the trigger."""
+            del triggers[trigger.trigger_id]
+
+            if trigger.items:
+                by_value = self._indexed[key]
+                if not triggers:
+                    del by_value[value]
+                if not by_value:
+                    del self._indexed[key]
+
+            if not self._unindexed and not self._indexed:
+                self._unsub()
+                self._unsub = None
+                self.hass.data[DATA_EVENT_TRIGGERS].pop(self.event_type)
+
+        return async_remove
+
+    def _pick_index_item(self, items):
+        """Pick the key and value to index a trigger by.
+
+        Prefer keys other triggers are indexed by, with the fewest triggers for
+        the value, so events are checked against few distinct keys.
+        """
+        best = None  # type: Optional[Tuple[Any, Any]]
+        best_count = 0
+
+        for key, value in items:
+            by_value = self._indexed.get(key)
+            if by_value is None:
+                continue
+
+            count = len(by_value.get(value, ()))
+            if best is None or count < best_count:
+                best = (key, value)
+                best_count = count
+
+        return items[0] if best is None else best
+
+    @callback
+    def _async_handle_event(self, event):
+        """Run the actions of the triggers the event matches."""
+        data = event.data
+        candidates = list(self._unindexed.values())
+
+        for key, by_value in self._indexed.items():
+            if key not in data:
+                # Missing keys are not checked, all these triggers can match
+                for triggers in by_value.values():
+                    candidates.extend(triggers.values())
+                continue
+
+            try:
+                triggers = by_value.get(data[key])
+            except TypeError:
+                # Unhashable values never equal a literal
+                continue
+
+            if triggers:
+                candidates.extend(triggers.values())
+
+        if len(candidates) > 1:
+            # Keep the order in which the triggers were added
+            candidates.sort(key=lambda trigger: trigger.trigger_id)
+
+        for trigger in candidates:
+            if not trigger.matches(data):
+                continue
+
+            self.hass.async_run_job(
+                trigger.action(
+                    {"trigger": {"platform": "event", "event": event}},
+                    context=event.context,
+                )
+            )
@@ -371,7 +371,9 @@ class Camera(Entity):
 
         This method must be run in the event loop and returns a coroutine.
         """
-        return self.hass.async_add_job(self.camera_image)
+        return self.hass.async_add_executor_job(
+            self.camera_image, executor=self._async_get_executor()
+        )
 
     async def handle_async_still_stream(self, request, interval):
         """Generate an HTTP MJPEG stream from camera images.
@@ -8,10 +8,9 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_PREFIX,
     EVENT_LOGBOOK_ENTRY,
-    EVENT_STATE_CHANGED,
     STATE_UNKNOWN,
 )
-from homeassistant.helpers import state as state_helper
+from homeassistant.helpers import state_exporter
 import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -68,38 +67,35 @@ def setup(hass, config):
 
         _LOGGER.debug("Sent event %s", event.data.get("entity_id"))
 
-    def state_changed_listener(event):
-        """Listen for new messages on the bus and sends them to Datadog."""
-        state = event.data.get("new_state")
+    def state_changed_listener(records):
+        """Send batches of state changes to Datadog."""
+        for record in records:
+            if record.state == STATE_UNKNOWN:
+                continue
 
-        if state is None or state.state == STATE_UNKNOWN:
-            return
+            if record.attributes.get("hidden") is True:
+                continue
 
-        if state.attributes.get("hidden") is True:
-            return
+            metric = "{}.{}".format(prefix, record.domain)
+            tags = ["entity:{}".format(record.entity_id)]
 
-        states = dict(state.attributes)
-        metric = "{}.{}".format(prefix, state.domain)
-        tags = ["entity:{}".format(state.entity_id)]
-
-        for key, value in states.items():
-            if isinstance(value, (float, int)):
+            for key, value in record.numeric_attributes.items():
                 attribute = "{}.{}".format(metric, key.replace(" ", "_"))
                 statsd.gauge(attribute, value, sample_rate=sample_rate, tags=tags)
 
                 _LOGGER.debug("Sent metric %s: %s (tags: %s)", attribute, value, tags)
 
-        try:
-            value = state_helper.state_as_number(state)
-        except ValueError:
-            _LOGGER.debug("Error sending %s: %s (tags: %s)", metric, state.state, tags)
-            return
+            if record.value is None:
+                _LOGGER.debug(
+                    "Error sending %s: %s (tags: %s)", metric, record.state, tags
+                )
+                continue
 
-        statsd.gauge(metric, value, sample_rate=sample_rate, tags=tags)
+            statsd.gauge(metric, record.value, sample_rate=sample_rate, tags=tags)
 
-        _LOGGER.debug("Sent metric %s: %s (tags: %s)", metric, value, tags)
+            _LOGGER.debug("Sent metric %s: %s (tags: %s)", metric, record.value, tags)
 
     hass.bus.listen(EVENT_LOGBOOK_ENTRY, logbook_entry_listener)
-    hass.bus.listen(EVENT_STATE_CHANGED, state_changed_listener)
+    state_exporter.subscribe(hass, DOMAIN, state_changed_listener)
 
     return True
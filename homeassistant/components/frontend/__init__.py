@@ -1,4 +1,5 @@
 """Handle the frontend for Home Assistant."""
+import hashlib
 import json
 import logging
 import mimetypes
@@ -70,6 +71,7 @@ DATA_EXTRA_MODULE_URL = "frontend_extra_module_url"
 DATA_EXTRA_JS_URL_ES5 = "frontend_extra_js_url_es5"
 DATA_THEMES = "frontend_themes"
 DATA_DEFAULT_THEME = "frontend_default_theme"
+DATA_INDEX_PAGE = "frontend_index_page"
 DEFAULT_THEME = "default"
 
 PRIMARY_COLOR = "primary-color"
@@ -220,6 +222,7 @@ def add_extra_html_url(hass, url, es5=False):
     if url_set is None:
         url_set = hass.data[key] = set()
     url_set.add(url)
+    hass.data.pop(DATA_INDEX_PAGE, None)
 
 
 def add_extra_js_url(hass, url, es5=False):
@@ -229,6 +232,7 @@ def add_extra_js_url(hass, url, es5=False):
     if url_set is None:
         url_set = hass.data[key] = set()
     url_set.add(url)
+    hass.data.pop(DATA_INDEX_PAGE, None)
 
 
 def add_manifest_json_key(key, val):
@@ -448,25 +452,47 @@ class IndexView(web_urldispatcher.AbstractResource):
         return tpl
 
     async def get(self, request: web.Request):
-        """Serve the index page for panel pages."""
+        """Serve the index page for panel pages.
+
+        The rendered page is cached until the theme color or the extra urls
+        change, unless running from the frontend repository.
+        """
         hass = request.app["hass"]
 
         if not hass.components.onboarding.async_is_onboarded():
             return web.Response(status=302, headers={"location": "/onboarding.html"})
 
-        template = self._template_cache
+        theme_color = MANIFEST_JSON["theme_color"]
+        page = hass.data.get(DATA_INDEX_PAGE)
 
-        if template is None:
-            template = await hass.async_add_executor_job(self.get_template)
+        if page is None or page[0] != theme_color:
+            template = self._template_cache
 
-        return web.Response(
-            text=template.render(
-                theme_color=MANIFEST_JSON["theme_color"],
+            if template is None:
+                template = await hass.async_add_executor_job(self.get_template)
+
+            body = template.render(
+                theme_color=theme_color,
                 extra_urls=hass.data[DATA_EXTRA_HTML_URL],
                 extra_modules=hass.data[DATA_EXTRA_MODULE_URL],
                 extra_js_es5=hass.data[DATA_EXTRA_JS_URL_ES5],
-            ),
+            ).encode("utf-8")
+            etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+            page = (theme_color, body, etag)
+
+            if self.repo_path is None:
+                hass.data[DATA_INDEX_PAGE] = page
+
+        _, body, etag = page
+
+        if etag in request.headers.get(hdrs.IF_NONE_MATCH, ""):
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+
+        return web.Response(
+            body=body,
             content_type="text/html",
+            charset="utf-8",
+            headers={hdrs.ETAG: etag},
         )
 
     def __len__(self) -> int:
@@ -1,22 +1,13 @@
 """Support for sending data to a Graphite installation."""
 import logging
-import queue
 import socket
-import threading
 import time
 
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
-from homeassistant.const import (
-    CONF_HOST,
-    CONF_PORT,
-    CONF_PREFIX,
-    EVENT_HOMEASSISTANT_START,
-    EVENT_HOMEASSISTANT_STOP,
-    EVENT_STATE_CHANGED,
-)
-from homeassistant.helpers import state
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PREFIX
+from homeassistant.helpers import state_exporter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,44 +50,24 @@ def setup(hass, config):
     return True
 
 
-class GraphiteFeeder(threading.Thread):
+class GraphiteFeeder:
     """Feed data to Graphite."""
 
     def __init__(self, hass, host, port, prefix):
         """Initialize the feeder."""
-        super(GraphiteFeeder, self).__init__(daemon=True)
         self._hass = hass
         self._host = host
         self._port = port
         # rstrip any trailing dots in case they think they need it
         self._prefix = prefix.rstrip(".")
-        self._queue = queue.Queue()
-        self._quit_object = object()
-        self._we_started = False
 
-        hass.bus.listen_once(EVENT_HOMEASSISTANT_START, self.start_listen)
-        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, self.shutdown)
-        hass.bus.listen(EVENT_STATE_CHANGED, self.event_listener)
+        state_exporter.subscribe(hass, DOMAIN, self.event_listener)
         _LOGGER.debug("Graphite feeding to %s:%i initialized", self._host, self._port)
 
-    def start_listen(self, event):
-        """Start event-processing thread."""
-        _LOGGER.debug("Event processing thread started")
-        self._we_started = True
-        self.start()
-
-    def shutdown(self, event):
-        """Signal shutdown of processing event."""
-        _LOGGER.debug("Event processing signaled exit")
-        self._queue.put(self._quit_object)
-
-    def event_listener(self, event):
-        """Queue an event for processing."""
-        if self.is_alive() or not self._we_started:
-            _LOGGER.debug("Received event")
-            self._queue.put(event)
-        else:
-            _LOGGER.error("Graphite feeder thread has died, not queuing event")
+    def event_listener(self, records):
+        """Send a batch of state changes, run in the executor."""
+        _LOGGER.debug("Processing %d states", len(records))
+        self._report_attributes(records)
 
     def _send_to_graphite(self, data):
         """Send data to Graphite."""
@@ -107,20 +78,23 @@ class GraphiteFeeder(threading.Thread):
         sock.send("\n".encode("ascii"))
         sock.close()
 
-    def _report_attributes(self, entity_id, new_state):
-        """Report the attributes."""
+    def _report_attributes(self, records):
+        """Report the attributes of a batch of states with one connection."""
         now = time.time()
-        things = dict(new_state.attributes)
-        try:
-            things["state"] = state.state_as_number(new_state)
-        except ValueError:
-            pass
-        lines = [
-            "%s.%s.%s %f %i"
-            % (self._prefix, entity_id, key.replace(" ", "_"), value, now)
-            for key, value in things.items()
-            if isinstance(value, (float, int))
-        ]
+        lines = []
+
+        for record in records:
+            things = dict(record.numeric_attributes)
+
+            if record.value is not None:
+                things["state"] = record.value
+
+            lines.extend(
+                "%s.%s.%s %f %i"
+                % (self._prefix, record.entity_id, key.replace(" ", "_"), value, now)
+                for key, value in things.items()
+            )
+
         if not lines:
             return
         _LOGGER.debug("Sending to graphite: %s", lines)
@@ -130,28 +104,3 @@ class GraphiteFeeder(threading.Thread):
             _LOGGER.error("Unable to connect to host %s", self._host)
         except socket.error:
             _LOGGER.exception("Failed to send data to graphite")
-
-    def run(self):
-        """Run the process to export the data."""
-        while True:
-            event = self._queue.get()
-            if event == self._quit_object:
-                _LOGGER.debug("Event processing thread stopped")
-                self._queue.task_done()
-                return
-            if event.event_type == EVENT_STATE_CHANGED and event.data.get("new_state"):
-                _LOGGER.debug(
-                    "Processing STATE_CHANGED event for %s", event.data["entity_id"]
-                )
-                try:
-                    self._report_attributes(
-                        event.data["entity_id"], event.data["new_state"]
-                    )
-                except Exception:  # pylint: disable=broad-except
-                    # Catch this so we can avoid the thread dying and
-                    # make it visible.
-                    _LOGGER.exception("Failed to process STATE_CHANGED event")
-            else:
-                _LOGGER.warning("Processing unexpected event type %s", event.event_type)
-
-            self._queue.task_done()
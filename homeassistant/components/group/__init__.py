@@ -211,16 +211,12 @@ async def async_setup(hass, config):
     await _async_process_config(hass, config, component)
 
     async def reload_service_handler(service):
-        """Remove all user-defined groups and load new ones from config."""
-        auto = list(filter(lambda e: not e.user_defined, component.entities))
-
-        conf = await component.async_prepare_reload()
+        """Update the user-defined groups that changed in the config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
 
-        await component.async_add_entities(auto)
-
     hass.services.async_register(
         DOMAIN, SERVICE_RELOAD, reload_service_handler, schema=RELOAD_SERVICE_SCHEMA
     )
@@ -347,26 +343,32 @@ async def async_setup(hass, config):
 
 async def _async_process_config(hass, config, component):
     """Process group configuration."""
-    for object_id, conf in config.get(DOMAIN, {}).items():
-        name = conf.get(CONF_NAME, object_id)
-        entity_ids = conf.get(CONF_ENTITIES) or []
-        icon = conf.get(CONF_ICON)
-        view = conf.get(CONF_VIEW)
-        control = conf.get(CONF_CONTROL)
-        mode = conf.get(CONF_ALL)
-
-        # Don't create tasks and await them all. The order is important as
-        # groups get a number based on creation order.
-        await Group.async_create_group(
+    # Groups get a number based on creation order
+    order = len(hass.states.async_entity_ids(DOMAIN))
+
+    def create_entity(object_id, conf):
+        """Create a group entity."""
+        nonlocal order
+
+        group = Group(
             hass,
-            name,
-            entity_ids,
-            icon=icon,
-            view=view,
-            control=control,
-            object_id=object_id,
-            mode=mode,
+            conf.get(CONF_NAME, object_id),
+            order=order,
+            icon=conf.get(CONF_ICON),
+            view=conf.get(CONF_VIEW),
+            control=conf.get(CONF_CONTROL),
+            entity_ids=conf.get(CONF_ENTITIES) or [],
+            mode=conf.get(CONF_ALL),
+        )
+        group.entity_id = async_generate_entity_id(
+            ENTITY_ID_FORMAT, object_id, hass=hass
         )
+        order += 1
+        return group
+
+    await component.async_update_config_entities(
+        config.get(DOMAIN, {}), create_entity, True
+    )
 
 
 class Group(Entity):
@@ -58,10 +58,14 @@ def get_significant_states(
     thermostat so that we get current temperature in our graphs).
     """
     timer_start = time.perf_counter()
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        LAZY_STATE_COLUMNS,
+        LazyState,
+        States,
+    )
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(*LAZY_STATE_COLUMNS).filter(
             (
                 States.domain.in_(SIGNIFICANT_DOMAINS)
                 | (States.last_changed == States.last_updated)
@@ -79,8 +83,8 @@ def get_significant_states(
 
         states = (
             state
-            for state in execute(query)
-            if (_is_significant(state) and not state.attributes.get(ATTR_HIDDEN, False))
+            for state in execute(query, LazyState)
+            if (_is_significant(state) and not state.get_attribute(ATTR_HIDDEN, False))
         )
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
@@ -94,10 +98,14 @@ def get_significant_states(
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        LAZY_STATE_COLUMNS,
+        LazyState,
+        States,
+    )
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(*LAZY_STATE_COLUMNS).filter(
             (States.last_changed == States.last_updated)
             & (States.last_updated > start_time)
         )
@@ -106,33 +114,38 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             query = query.filter(States.last_updated < end_time)
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
-        states = execute(query.order_by(States.last_updated))
+        states = execute(query.order_by(States.last_updated), LazyState)
 
     return states_to_json(hass, states, start_time, entity_ids)
 
 
 def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        LAZY_STATE_COLUMNS,
+        LazyState,
+        States,
+    )
 
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(*LAZY_STATE_COLUMNS).filter(
             (States.last_changed == States.last_updated)
         )
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
         states = execute(
-            query.order_by(States.last_updated.desc()).limit(number_of_states)
+            query.order_by(States.last_updated.desc()).limit(number_of_states),
+            LazyState,
         )
 
     return states_to_json(
@@ -142,7 +155,11 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
 def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None):
     """Return the states at a specific point in time."""
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        LAZY_STATE_COLUMNS,
+        LazyState,
+        States,
+    )
 
     if run is None:
         run = recorder.run_information(hass, utc_point_in_time)
@@ -154,7 +171,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
     from sqlalchemy import and_, func
 
     with session_scope(hass=hass) as session:
-        query = session.query(States)
+        query = session.query(*LAZY_STATE_COLUMNS)
 
         if entity_ids and len(entity_ids) == 1:
             # Use an entirely different (and extremely fast) query if we only
@@ -216,8 +233,8 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
 
         return [
             state
-            for state in execute(query)
-            if not state.attributes.get(ATTR_HIDDEN, False)
+            for state in execute(query, LazyState)
+            if not state.get_attribute(ATTR_HIDDEN, False)
         ]
 
 
@@ -362,7 +379,24 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result.extend(result)
             result = sorted_result
 
-        return await hass.async_add_job(self.json, result)
+        return await hass.async_add_job(self._json_states, result)
+
+    def _json_states(self, result):
+        """Return a JSON response of the lists of states.
+
+        The response is joined from the JSON of the states, which for states
+        read from the database reuses their stored attributes.
+        """
+        try:
+            msg = b"[%s]" % b",".join(
+                b"[%s]" % b",".join(state.as_json() for state in states)
+                for states in result
+            )
+        except (ValueError, TypeError):
+            # Let the generic encoder log the error
+            return self.json(result)
+
+        return self.json_encoded(msg)
 
 
 class Filters:
@@ -436,4 +470,4 @@ def _is_significant(state):
     Will only test for things that are not filtered out in SQL.
     """
     # scripts that are not cancellable will never change state
-    return state.domain != "script" or state.attributes.get(script.ATTR_CAN_CANCEL)
+    return state.domain != "script" or state.get_attribute(script.ATTR_CAN_CANCEL)
@@ -21,8 +21,15 @@ from homeassistant.util.logging import HideSensitiveDataFilter
 
 from .auth import setup_auth
 from .ban import setup_bans
-from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_HASS_USER, KEY_REAL_IP  # noqa
+from .const import (  # noqa
+    KEY_AUTHENTICATED,
+    KEY_HASS,
+    KEY_HASS_USER,
+    KEY_HTTP_METRICS,
+    KEY_REAL_IP,
+)
 from .cors import setup_cors
+from .metrics import HttpMetrics, setup_metrics  # noqa
 from .real_ip import setup_real_ip
 from .static import CACHE_HEADERS, CachingStaticResource
 from .view import HomeAssistantView  # noqa
@@ -46,6 +53,7 @@ CONF_TRUSTED_NETWORKS = "trusted_networks"
 CONF_LOGIN_ATTEMPTS_THRESHOLD = "login_attempts_threshold"
 CONF_IP_BAN_ENABLED = "ip_ban_enabled"
 CONF_SSL_PROFILE = "ssl_profile"
+CONF_METRICS = "metrics"
 
 SSL_MODERN = "modern"
 SSL_INTERMEDIATE = "intermediate"
@@ -110,6 +118,7 @@ HTTP_SCHEMA = vol.Schema(
             CONF_LOGIN_ATTEMPTS_THRESHOLD, default=NO_LOGIN_ATTEMPT_THRESHOLD
         ): vol.Any(cv.positive_int, NO_LOGIN_ATTEMPT_THRESHOLD),
         vol.Optional(CONF_IP_BAN_ENABLED, default=True): cv.boolean,
+        vol.Optional(CONF_METRICS, default=False): cv.boolean,
         vol.Optional(CONF_SSL_PROFILE, default=SSL_MODERN): vol.In(
             [SSL_INTERMEDIATE, SSL_MODERN]
         ),
@@ -160,6 +169,7 @@ async def async_setup(hass, config):
     is_ban_enabled = conf[CONF_IP_BAN_ENABLED]
     login_threshold = conf[CONF_LOGIN_ATTEMPTS_THRESHOLD]
     ssl_profile = conf[CONF_SSL_PROFILE]
+    metrics = conf[CONF_METRICS]
 
     if api_password is not None:
         logging.getLogger("aiohttp.access").addFilter(
@@ -179,6 +189,7 @@ async def async_setup(hass, config):
         login_threshold=login_threshold,
         is_ban_enabled=is_ban_enabled,
         ssl_profile=ssl_profile,
+        metrics=metrics,
     )
 
     async def stop_server(event):
@@ -227,6 +238,7 @@ class HomeAssistantHTTP:
         login_threshold,
         is_ban_enabled,
         ssl_profile,
+        metrics=False,
     ):
         """Initialize the HTTP Home Assistant server."""
         app = self.app = web.Application(middlewares=[])
@@ -242,6 +254,9 @@ class HomeAssistantHTTP:
 
         setup_cors(app, cors_origins)
 
+        # Measures all other middleware, so it is set up last
+        self.metrics = setup_metrics(app) if metrics else None
+
         self.hass = hass
         self.ssl_certificate = ssl_certificate
         self.ssl_peer_certificate = ssl_peer_certificate
@@ -2,4 +2,5 @@
 KEY_AUTHENTICATED = "ha_authenticated"
 KEY_HASS = "hass"
 KEY_HASS_USER = "hass_user"
+KEY_HTTP_METRICS = "ha_http_metrics"
 KEY_REAL_IP = "ha_real_ip"
@@ -0,0 +1,235 @@
+"""Middleware that collects metrics of the HTTP requests per route."""
+import asyncio
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from aiohttp.web import Application, HTTPException, Request, middleware
+
+from homeassistant.core import callback
+
+from .const import KEY_HTTP_METRICS
+
+
+# mypy: allow-untyped-defs
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKET_LABELS = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+
+# Route of requests that did not match a route
+ROUTE_UNMATCHED = "unmatched"
+# Status of requests that were cancelled, for example by the client going away
+STATUS_CANCELLED = 499
+
+KEY_HANDLER_TIME = "ha_handler_time"
+
+
+class RouteMetrics:
+    """Metrics of the requests to one route."""
+
+    __slots__ = [
+        "requests",
+        "statuses",
+        "buckets",
+        "latency_sum",
+        "handler_sum",
+        "response_bytes",
+    ]
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.requests = 0
+        self.statuses = {}  # type: Dict[int, int]
+        # Count of requests per latency bucket, the last one is unbounded
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        # Time spent in the route handler, the rest is spent in middleware
+        self.handler_sum = 0.0
+        self.response_bytes = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the metrics."""
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "latency_buckets": dict(zip(BUCKET_LABELS, self.buckets)),
+            "latency_sum": self.latency_sum,
+            "handler_sum": self.handler_sum,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class HttpMetrics:
+    """Metrics of the HTTP requests per route."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.routes = {}  # type: Dict[str, RouteMetrics]
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @callback
+    def async_record(
+        self,
+        route: str,
+        status: int,
+        latency: float,
+        handler_time: Optional[float],
+        response_bytes: Optional[int],
+    ) -> None:
+        """Record a finished request."""
+        metrics = self.routes.get(route)
+
+        if metrics is None:
+            metrics = self.routes[route] = RouteMetrics()
+
+        metrics.requests += 1
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        metrics.latency_sum += latency
+
+        if handler_time is not None:
+            metrics.handler_sum += handler_time
+
+        if response_bytes is not None:
+            metrics.response_bytes += response_bytes
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "latency_buckets": list(LATENCY_BUCKETS),
+            "routes": {
+                route: metrics.as_dict() for route, metrics in self.routes.items()
+            },
+        }
+
+
+def _route_name(request: Request) -> str:
+    """Return the name of the route that handled a request."""
+    resource = request.match_info.route.resource
+
+    if resource is None:
+        return ROUTE_UNMATCHED
+
+    return resource.canonical  # type: ignore
+
+
+@callback
+def setup_metrics(app: Application) -> HttpMetrics:
+    """Add middleware collecting request metrics around all other middleware.
+
+    Must be called after the other middleware has been set up.
+    """
+    metrics = app[KEY_HTTP_METRICS] = HttpMetrics()
+
+    @middleware
+    async def metrics_middleware(request, handler):
+        """Measure the handling of a request, including other middleware."""
+        metrics.in_flight += 1
+        if metrics.in_flight > metrics.max_in_flight:
+            metrics.max_in_flight = metrics.in_flight
+
+        start = perf_counter()
+        status = 500
+        response_bytes = None
+
+        try:
+            response = await handler(request)
+            status = response.status
+            response_bytes = response.content_length
+            return response
+        except HTTPException as err:
+            status = err.status
+            raise
+        except asyncio.CancelledError:
+            status = STATUS_CANCELLED
+            raise
+        finally:
+            metrics.in_flight -= 1
+            metrics.async_record(
+                _route_name(request),
+                status,
+                perf_counter() - start,
+                request.get(KEY_HANDLER_TIME),
+                response_bytes,
+            )
+
+    @middleware
+    async def handler_time_middleware(request, handler):
+        """Measure the time spent in the route handler."""
+        start = perf_counter()
+
+        try:
+            return await handler(request)
+        finally:
+            request[KEY_HANDLER_TIME] = perf_counter() - start
+
+    app.middlewares.insert(0, metrics_middleware)
+    app.middlewares.append(handler_time_middleware)
+
+    return metrics
+
+
+def _label(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def metrics_lines(metrics: HttpMetrics, prefix: str = "") -> List[str]:
+    """Return the metrics in the Prometheus text exposition format."""
+    routes = [
+        (_label(route), route_metrics)
+        for route, route_metrics in metrics.routes.items()
+    ]
+    lines = [
+        f"# TYPE {prefix}http_requests_in_flight gauge",
+        f"{prefix}http_requests_in_flight {metrics.in_flight}",
+        f"# TYPE {prefix}http_requests_total counter",
+    ]
+
+    for route, route_metrics in routes:
+        for status, count in route_metrics.statuses.items():
+            lines.append(
+                f'{prefix}http_requests_total{{route="{route}",status="{status}"}} '
+                f"{count}"
+            )
+
+    lines.append(f"# TYPE {prefix}http_request_duration_seconds histogram")
+
+    for route, route_metrics in routes:
+        cumulative = 0
+        for bound, count in zip(BUCKET_LABELS, route_metrics.buckets):
+            cumulative += count
+            lines.append(
+                f"{prefix}http_request_duration_seconds_bucket"
+                f'{{route="{route}",le="{bound}"}} {cumulative}'
+            )
+        lines.append(
+            f'{prefix}http_request_duration_seconds_sum{{route="{route}"}} '
+            f"{route_metrics.latency_sum}"
+        )
+        lines.append(
+            f'{prefix}http_request_duration_seconds_count{{route="{route}"}} '
+            f"{route_metrics.requests}"
+        )
+
+    lines.append(f"# TYPE {prefix}http_handler_seconds_total counter")
+
+    for route, route_metrics in routes:
+        lines.append(
+            f'{prefix}http_handler_seconds_total{{route="{route}"}} '
+            f"{route_metrics.handler_sum}"
+        )
+
+    lines.append(f"# TYPE {prefix}http_response_bytes_total counter")
+
+    for route, route_metrics in routes:
+        lines.append(
+            f'{prefix}http_response_bytes_total{{route="{route}"}} '
+            f"{route_metrics.response_bytes}"
+        )
+
+    return lines
@@ -1,8 +1,14 @@
 """Static file handling for HTTP component."""
+import asyncio
+from collections import OrderedDict
+import mimetypes
+import os
 from pathlib import Path
+import time
+from typing import Dict, List, Optional, Tuple
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.web import FileResponse, Request, Response
 from aiohttp.web_exceptions import HTTPNotFound, HTTPForbidden
 from aiohttp.web_urldispatcher import StaticResource
 
@@ -12,14 +18,154 @@ from aiohttp.web_urldispatcher import StaticResource
 CACHE_TIME = 31 * 86400  # = 1 month
 CACHE_HEADERS = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
 
+# Files up to this size are kept in memory, with their compressed variants
+MAX_CACHED_FILE_SIZE = 512 * 1024
+# Bytes of file contents and files kept per resource, least recently used
+# files are dropped beyond that
+MAX_CACHE_SIZE = 16 * 1024 * 1024
+MAX_CACHED_FILES = 1000
+# Seconds before a cached file is checked for changes on disk again
+CACHE_CHECK_INTERVAL = 60
+# Precompressed variants by content encoding, in order of preference
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+_DIRECTORY = object()
+
+
+class StaticFile:
+    """A static file and its precompressed variants."""
+
+    __slots__ = ["path", "etag", "content_type", "body", "variants", "checked"]
+
+    def __init__(self, path: Path, etag: str) -> None:
+        """Initialize the file."""
+        self.path = path
+        self.etag = etag
+        self.content_type = (
+            mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+        )
+        # Content of the file if it is small enough to cache
+        self.body = None  # type: Optional[bytes]
+        # Content encoding, ETag and content of precompressed variants
+        self.variants = []  # type: List[Tuple[str, str, bytes]]
+        self.checked = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        """Return the bytes of the cached contents."""
+        return len(self.body or b"") + sum(len(variant[2]) for variant in self.variants)
+
+
+def _etag(stat: os.stat_result) -> str:
+    """Return the ETag of a file from its stat."""
+    return '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return if the request has an If-None-Match header matching etag."""
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+
+    if not if_none_match:
+        return False
+
+    for value in if_none_match.split(","):
+        value = value.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        if value in ("*", etag):
+            return True
+
+    return False
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Return the quality values of the codings of an Accept-Encoding header."""
+    accepted = {}
+
+    for coding in accept_encoding.lower().split(","):
+        name, *params = coding.split(";")
+        quality = 1.0
+
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name.strip():
+            accepted[name.strip()] = quality
+
+    return accepted
+
 
 # https://github.com/PyCQA/astroid/issues/633
 # pylint: disable=duplicate-bases
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Files are looked up in the executor and small files are kept in memory
+    together with the gzip and brotli variants found next to them, up to
+    MAX_CACHE_SIZE bytes and MAX_CACHED_FILES files. Requests are answered
+    from memory, with 304 responses for matching ETags.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the resource."""
+        super().__init__(*args, **kwargs)
+        # Least recently used first
+        self._files = OrderedDict()  # type: OrderedDict[str, StaticFile]
+        self._cache_size = 0
 
     async def _handle(self, request):
         rel_url = request.match_info["filename"]
+        static_file = self._files.get(rel_url)
+
+        if (
+            static_file is None
+            or time.monotonic() - static_file.checked > CACHE_CHECK_INTERVAL
+        ):
+            static_file = await asyncio.get_event_loop().run_in_executor(
+                None, self._load_file, request, rel_url, static_file
+            )
+
+            self._uncache(rel_url)
+
+            if static_file is None or static_file is _DIRECTORY:
+                # on opening a dir, load its contents if allowed
+                if static_file is _DIRECTORY:
+                    return await super()._handle(request)
+
+                raise HTTPNotFound
+
+            self._cache(rel_url, static_file)
+        else:
+            self._files.move_to_end(rel_url)
+
+        return self._response(request, static_file)
+
+    def _cache(self, rel_url, static_file):
+        """Keep a file, drop the least recently used ones beyond the limits."""
+        self._files[rel_url] = static_file
+        self._cache_size += static_file.size
+
+        while self._cache_size > MAX_CACHE_SIZE or len(self._files) > MAX_CACHED_FILES:
+            _, dropped = self._files.popitem(last=False)
+            self._cache_size -= dropped.size
+
+    def _uncache(self, rel_url):
+        """Drop a file."""
+        static_file = self._files.pop(rel_url, None)
+
+        if static_file is not None:
+            self._cache_size -= static_file.size
+
+    def _load_file(self, request, rel_url, static_file):
+        """Return the file for rel_url, reusing static_file if unchanged.
+
+        Returns None if there is no such file. Runs in the executor.
+        """
         try:
             filename = Path(rel_url)
             if filename.anchor:
@@ -38,12 +184,75 @@ class CachingStaticResource(StaticResource):
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
 
-        # on opening a dir, load its contents if allowed
         if filepath.is_dir():
-            return await super()._handle(request)
-        if filepath.is_file():
+            return _DIRECTORY
+        if not filepath.is_file():
+            return None
+
+        stat = filepath.stat()
+        etag = _etag(stat)
+
+        if (
+            static_file is not None
+            and static_file.path == filepath
+            and static_file.etag == etag
+        ):
+            static_file.checked = time.monotonic()
+            return static_file
+
+        static_file = StaticFile(filepath, etag)
+
+        if stat.st_size > MAX_CACHED_FILE_SIZE:
+            return static_file
+
+        static_file.body = filepath.read_bytes()
+
+        for encoding, suffix in ENCODING_SUFFIXES:
+            variant = filepath.with_name(filepath.name + suffix)
+
+            if not variant.is_file():
+                continue
+
+            variant_stat = variant.stat()
+
+            if variant_stat.st_size <= MAX_CACHED_FILE_SIZE:
+                static_file.variants.append(
+                    (encoding, _etag(variant_stat), variant.read_bytes())
+                )
+
+        return static_file
+
+    def _response(self, request, static_file):
+        """Return the response serving a file."""
+        headers = dict(CACHE_HEADERS)
+
+        if static_file.body is None:
+            headers[hdrs.ETAG] = static_file.etag
             # type ignore: https://github.com/aio-libs/aiohttp/pull/3976
             return FileResponse(  # type: ignore
-                filepath, chunk_size=self._chunk_size, headers=CACHE_HEADERS
+                static_file.path, chunk_size=self._chunk_size, headers=headers
             )
-        raise HTTPNotFound
+
+        headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        accepted = accepted_encodings(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        etag, body = static_file.etag, static_file.body
+        best_quality = 0.0
+
+        # Variants are in order of preference, which breaks ties
+        for encoding, variant_etag, variant_body in static_file.variants:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+
+            if quality > best_quality:
+                headers[hdrs.CONTENT_ENCODING] = encoding
+                etag, body = variant_etag, variant_body
+                best_quality = quality
+
+        headers[hdrs.ETAG] = etag
+
+        if _etag_matches(request, etag):
+            headers.pop(hdrs.CONTENT_ENCODING, None)
+            return Response(status=304, headers=headers)  # type: ignore
+
+        return Response(  # type: ignore
+            body=body, content_type=static_file.content_type, headers=headers
+        )
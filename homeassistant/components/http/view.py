@@ -1,6 +1,5 @@
 """Support for views."""
 import asyncio
-import json
 import logging
 from typing import List, Optional
 
@@ -15,7 +14,7 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_bytes
 
 from .ban import process_success_login
 from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_REAL_IP
@@ -47,12 +46,15 @@ class HomeAssistantView:
     def json(self, result, status_code=200, headers=None):
         """Return a JSON response."""
         try:
-            msg = json.dumps(
-                result, sort_keys=True, cls=JSONEncoder, allow_nan=False
-            ).encode("UTF-8")
+            msg = json_bytes(result, sort_keys=True, allow_nan=False)
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError
+        return self.json_encoded(msg, status_code, headers=headers)
+
+    # pylint: disable=no-self-use
+    def json_encoded(self, msg, status_code=200, headers=None):
+        """Return a JSON response from already encoded JSON."""
         response = web.Response(
             body=msg,
             content_type=CONTENT_TYPE_JSON,
@@ -1,9 +1,6 @@
 """Support for sending data to an Influx database."""
 import logging
 import re
-import queue
-import threading
-import time
 import math
 
 import requests.exceptions
@@ -20,15 +17,17 @@ from homeassistant.const import (
     CONF_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
-    EVENT_STATE_CHANGED,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.helpers import state as state_helper, event as event_helper
+from homeassistant.core import split_entity_id
+from homeassistant.helpers import event as event_helper, state_exporter
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
 
+from .writer import InfluxWriter, Journal
+
 _LOGGER = logging.getLogger(__name__)
 
 CONF_DB_NAME = "database"
@@ -40,18 +39,16 @@ CONF_COMPONENT_CONFIG = "component_config"
 CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
+CONF_JOURNAL = "journal"
 
 DEFAULT_DATABASE = "home_assistant"
 DEFAULT_VERIFY_SSL = True
 DOMAIN = "influxdb"
 
 TIMEOUT = 5
-RETRY_DELAY = 20
-QUEUE_BACKLOG_SECONDS = 30
 RETRY_INTERVAL = 60  # seconds
 
-BATCH_TIMEOUT = 1
-BATCH_BUFFER_SIZE = 100
+JOURNAL_FILE = ".influxdb_journal"
 
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string}
@@ -85,6 +82,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PORT): cv.port,
                     vol.Optional(CONF_SSL): cv.boolean,
                     vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+                    vol.Optional(CONF_JOURNAL, default=False): cv.boolean,
                     vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
                     vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string,
                     vol.Optional(CONF_TAGS, default={}): vol.Schema(
@@ -175,65 +173,61 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
-    def event_to_json(event):
-        """Add an event to the outgoing Influx list."""
-        state = event.data.get("new_state")
-        if (
-            state is None
-            or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
-            or state.entity_id in blacklist_e
-            or state.domain in blacklist_d
-        ):
+    def entity_filter(entity_id):
+        """Return if the states of an entity are written."""
+        domain = split_entity_id(entity_id)[0]
+
+        if entity_id in blacklist_e or domain in blacklist_d:
+            return False
+
+        return (
+            not (whitelist_e or whitelist_d)
+            or entity_id in whitelist_e
+            or domain in whitelist_d
+        )
+
+    def event_to_json(record):
+        """Add a state change to the outgoing Influx list."""
+        if record.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE):
             return
 
-        try:
-            if (
-                (whitelist_e or whitelist_d)
-                and state.entity_id not in whitelist_e
-                and state.domain not in whitelist_d
-            ):
-                return
-
-            _include_state = _include_value = False
-
-            _state_as_value = float(state.state)
-            _include_value = True
-        except ValueError:
-            try:
-                _state_as_value = float(state_helper.state_as_number(state))
-                _include_state = _include_value = True
-            except ValueError:
-                _include_state = True
+        # Numbers are written as value, other states as state, and as value
+        # too if they map to a number, like on and off
+        _include_state = not record.state_is_number
+        _include_value = record.value is not None
+
+        if _include_value:
+            _state_as_value = float(record.value)
 
         include_uom = True
-        measurement = component_config.get(state.entity_id).get(
+        measurement = component_config.get(record.entity_id).get(
             CONF_OVERRIDE_MEASUREMENT
         )
         if measurement in (None, ""):
             if override_measurement:
                 measurement = override_measurement
             else:
-                measurement = state.attributes.get("unit_of_measurement")
+                measurement = record.unit
                 if measurement in (None, ""):
                     if default_measurement:
                         measurement = default_measurement
                     else:
-                        measurement = state.entity_id
+                        measurement = record.entity_id
                 else:
                     include_uom = False
 
         json = {
             "measurement": measurement,
-            "tags": {"domain": state.domain, "entity_id": state.object_id},
-            "time": event.time_fired,
+            "tags": {"domain": record.domain, "entity_id": record.object_id},
+            "time": record.time_fired,
             "fields": {},
         }
         if _include_state:
-            json["fields"]["state"] = state.state
+            json["fields"]["state"] = record.state
         if _include_value:
             json["fields"]["value"] = _state_as_value
 
-        for key, value in state.attributes.items():
+        for key, value in record.attributes.items():
             if key in tags_attributes:
                 json["tags"][key] = value
             elif key != "unit_of_measurement" or include_uom:
@@ -265,8 +259,14 @@ def setup(hass, config):
 
         return json
 
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    journal = Journal(hass.config.path(JOURNAL_FILE)) if conf[CONF_JOURNAL] else None
+    instance = hass.data[DOMAIN] = InfluxWriter(
+        influx, event_to_json, max_tries, journal
+    )
     instance.start()
+    state_exporter.subscribe(
+        hass, DOMAIN, instance.event_listener, entity_filter, stats=instance.as_dict
+    )
 
     def shutdown(event):
         """Shut down the thread."""
@@ -277,99 +277,3 @@ def setup(hass, config):
     hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
 
     return True
-
-
-class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
-
-    def __init__(self, hass, influx, event_to_json, max_tries):
-        """Initialize the listener."""
-        threading.Thread.__init__(self, name="InfluxDB")
-        self.queue = queue.Queue()
-        self.influx = influx
-        self.event_to_json = event_to_json
-        self.max_tries = max_tries
-        self.write_errors = 0
-        self.shutdown = False
-        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
-
-    def _event_listener(self, event):
-        """Listen for new messages on the bus and queue them for Influx."""
-        item = (time.monotonic(), event)
-        self.queue.put(item)
-
-    @staticmethod
-    def batch_timeout():
-        """Return number of seconds to wait for more events."""
-        return BATCH_TIMEOUT
-
-    def get_events_json(self):
-        """Return a batch of events formatted for writing."""
-        queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
-
-        count = 0
-        json = []
-
-        dropped = 0
-
-        try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
-                item = self.queue.get(timeout=timeout)
-                count += 1
-
-                if item is None:
-                    self.shutdown = True
-                else:
-                    timestamp, event = item
-                    age = time.monotonic() - timestamp
-
-                    if age < queue_seconds:
-                        event_json = self.event_to_json(event)
-                        if event_json:
-                            json.append(event_json)
-                    else:
-                        dropped += 1
-
-        except queue.Empty:
-            pass
-
-        if dropped:
-            _LOGGER.warning("Catching up, dropped %d old events", dropped)
-
-        return count, json
-
-    def write_to_influxdb(self, json):
-        """Write preprocessed events to influxdb, with retry."""
-        from influxdb import exceptions
-
-        for retry in range(self.max_tries + 1):
-            try:
-                self.influx.write_points(json)
-
-                if self.write_errors:
-                    _LOGGER.error("Resumed, lost %d events", self.write_errors)
-                    self.write_errors = 0
-
-                _LOGGER.debug("Wrote %d events", len(json))
-                break
-            except (exceptions.InfluxDBClientError, IOError) as err:
-                if retry < self.max_tries:
-                    time.sleep(RETRY_DELAY)
-                else:
-                    if not self.write_errors:
-                        _LOGGER.error("Write error: %s", err)
-                    self.write_errors += len(json)
-
-    def run(self):
-        """Process incoming events."""
-        while not self.shutdown:
-            count, json = self.get_events_json()
-            if json:
-                self.write_to_influxdb(json)
-            for _ in range(count):
-                self.queue.task_done()
-
-    def block_till_done(self):
-        """Block till all events processed."""
-        self.queue.join()
@@ -0,0 +1,388 @@
+"""Write points to InfluxDB in batches, riding out outages of the database."""
+from collections import deque
+from itertools import islice
+import logging
+import os
+import queue
+import threading
+from time import monotonic
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_TIMEOUT = 1
+BATCH_BUFFER_SIZE = 100
+
+# Points kept in memory while the database can not be written
+MAX_BUFFER = 10000
+# Bytes the journal may take on disk
+MAX_JOURNAL_SIZE = 100 * 1024 * 1024
+
+# Seconds between retries, doubled after every failed write up to the max
+RETRY_DELAY = 20
+MAX_RETRY_DELAY = 300
+
+# Status code of writes that InfluxDB will never accept, like field type
+# conflicts, retrying those is useless
+STATUS_BAD_REQUEST = 400
+
+
+class Journal:
+    """Lines of line protocol spilled to disk, to be written later.
+
+    Lines are appended to the file and replayed from an offset, the file is
+    removed once all lines were replayed. The offset is not kept across
+    restarts, lines replayed twice write the same points again, which
+    InfluxDB stores once.
+    """
+
+    def __init__(self, path, max_size=MAX_JOURNAL_SIZE):
+        """Initialize the journal."""
+        self.path = path
+        self.max_size = max_size
+        self._offset = 0
+
+        try:
+            self.size = os.path.getsize(path)
+        except OSError:
+            self.size = 0
+
+    @property
+    def backlog(self):
+        """Return the bytes not replayed yet."""
+        return self.size - self._offset
+
+    def append(self, lines):
+        """Append lines, return False if they do not fit."""
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+
+        if self.size + len(data) > self.max_size:
+            return False
+
+        with open(self.path, "ab") as journal:
+            journal.write(data)
+
+        self.size += len(data)
+        return True
+
+    def read(self, count):
+        """Return at most count lines to replay, and the offset after them."""
+        lines = []
+
+        with open(self.path, "rb") as journal:
+            journal.seek(self._offset)
+
+            for _ in range(count):
+                line = journal.readline()
+
+                if not line:
+                    break
+
+                lines.append(line.decode("utf-8").rstrip("\n"))
+
+            return lines, journal.tell()
+
+    def commit(self, offset):
+        """Mark the lines before offset as replayed."""
+        self._offset = offset
+
+        if self._offset >= self.size:
+            self.clear()
+
+    def clear(self):
+        """Remove all lines."""
+        self._offset = self.size = 0
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class InfluxWriter(threading.Thread):
+    """Write the points of state changes to InfluxDB in batches.
+
+    Points are encoded to line protocol as they come in and written in
+    batches of at most batch_size, a partial batch waits batch_timeout
+    seconds for more points. A failed write is retried with a growing delay
+    while new points keep being buffered, nothing blocks on the database.
+
+    A batch that failed max_tries retries is spilled to the journal, if
+    there is one, or dropped. At most max_buffer points are kept in memory,
+    beyond that the oldest batch goes the same way. Once writes work again
+    the journal is replayed, in between the writes of new points.
+
+    The counters are exposed with as_dict, served from /api/exporters,
+    written points over time give the throughput and lag is the age of the
+    oldest point of the last batch.
+    """
+
+    def __init__(
+        self,
+        influx,
+        event_to_json,
+        max_tries,
+        journal=None,
+        batch_size=BATCH_BUFFER_SIZE,
+        max_buffer=MAX_BUFFER,
+    ):
+        """Initialize the writer."""
+        from influxdb.line_protocol import make_lines
+
+        threading.Thread.__init__(self, name="InfluxDB")
+        self.queue = queue.Queue(max_buffer)
+        self.influx = influx
+        self.event_to_json = event_to_json
+        self.max_tries = max_tries
+        self.journal = journal
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.shutdown = False
+        self._make_lines = make_lines
+        # (time queued, line) of the points that are not written yet
+        self._buffer = deque()
+        # Items taken from the queue that are not written yet
+        self._unfinished = 0
+        self._tries = 0
+        self._failures = 0
+        self._retry_at = None
+        # Only changed in the event loop, the others only in the thread
+        self._queue_full = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.write_time = 0.0
+        self.lag = 0.0
+        self.max_lag = 0.0
+
+    @callback
+    def event_listener(self, records):
+        """Queue batches of state changes for Influx."""
+        now = monotonic()
+
+        for record in records:
+            try:
+                self.queue.put_nowait((now, record))
+            except queue.Full:
+                if not self._queue_full:
+                    _LOGGER.warning("Writer can not keep up, dropping states")
+                self._queue_full += 1
+
+    @staticmethod
+    def batch_timeout():
+        """Return number of seconds to wait for more events."""
+        return BATCH_TIMEOUT
+
+    def _journal_backlog(self):
+        """Return if there are lines in the journal to replay."""
+        return self.journal is not None and self.journal.backlog > 0
+
+    def _buffer_due(self, now):
+        """Return if the buffered points should be written."""
+        return bool(self._buffer) and (
+            len(self._buffer) >= self.batch_size
+            or now - self._buffer[0][0] >= self.batch_timeout()
+        )
+
+    def _next_write_in(self):
+        """Return seconds until the next write, None if there is nothing."""
+        if not self._buffer and not self._journal_backlog():
+            return None
+
+        now = monotonic()
+
+        if self._retry_at is not None:
+            return max(self._retry_at - now, 0)
+
+        if self._journal_backlog() or self._buffer_due(now):
+            return 0
+
+        return max(self._buffer[0][0] + self.batch_timeout() - now, 0)
+
+    def _fill_buffer(self, timeout):
+        """Buffer the points of the queued state changes."""
+        try:
+            item = self.queue.get(timeout=timeout)
+
+            while True:
+                self._unfinished += 1
+
+                if item is None:
+                    self.shutdown = True
+                else:
+                    self._add(*item)
+
+                item = self.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _add(self, queued, record):
+        """Buffer the point of a state change."""
+        point = self.event_to_json(record)
+
+        if not point:
+            return
+
+        self._buffer.append((queued, self._make_lines({"points": [point]})[:-1]))
+
+        if len(self._buffer) > self.max_buffer:
+            self._set_aside(self._take(self.batch_size))
+
+    def _take(self, count):
+        """Remove and return the lines of the oldest buffered points."""
+        return [self._buffer.popleft()[1] for _ in range(min(count, len(self._buffer)))]
+
+    def _set_aside(self, lines):
+        """Spill lines that can not be written now to the journal, or drop them."""
+        if self.journal is not None:
+            try:
+                if self.journal.append(lines):
+                    self.spilled += len(lines)
+                    return
+
+                _LOGGER.warning("Journal is full, dropping %d points", len(lines))
+            except OSError as err:
+                _LOGGER.error("Error writing to the journal: %s", err)
+
+        self.dropped += len(lines)
+
+    def _write(self, lines):
+        """Write lines, return False if they should be tried again."""
+        from influxdb import exceptions
+
+        start = monotonic()
+
+        try:
+            self.influx.write_points(lines, protocol="line")
+        except exceptions.InfluxDBClientError as err:
+            if err.code != STATUS_BAD_REQUEST:
+                return self._write_failed(err)
+
+            _LOGGER.error("Database rejected %d points: %s", len(lines), err)
+            self.dropped += len(lines)
+        except (exceptions.InfluxDBServerError, IOError) as err:
+            return self._write_failed(err)
+        else:
+            self.written += len(lines)
+            self.batches += 1
+
+        self.write_time += monotonic() - start
+
+        if self._failures:
+            _LOGGER.warning("Resumed writing after %d failed writes", self._failures)
+
+        self._failures = self._tries = 0
+        self._retry_at = None
+        return True
+
+    def _write_failed(self, err):
+        """Schedule the retry of a failed write."""
+        if not self._failures:
+            _LOGGER.error("Write error: %s", err)
+
+        self.write_errors += 1
+        self._failures += 1
+        self._retry_at = monotonic() + min(
+            RETRY_DELAY * 2 ** min(self._failures - 1, 8), MAX_RETRY_DELAY
+        )
+        return False
+
+    def _write_buffer(self):
+        """Write the oldest batch of buffered points."""
+        batch = list(islice(self._buffer, self.batch_size))
+
+        if self._write([line for _, line in batch]):
+            self._take(len(batch))
+            self.lag = monotonic() - batch[0][0]
+            self.max_lag = max(self.max_lag, self.lag)
+            return
+
+        self._tries += 1
+
+        if self._tries > self.max_tries:
+            self._tries = 0
+            self._set_aside(self._take(len(batch)))
+
+    def _replay(self):
+        """Write the oldest lines of the journal."""
+        try:
+            lines, offset = self.journal.read(self.batch_size)
+        except OSError as err:
+            _LOGGER.error("Error reading the journal, it is not replayed: %s", err)
+            self.journal = None
+            return
+
+        if not lines:
+            # Changed behind our back
+            self.journal.clear()
+        elif self._write(lines):
+            self.replayed += len(lines)
+            self.journal.commit(offset)
+
+    def _write_next(self):
+        """Write buffered points when due, else replay the journal."""
+        if self._buffer and (
+            self._retry_at is not None or self._buffer_due(monotonic())
+        ):
+            self._write_buffer()
+        else:
+            self._replay()
+
+    def _task_done(self):
+        """Mark the queued state changes done once all points are written."""
+        if self._buffer:
+            return
+
+        for _ in range(self._unfinished):
+            self.queue.task_done()
+
+        self._unfinished = 0
+
+    def _write_on_shutdown(self):
+        """Try once to write the buffered points, set them aside otherwise."""
+        while self._buffer:
+            lines = self._take(self.batch_size)
+
+            if not self._write(lines):
+                self._set_aside(lines + self._take(len(self._buffer)))
+
+        self._task_done()
+
+    def _process(self, timeout):
+        """Buffer the state changes queued within timeout, write what is due."""
+        self._fill_buffer(timeout)
+
+        if not self.shutdown and self._next_write_in() == 0:
+            self._write_next()
+
+        self._task_done()
+
+    def run(self):
+        """Process incoming events."""
+        while not self.shutdown:
+            self._process(self._next_write_in())
+
+        self._write_on_shutdown()
+
+    def block_till_done(self):
+        """Block till all events processed."""
+        self.queue.join()
+
+    def as_dict(self):
+        """Return the counters of the writer."""
+        return {
+            "queued": self.queue.qsize(),
+            "buffered": len(self._buffer),
+            "journal_backlog": self.journal.backlog if self.journal else 0,
+            "written": self.written,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "write_time": self.write_time,
+            "dropped": self.dropped + self._queue_full,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+        }
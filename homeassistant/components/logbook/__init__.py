@@ -5,6 +5,8 @@ import logging
 
 import voluptuous as vol
 
+from aiohttp import hdrs, web
+
 from homeassistant.loader import bind_hass
 from homeassistant.components import sun
 from homeassistant.components.http import HomeAssistantView
@@ -16,6 +18,7 @@ from homeassistant.const import (
     ATTR_SERVICE,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_LOGBOOK_ENTRY,
@@ -36,6 +39,7 @@ from homeassistant.components.homekit.const import (
     EVENT_HOMEKIT_CHANGED,
 )
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import json_bytes
 import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -50,6 +54,11 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# Events per page of the paginated view, and entries per streamed chunk
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+STREAM_CHUNK_SIZE = 100
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -131,6 +140,7 @@ async def async_setup(hass, config):
         async_log_entry(hass, name, message, domain, entity_id)
 
     hass.http.register_view(LogbookView(config.get(DOMAIN, {})))
+    hass.http.register_view(LogbookPageView(config.get(DOMAIN, {})))
 
     hass.components.frontend.async_register_built_in_panel(
         "logbook", "logbook", "hass:format-list-bulleted-type"
@@ -181,6 +191,81 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_job(json_events)
 
 
+class LogbookPageView(HomeAssistantView):
+    """Handle requests for a page of logbook entries.
+
+    A page holds the entries of about limit events from start_time on. The
+    response is {"entries": [...], "next": start_time of the next page or
+    null}, streamed in chunks.
+    """
+
+    url = "/api/logbook/page/{datetime}"
+    name = "api:logbook:page"
+
+    def __init__(self, config):
+        """Initialize the logbook page view."""
+        self.config = config
+
+    async def get(self, request, datetime):
+        """Retrieve a page of logbook entries."""
+        start_time = dt_util.parse_datetime(datetime)
+
+        if start_time is None:
+            return self.json_message("Invalid datetime", HTTP_BAD_REQUEST)
+
+        start_time = dt_util.as_utc(start_time)
+        end_time = request.query.get("end_time")
+
+        if end_time is None:
+            end_time = start_time + timedelta(days=1)
+        else:
+            end_time = dt_util.parse_datetime(end_time)
+
+            if end_time is None:
+                return self.json_message("Invalid end_time", HTTP_BAD_REQUEST)
+
+            end_time = dt_util.as_utc(end_time)
+
+        try:
+            limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+
+        entity_id = request.query.get("entity")
+        hass = request.app["hass"]
+
+        def encoded_page():
+            """Fetch a page of entries and encode it in chunks."""
+            entries, next_start = _get_events_page(
+                hass, self.config, start_time, end_time, entity_id, limit
+            )
+            chunks = [
+                json_bytes(
+                    entries[index : index + STREAM_CHUNK_SIZE],
+                    sort_keys=True,
+                    allow_nan=False,
+                )[1:-1]
+                for index in range(0, len(entries), STREAM_CHUNK_SIZE)
+            ]
+            return chunks, next_start
+
+        chunks, next_start = await hass.async_add_executor_job(encoded_page)
+
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON})
+        await response.prepare(request)
+        await response.write(b'{"entries":[')
+
+        for index, chunk in enumerate(chunks):
+            await response.write(b"," + chunk if index else chunk)
+
+        await response.write(b'],"next":' + json_bytes(next_start) + b"}")
+        await response.write_eof()
+        return response
+
+
 def humanify(hass, events):
     """Generate a converted list of events into Entry objects.
 
@@ -370,40 +455,8 @@ def humanify(hass, events):
                 }
 
 
-def _get_related_entity_ids(session, entity_filter):
-    from homeassistant.components.recorder.models import States
-    from homeassistant.components.recorder.util import RETRIES, QUERY_RETRY_WAIT
-    from sqlalchemy.exc import SQLAlchemyError
-    import time
-
-    timer_start = time.perf_counter()
-
-    query = session.query(States).with_entities(States.entity_id).distinct()
-
-    for tryno in range(0, RETRIES):
-        try:
-            result = [row.entity_id for row in query if entity_filter(row.entity_id)]
-
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                elapsed = time.perf_counter() - timer_start
-                _LOGGER.debug(
-                    "fetching %d distinct domain/entity_id pairs took %fs",
-                    len(result),
-                    elapsed,
-                )
-
-            return result
-        except SQLAlchemyError as err:
-            _LOGGER.error("Error executing query: %s", err)
-
-            if tryno == RETRIES - 1:
-                raise
-            time.sleep(QUERY_RETRY_WAIT)
-
-
-def _generate_filter_from_config(config):
-    from homeassistant.helpers.entityfilter import generate_filter
-
+def _filter_config(config):
+    """Return the included and excluded domains and entities of the config."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -418,47 +471,166 @@ def _generate_filter_from_config(config):
         included_entities = include.get(CONF_ENTITIES, [])
         included_domains = include.get(CONF_DOMAINS, [])
 
-    return generate_filter(
-        included_domains, included_entities, excluded_domains, excluded_entities
+    return included_domains, included_entities, excluded_domains, excluded_entities
+
+
+def _generate_filter_from_config(config):
+    from homeassistant.helpers.entityfilter import generate_filter
+
+    return generate_filter(*_filter_config(config))
+
+
+def _generate_filter_clause_from_config(config):
+    """Return the include and exclude config as a clause on states.
+
+    The clause matches the states the filter of generate_filter passes, on
+    the domain and entity_id columns. Return None when all states pass.
+    """
+    from homeassistant.components.recorder.models import States
+    from sqlalchemy import and_, false, or_, true
+
+    include_d, include_e, exclude_d, exclude_e = _filter_config(config)
+
+    def domain_in(domains):
+        return States.domain.in_(domains) if domains else false()
+
+    def entity_in(entities):
+        return States.entity_id.in_(entities) if entities else false()
+
+    def domain_not_in(domains):
+        return States.domain.notin_(domains) if domains else true()
+
+    def entity_not_in(entities):
+        return States.entity_id.notin_(entities) if entities else true()
+
+    have_include = bool(include_d or include_e)
+    have_exclude = bool(exclude_d or exclude_e)
+
+    # The cases of generate_filter
+    if not have_include and not have_exclude:
+        return None
+
+    if have_include and not have_exclude:
+        return or_(domain_in(include_d), entity_in(include_e))
+
+    if not have_include and have_exclude:
+        return and_(domain_not_in(exclude_d), entity_not_in(exclude_e))
+
+    if include_d:
+        return or_(
+            and_(domain_in(include_d), entity_not_in(exclude_e)), entity_in(include_e)
+        )
+
+    if exclude_d:
+        return or_(
+            and_(domain_in(exclude_d), entity_in(include_e)),
+            and_(domain_not_in(exclude_d), entity_not_in(exclude_e)),
+        )
+
+    return entity_in(include_e)
+
+
+def _events_query(session, config, start_day, end_day, entity_id=None):
+    """Return the query of the events of a period, oldest first."""
+    from homeassistant.components.recorder.models import EVENT_COLUMNS, Events, States
+
+    if entity_id is not None:
+        state_clause = States.entity_id == entity_id.lower()
+    else:
+        # Filtering in the query does not need the entities of all states
+        state_clause = _generate_filter_clause_from_config(config)
+
+    states_clause = States.last_updated == States.last_changed
+
+    if state_clause is not None:
+        states_clause = states_clause & state_clause
+
+    return (
+        session.query(*EVENT_COLUMNS)
+        .order_by(Events.time_fired)
+        .outerjoin(States, (Events.event_id == States.event_id))
+        .filter(Events.event_type.in_(ALL_EVENT_TYPES))
+        .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
+        .filter(states_clause | (States.state_id.is_(None)))
     )
 
 
+def _rows_to_events(rows):
+    """Yield the Events of rows."""
+    from homeassistant.components.recorder.models import event_from_row
+
+    for row in rows:
+        event = event_from_row(row)
+        if event is not None:
+            yield event
+
+
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
-    from homeassistant.components.recorder.models import Events, States
     from homeassistant.components.recorder.util import session_scope
 
     entities_filter = _generate_filter_from_config(config)
 
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(500):
-            event = row.to_native()
-            if _keep_event(event, entities_filter):
-                yield event
+    with session_scope(hass=hass) as session:
+        query = _events_query(session, config, start_day, end_day, entity_id)
+        events = _rows_to_events(query.yield_per(500))
+
+        return list(
+            humanify(
+                hass, (event for event in events if _keep_event(event, entities_filter))
+            )
+        )
+
+
+def _group_start(time_fired):
+    """Return the start of the GROUP_BY_MINUTES window of a time."""
+    return time_fired.replace(
+        minute=time_fired.minute - time_fired.minute % GROUP_BY_MINUTES,
+        second=0,
+        microsecond=0,
+    )
+
+
+def _get_events_page(hass, config, start_day, end_day, entity_id, limit):
+    """Get the entries of about limit events, and the start of the next page.
+
+    Pages end at the start of a GROUP_BY_MINUTES window, so entries are
+    grouped the same as when fetched at once. A window with more than limit
+    events is returned whole.
+    """
+    from homeassistant.components.recorder.util import session_scope
+
+    entities_filter = _generate_filter_from_config(config)
 
     with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
+        query = _events_query(session, config, start_day, end_day, entity_id)
+        events = list(_rows_to_events(query.limit(limit + 1)))
+
+    next_start = None
+
+    if len(events) > limit:
+        first = _group_start(events[0].time_fired)
+        next_start = _group_start(events[limit].time_fired)
+
+        if next_start == first:
+            next_start = first + timedelta(minutes=GROUP_BY_MINUTES)
+
+            with session_scope(hass=hass) as session:
+                query = _events_query(session, config, start_day, next_start, entity_id)
+                events = list(_rows_to_events(query))
         else:
-            entity_ids = _get_related_entity_ids(session, entities_filter)
-
-        query = (
-            session.query(Events)
-            .order_by(Events.time_fired)
-            .outerjoin(States, (Events.event_id == States.event_id))
-            .filter(Events.event_type.in_(ALL_EVENT_TYPES))
-            .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
-            .filter(
-                (
-                    (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
-                )
-                | (States.state_id.is_(None))
-            )
+            events = [event for event in events if event.time_fired < next_start]
+
+        # The query leaves out events fired exactly at the start
+        next_start -= timedelta(microseconds=1)
+
+    entries = list(
+        humanify(
+            hass, (event for event in events if _keep_event(event, entities_filter))
         )
+    )
 
-        return list(humanify(hass, yield_events(query)))
+    return entries, next_start and next_start.isoformat()
 
 
 def _keep_event(event, entities_filter):
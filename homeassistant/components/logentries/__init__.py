@@ -6,8 +6,8 @@ import requests
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
-from homeassistant.const import CONF_TOKEN, EVENT_STATE_CHANGED
-from homeassistant.helpers import state as state_helper
+from homeassistant.const import CONF_TOKEN
+from homeassistant.helpers import state_exporter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,23 +26,17 @@ def setup(hass, config):
     token = conf.get(CONF_TOKEN)
     le_wh = "{}{}".format(DEFAULT_HOST, token)
 
-    def logentries_event_listener(event):
-        """Listen for new messages on the bus and sends them to Logentries."""
-        state = event.data.get("new_state")
-        if state is None:
-            return
-        try:
-            _state = state_helper.state_as_number(state)
-        except ValueError:
-            _state = state.state
+    def logentries_event_listener(records):
+        """Send batches of state changes to Logentries."""
         json_body = [
             {
-                "domain": state.domain,
-                "entity_id": state.object_id,
-                "attributes": dict(state.attributes),
-                "time": str(event.time_fired),
-                "value": _state,
+                "domain": record.domain,
+                "entity_id": record.object_id,
+                "attributes": dict(record.attributes),
+                "time": str(record.time_fired),
+                "value": record.state if record.value is None else record.value,
             }
+            for record in records
         ]
         try:
             payload = {"host": le_wh, "event": json_body}
@@ -50,6 +44,6 @@ def setup(hass, config):
         except requests.exceptions.RequestException as error:
             _LOGGER.exception("Error sending to Logentries: %s", error)
 
-    hass.bus.listen(EVENT_STATE_CHANGED, logentries_event_listener)
+    state_exporter.subscribe(hass, DOMAIN, logentries_event_listener)
 
     return True
@@ -17,6 +17,8 @@ from homeassistant.const import (
 )
 import homeassistant.helpers.config_validation as cv
 
+from .scheduler import KIND_COILS, KIND_HOLDING, KIND_INPUT, BlockReadScheduler
+
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_ADDRESS = "address"
@@ -25,18 +27,29 @@ ATTR_UNIT = "unit"
 ATTR_VALUE = "value"
 
 CONF_BAUDRATE = "baudrate"
+CONF_BLOCK_GAP = "block_gap"
+CONF_BLOCK_READS = "block_reads"
 CONF_BYTESIZE = "bytesize"
 CONF_HUB = "hub"
 CONF_PARITY = "parity"
 CONF_STOPBITS = "stopbits"
 
+DEFAULT_BLOCK_GAP = 0
 DEFAULT_HUB = "default"
 DOMAIN = "modbus"
 
 SERVICE_WRITE_COIL = "write_coil"
 SERVICE_WRITE_REGISTER = "write_register"
 
-BASE_SCHEMA = vol.Schema({vol.Optional(CONF_NAME, default=DEFAULT_HUB): cv.string})
+BASE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME, default=DEFAULT_HUB): cv.string,
+        vol.Optional(CONF_BLOCK_READS, default=True): cv.boolean,
+        vol.Optional(CONF_BLOCK_GAP, default=DEFAULT_BLOCK_GAP): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+    }
+)
 
 SERIAL_SCHEMA = BASE_SCHEMA.extend(
     {
@@ -138,7 +151,9 @@ def setup(hass, config):
     for client_config in config[DOMAIN]:
         client = setup_client(client_config)
         name = client_config[CONF_NAME]
-        hub_collect[name] = ModbusHub(client, name)
+        hub_collect[name] = ModbusHub(
+            client, name, client_config[CONF_BLOCK_READS], client_config[CONF_BLOCK_GAP]
+        )
         _LOGGER.debug("Setting up hub: %s", client_config)
 
     def stop_modbus(event):
@@ -190,20 +205,37 @@ def setup(hass, config):
     return True
 
 
+READ_METHODS = {
+    KIND_COILS: "read_coils",
+    KIND_HOLDING: "read_holding_registers",
+    KIND_INPUT: "read_input_registers",
+}
+
+
 class ModbusHub:
     """Thread safe wrapper class for pymodbus."""
 
-    def __init__(self, modbus_client, name):
+    def __init__(
+        self, modbus_client, name, block_reads=False, block_gap=DEFAULT_BLOCK_GAP
+    ):
         """Initialize the Modbus hub."""
         self._client = modbus_client
         self._lock = threading.Lock()
         self._name = name
+        self._scheduler = (
+            BlockReadScheduler(self._read_block, block_gap) if block_reads else None
+        )
 
     @property
     def name(self):
         """Return the name of this hub."""
         return self._name
 
+    @property
+    def scheduler(self):
+        """Return the block read scheduler, or None if reads are not merged."""
+        return self._scheduler
+
     def close(self):
         """Disconnect client."""
         with self._lock:
@@ -214,38 +246,61 @@ class ModbusHub:
         with self._lock:
             self._client.connect()
 
+    def add_read(self, unit, kind, address, count):
+        """Plan a read ahead, so that it is merged from the first poll."""
+        if self._scheduler is None:
+            return
+
+        with self._lock:
+            self._scheduler.add_range(unit, kind, address, count)
+
+    def _read_block(self, kind, unit, address, count):
+        """Read addresses with one request."""
+        kwargs = {"unit": unit} if unit else {}
+        return getattr(self._client, READ_METHODS[kind])(address, count, **kwargs)
+
+    def _read(self, kind, unit, address, count):
+        """Read addresses, from a block read if possible."""
+        with self._lock:
+            if self._scheduler is None:
+                return self._read_block(kind, unit, address, count)
+
+            return self._scheduler.read(unit, kind, address, count)
+
+    def _invalidate(self, unit, kind, address, count):
+        """Drop the block reads of written addresses."""
+        if self._scheduler is not None:
+            self._scheduler.invalidate(unit, kind, address, count)
+
     def read_coils(self, unit, address, count):
         """Read coils."""
-        with self._lock:
-            kwargs = {"unit": unit} if unit else {}
-            return self._client.read_coils(address, count, **kwargs)
+        return self._read(KIND_COILS, unit, address, count)
 
     def read_input_registers(self, unit, address, count):
         """Read input registers."""
-        with self._lock:
-            kwargs = {"unit": unit} if unit else {}
-            return self._client.read_input_registers(address, count, **kwargs)
+        return self._read(KIND_INPUT, unit, address, count)
 
     def read_holding_registers(self, unit, address, count):
         """Read holding registers."""
-        with self._lock:
-            kwargs = {"unit": unit} if unit else {}
-            return self._client.read_holding_registers(address, count, **kwargs)
+        return self._read(KIND_HOLDING, unit, address, count)
 
     def write_coil(self, unit, address, value):
         """Write coil."""
         with self._lock:
+            self._invalidate(unit, KIND_COILS, address, 1)
             kwargs = {"unit": unit} if unit else {}
             self._client.write_coil(address, value, **kwargs)
 
     def write_register(self, unit, address, value):
         """Write register."""
         with self._lock:
+            self._invalidate(unit, KIND_HOLDING, address, 1)
             kwargs = {"unit": unit} if unit else {}
             self._client.write_register(address, value, **kwargs)
 
     def write_registers(self, unit, address, values):
         """Write registers."""
         with self._lock:
+            self._invalidate(unit, KIND_HOLDING, address, len(values))
             kwargs = {"unit": unit} if unit else {}
             self._client.write_registers(address, values, **kwargs)
@@ -9,6 +9,7 @@ from homeassistant.const import CONF_NAME, CONF_SLAVE
 from homeassistant.helpers import config_validation as cv
 
 from . import CONF_HUB, DEFAULT_HUB, DOMAIN as MODBUS_DOMAIN
+from .scheduler import KIND_COILS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,6 +54,7 @@ class ModbusCoilSensor(BinarySensorDevice):
         self._slave = int(slave) if slave else None
         self._coil = int(coil)
         self._value = None
+        hub.add_read(self._slave, KIND_COILS, self._coil, 1)
 
     @property
     def name(self):
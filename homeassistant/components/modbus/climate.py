@@ -13,6 +13,7 @@ from homeassistant.const import ATTR_TEMPERATURE, CONF_NAME, CONF_SLAVE
 import homeassistant.helpers.config_validation as cv
 
 from . import CONF_HUB, DEFAULT_HUB, DOMAIN as MODBUS_DOMAIN
+from .scheduler import KIND_HOLDING
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -108,6 +109,9 @@ class ModbusThermostat(ClimateDevice):
 
         self._structure = ">{}".format(data_types[self._data_type][self._count])
 
+        for register in (target_temp_register, current_temp_register):
+            hub.add_read(self._slave, KIND_HOLDING, register, self._count)
+
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -0,0 +1,231 @@
+"""Coalesce the reads of a Modbus hub into block reads."""
+import logging
+from time import monotonic
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_COILS = "coils"
+KIND_HOLDING = "holding"
+KIND_INPUT = "input"
+
+# Most addresses one read request may cover, from the Modbus specification
+MAX_READ_BITS = 2000
+MAX_READ_REGISTERS = 125
+
+# Bits in a register, a gap of coils costs about as much as a gap of registers
+BITS_PER_REGISTER = 16
+
+# Seconds a block read may be served to the ranges in the block
+BLOCK_MAX_AGE = 5
+
+
+def plan_blocks(ranges, max_count, max_gap, isolated=frozenset()):
+    """Merge address ranges into as few block reads as possible.
+
+    Ranges are (address, count) tuples. Ranges at most max_gap addresses
+    apart are read together as long as the block stays within max_count
+    addresses. Isolated ranges are only merged with ranges they overlap.
+    Return a list of blocks as ((address, count), ranges) tuples.
+    """
+    plan = []
+    start = end = None
+    members = []
+    merge_gap = max_gap
+
+    for address, count in sorted(ranges):
+        stop = address + count
+        is_isolated = (address, count) in isolated
+        gap = -1 if is_isolated else merge_gap
+
+        if (
+            start is not None
+            and address - end <= gap
+            and max(end, stop) - start <= max_count
+        ):
+            end = max(end, stop)
+            members.append((address, count))
+            continue
+
+        if start is not None:
+            plan.append(((start, end - start), members))
+
+        start, end = address, stop
+        members = [(address, count)]
+        # Nothing is merged into a block of an isolated range either
+        merge_gap = -1 if is_isolated else max_gap
+
+    if start is not None:
+        plan.append(((start, end - start), members))
+
+    return plan
+
+
+class RegistersResult:
+    """Registers of a range served from a block read."""
+
+    def __init__(self, registers):
+        """Initialize the result."""
+        self.registers = registers
+
+
+class BitsResult:
+    """Bits of a range served from a block read."""
+
+    def __init__(self, bits):
+        """Initialize the result."""
+        self.bits = bits
+
+
+class _CachedBlock:
+    """Values of a block read and the ranges they were served to."""
+
+    __slots__ = ("time", "values", "served")
+
+    def __init__(self, time, values):
+        """Initialize the cached block."""
+        self.time = time
+        self.values = values
+        self.served = set()
+
+
+class BlockReadScheduler:
+    """Serve the reads of the entities of a hub from block reads.
+
+    Ranges are grouped by slave and kind of register, and the ranges of a
+    group are merged into blocks with plan_blocks. The first read of a range
+    reads its whole block, the other ranges of the block are then served
+    from that read once each. Every poll round thus reads each block once.
+
+    When a block that merges several ranges fails, for example because a
+    gap address is not mapped by the device, its ranges are isolated and
+    read on their own from then on.
+
+    Not thread safe, the hub serializes the calls.
+    """
+
+    def __init__(self, read_block, max_gap):
+        """Initialize the scheduler.
+
+        read_block is called with kind, unit, address and count and returns
+        the response of the client.
+        """
+        self._read_block = read_block
+        self._max_gap = max_gap
+        # (unit, kind) -> ranges, isolated ranges and range -> block
+        self._ranges = {}
+        self._isolated = {}
+        self._plans = {}
+        # (unit, kind, block) -> _CachedBlock
+        self._cache = {}
+        self.block_reads = 0
+        self.cached_reads = 0
+
+    def add_range(self, unit, kind, address, count):
+        """Add a range that will be read."""
+        ranges = self._ranges.setdefault((unit, kind), set())
+
+        if (address, count) not in ranges:
+            ranges.add((address, count))
+            self._plan(unit, kind)
+
+    def blocks(self, unit, kind):
+        """Return the blocks read for a slave and kind of register."""
+        return sorted(set(self._plans.get((unit, kind), {}).values()))
+
+    def _plan(self, unit, kind):
+        """Plan the blocks of a slave and kind of register."""
+        if kind == KIND_COILS:
+            max_count = MAX_READ_BITS
+            max_gap = self._max_gap * BITS_PER_REGISTER
+        else:
+            max_count = MAX_READ_REGISTERS
+            max_gap = self._max_gap
+
+        plan = plan_blocks(
+            self._ranges[(unit, kind)],
+            max_count,
+            max_gap,
+            self._isolated.get((unit, kind), frozenset()),
+        )
+        self._plans[(unit, kind)] = {
+            member: block for block, members in plan for member in members
+        }
+
+        for key in [key for key in self._cache if key[:2] == (unit, kind)]:
+            del self._cache[key]
+
+    def read(self, unit, kind, address, count):
+        """Read a range, from a block read if possible."""
+        self.add_range(unit, kind, address, count)
+
+        block = self._plans[(unit, kind)][(address, count)]
+        cached = self._cache.get((unit, kind, block))
+        now = monotonic()
+
+        if (
+            cached is None
+            or (address, count) in cached.served
+            or now - cached.time > BLOCK_MAX_AGE
+        ):
+            result = self._read_block(kind, unit, *block)
+            values = getattr(
+                result, "bits" if kind == KIND_COILS else "registers", None
+            )
+
+            if values is None:
+                self._cache.pop((unit, kind, block), None)
+
+                if self._isolate(unit, kind, block):
+                    return self.read(unit, kind, address, count)
+
+                return result
+
+            cached = self._cache[(unit, kind, block)] = _CachedBlock(now, values)
+            self.block_reads += 1
+        else:
+            self.cached_reads += 1
+
+        cached.served.add((address, count))
+        offset = address - block[0]
+        values = cached.values[offset : offset + count]
+
+        if kind == KIND_COILS:
+            return BitsResult(values)
+
+        return RegistersResult(values)
+
+    def _isolate(self, unit, kind, block):
+        """Isolate the ranges of a failed block, return if any changed."""
+        members = [
+            member
+            for member, member_block in self._plans[(unit, kind)].items()
+            if member_block == block
+        ]
+        isolated = self._isolated.setdefault((unit, kind), set())
+
+        if len(members) < 2 or isolated.issuperset(members):
+            return False
+
+        _LOGGER.warning(
+            "Block read of slave %s %s %s-%s failed, reading its ranges on their own",
+            unit,
+            kind,
+            block[0],
+            block[0] + block[1] - 1,
+        )
+        isolated.update(members)
+        self._plan(unit, kind)
+        return True
+
+    def invalidate(self, unit, kind, address, count):
+        """Drop the block reads that cover written addresses."""
+        for key in list(self._cache):
+            key_unit, key_kind, (start, block_count) = key
+
+            if (
+                key_unit == unit
+                and key_kind == kind
+                and start < address + count
+                and address < start + block_count
+            ):
+                del self._cache[key]
@@ -17,6 +17,7 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import CONF_HUB, DEFAULT_HUB, DOMAIN as MODBUS_DOMAIN
+from .scheduler import KIND_HOLDING, KIND_INPUT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -179,6 +180,12 @@ class ModbusRegisterSensor(RestoreEntity):
         self._precision = precision
         self._structure = structure
         self._value = None
+        hub.add_read(
+            self._slave,
+            KIND_INPUT if register_type == REGISTER_TYPE_INPUT else KIND_HOLDING,
+            self._register,
+            self._count,
+        )
 
     async def async_added_to_hass(self):
         """Handle entity which will be added."""
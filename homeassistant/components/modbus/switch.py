@@ -16,6 +16,7 @@ from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import CONF_HUB, DEFAULT_HUB, DOMAIN as MODBUS_DOMAIN
+from .scheduler import KIND_COILS, KIND_HOLDING, KIND_INPUT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -116,6 +117,7 @@ class ModbusCoilSwitch(ToggleEntity, RestoreEntity):
         self._slave = int(slave) if slave else None
         self._coil = int(coil)
         self._is_on = None
+        hub.add_read(self._slave, KIND_COILS, self._coil, 1)
 
     async def async_added_to_hass(self):
         """Handle entity which will be added."""
@@ -197,6 +199,14 @@ class ModbusRegisterSwitch(ModbusCoilSwitch):
 
         self._is_on = None
 
+        if self._verify_state:
+            hub.add_read(
+                self._slave,
+                KIND_INPUT if register_type == REGISTER_TYPE_INPUT else KIND_HOLDING,
+                self._register,
+                1,
+            )
+
     def turn_on(self, **kwargs):
         """Set switch on."""
         self._hub.write_register(self._slave, self._register, self._command_on)
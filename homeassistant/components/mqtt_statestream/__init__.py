@@ -3,17 +3,11 @@ import json
 
 import voluptuous as vol
 
-from homeassistant.const import (
-    CONF_DOMAINS,
-    CONF_ENTITIES,
-    CONF_EXCLUDE,
-    CONF_INCLUDE,
-    MATCH_ALL,
-)
+from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
 from homeassistant.core import callback
 from homeassistant.components.mqtt import valid_publish_topic
 from homeassistant.helpers.entityfilter import generate_filter
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.state_exporter import async_subscribe
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.helpers.config_validation as cv
 
@@ -71,32 +65,36 @@ async def async_setup(hass, config):
         base_topic = base_topic + "/"
 
     @callback
-    def _state_publisher(entity_id, old_state, new_state):
-        if new_state is None:
-            return
-
-        if not publish_filter(entity_id):
-            return
-
-        payload = new_state.state
+    def _state_publisher(records):
+        for record in records:
+            new_state = record.new_state
+            payload = new_state.state
 
-        mybase = base_topic + entity_id.replace(".", "/") + "/"
-        hass.components.mqtt.async_publish(mybase + "state", payload, 1, True)
+            mybase = base_topic + record.entity_id.replace(".", "/") + "/"
+            hass.components.mqtt.async_publish(mybase + "state", payload, 1, True)
 
-        if publish_timestamps:
-            if new_state.last_updated:
-                hass.components.mqtt.async_publish(
-                    mybase + "last_updated", new_state.last_updated.isoformat(), 1, True
-                )
-            if new_state.last_changed:
-                hass.components.mqtt.async_publish(
-                    mybase + "last_changed", new_state.last_changed.isoformat(), 1, True
-                )
+            if publish_timestamps:
+                if new_state.last_updated:
+                    hass.components.mqtt.async_publish(
+                        mybase + "last_updated",
+                        new_state.last_updated.isoformat(),
+                        1,
+                        True,
+                    )
+                if new_state.last_changed:
+                    hass.components.mqtt.async_publish(
+                        mybase + "last_changed",
+                        new_state.last_changed.isoformat(),
+                        1,
+                        True,
+                    )
 
-        if publish_attributes:
-            for key, val in new_state.attributes.items():
-                encoded_val = json.dumps(val, cls=JSONEncoder)
-                hass.components.mqtt.async_publish(mybase + key, encoded_val, 1, True)
+            if publish_attributes:
+                for key, val in new_state.attributes.items():
+                    encoded_val = json.dumps(val, cls=JSONEncoder)
+                    hass.components.mqtt.async_publish(
+                        mybase + key, encoded_val, 1, True
+                    )
 
-    async_track_state_change(hass, MATCH_ALL, _state_publisher)
+    async_subscribe(hass, DOMAIN, _state_publisher, publish_filter)
     return True
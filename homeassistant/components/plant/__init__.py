@@ -288,7 +288,11 @@ class Plant(Entity):
 
         This only needs to be done once during startup.
         """
-        from homeassistant.components.recorder.models import States
+        from homeassistant.components.recorder.models import (
+            LAZY_STATE_COLUMNS,
+            LazyState,
+            States,
+        )
 
         start_date = datetime.now() - timedelta(days=self._conf_check_days)
         entity_id = self._readingmap.get(READING_BRIGHTNESS)
@@ -302,14 +306,14 @@ class Plant(Entity):
         _LOGGER.debug("Initializing values for %s from the database", self._name)
         with session_scope(hass=self.hass) as session:
             query = (
-                session.query(States)
+                session.query(*LAZY_STATE_COLUMNS)
                 .filter(
                     (States.entity_id == entity_id.lower())
                     and (States.last_updated > start_date)
                 )
                 .order_by(States.last_updated.asc())
             )
-            states = execute(query)
+            states = execute(query, LazyState)
 
             for state in states:
                 # filter out all None, NaN and "unknown" states
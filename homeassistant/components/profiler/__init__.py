@@ -0,0 +1,187 @@
+"""Support for profiling the event loop of Home Assistant."""
+import asyncio
+from collections import Counter
+import cProfile
+import logging
+import sys
+import threading
+import time
+from typing import Counter as CounterType
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .monitor import LoopMonitor
+
+# mypy: allow-untyped-defs, no-check-untyped-defs
+
+_LOGGER = logging.getLogger(__name__)
+
+DOMAIN = "profiler"
+
+CONF_LAG_INTERVAL = "lag_interval"
+CONF_SLOW_CALLBACK_THRESHOLD = "slow_callback_threshold"
+
+DEFAULT_LAG_INTERVAL = 1.0
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 0.05
+
+SERVICE_START = "start"
+ATTR_SECONDS = "seconds"
+ATTR_MODE = "mode"
+MODE_CPROFILE = "cprofile"
+MODE_SAMPLE = "sample"
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+DATA_MONITOR = "profiler_monitor"
+DATA_RUNNING = "profiler_running"
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_LAG_INTERVAL, default=DEFAULT_LAG_INTERVAL): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.01)
+                ),
+                vol.Optional(
+                    CONF_SLOW_CALLBACK_THRESHOLD,
+                    default=DEFAULT_SLOW_CALLBACK_THRESHOLD,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+SERVICE_START_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=60.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+        vol.Optional(ATTR_MODE, default=MODE_CPROFILE): vol.In(
+            [MODE_CPROFILE, MODE_SAMPLE]
+        ),
+    }
+)
+
+
+async def async_setup(hass, config):
+    """Set up the loop monitor and the profiler service."""
+    conf = config.get(DOMAIN, {})
+    monitor = hass.data[DATA_MONITOR] = LoopMonitor(
+        hass.loop,
+        conf.get(CONF_LAG_INTERVAL, DEFAULT_LAG_INTERVAL),
+        conf.get(CONF_SLOW_CALLBACK_THRESHOLD, DEFAULT_SLOW_CALLBACK_THRESHOLD),
+    )
+    async_stop_monitor = monitor.async_start()
+
+    @callback
+    def async_stop(_event):
+        """Stop the loop monitor."""
+        async_stop_monitor()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop)
+
+    hass.components.websocket_api.async_register_command(websocket_loop_stats)
+
+    loop_thread_id = threading.get_ident()
+
+    async def async_start_profile(call):
+        """Profile the event loop for a number of seconds and save it."""
+        if hass.data.get(DATA_RUNNING):
+            raise HomeAssistantError("The profiler is already running")
+
+        hass.data[DATA_RUNNING] = True
+
+        try:
+            if call.data[ATTR_MODE] == MODE_CPROFILE:
+                path = await _async_cprofile(hass, call.data[ATTR_SECONDS])
+            else:
+                path = await _async_sample(
+                    hass, loop_thread_id, call.data[ATTR_SECONDS]
+                )
+        finally:
+            hass.data[DATA_RUNNING] = False
+
+        _LOGGER.warning("Profile of the event loop saved to %s", path)
+        hass.components.persistent_notification.async_create(
+            f"Profile of the event loop saved to {path}",
+            title="Profile captured",
+            notification_id=f"{DOMAIN}_{SERVICE_START}",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START, async_start_profile, schema=SERVICE_START_SCHEMA
+    )
+
+    return True
+
+
+async def _async_cprofile(hass, seconds):
+    """Profile the event loop thread with cProfile."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+
+    path = hass.config.path(f"profile.{int(time.time())}.cprof")
+    await hass.async_add_executor_job(profiler.dump_stats, path)
+    return path
+
+
+async def _async_sample(hass, thread_id, seconds):
+    """Sample the stack of the event loop thread."""
+    stacks = await hass.async_add_executor_job(
+        _sample_stacks, thread_id, seconds, SAMPLE_INTERVAL
+    )
+    path = hass.config.path(f"profile.{int(time.time())}.stacks")
+    await hass.async_add_executor_job(_write_stacks, path, stacks)
+    return path
+
+
+def _sample_stacks(thread_id: int, seconds: float, interval: float) -> CounterType[str]:
+    """Count the stacks of a thread, as folded stacks for flame graphs."""
+    stacks = Counter()  # type: CounterType[str]
+    end = time.monotonic() + seconds
+
+    while time.monotonic() < end:
+        # pylint: disable=protected-access
+        frame = sys._current_frames().get(thread_id)
+        names = []
+
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+            frame = frame.f_back
+
+        if names:
+            stacks[";".join(reversed(names))] += 1
+
+        time.sleep(interval)
+
+    return stacks
+
+
+def _write_stacks(path, stacks):
+    """Write folded stacks to a file."""
+    with open(path, "w") as stacks_file:
+        for stack, count in stacks.most_common():
+            stacks_file.write(f"{stack} {count}\n")
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/loop_stats"})
+def websocket_loop_stats(hass, connection, msg):
+    """Return the lag, slow callbacks and thread queue of the event loop."""
+    stats = hass.data[DATA_MONITOR].as_dict()
+    stats["thread_queue"] = hass.thread_queue.as_dict()
+    connection.send_result(msg["id"], stats)
@@ -0,0 +1,268 @@
+"""Monitor the lag and the slow callbacks of the event loop."""
+import asyncio
+from bisect import bisect_left
+from collections import deque
+import functools
+import logging
+import os
+from time import monotonic, perf_counter, time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+# pylint: disable=protected-access
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BUCKET_LABELS = [str(bound) for bound in BUCKETS] + ["+Inf"]
+
+# Histograms cover the last WINDOW_SLOTS slots of SLOT_SECONDS each
+SLOT_SECONDS = 60
+WINDOW_SLOTS = 15
+
+# Number of recent slow callbacks that are kept
+MAX_RECENT = 50
+
+
+class RollingHistogram:
+    """Histogram of the values recorded in a rolling time window."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        # Slot start, counts per bucket, sum and max of the values
+        self._slots = deque(
+            maxlen=WINDOW_SLOTS
+        )  # type: Deque[Tuple[int, List[int], List[float]]]
+
+    def record(self, value: float, now: Optional[float] = None) -> None:
+        """Record a value."""
+        slot_start = int((monotonic() if now is None else now) // SLOT_SECONDS)
+
+        if not self._slots or self._slots[-1][0] != slot_start:
+            self._slots.append((slot_start, [0] * (len(BUCKETS) + 1), [0.0, 0.0]))
+
+        _, counts, totals = self._slots[-1]
+        counts[bisect_left(BUCKETS, value)] += 1
+        totals[0] += value
+        totals[1] = max(totals[1], value)
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Return the histogram of the values in the window."""
+        first_slot = (
+            int((monotonic() if now is None else now) // SLOT_SECONDS)
+            - WINDOW_SLOTS
+            + 1
+        )
+        counts = [0] * (len(BUCKETS) + 1)
+        total = 0.0
+        maximum = 0.0
+
+        for slot_start, slot_counts, totals in self._slots:
+            if slot_start < first_slot:
+                continue
+
+            for index, count in enumerate(slot_counts):
+                counts[index] += count
+
+            total += totals[0]
+            maximum = max(maximum, totals[1])
+
+        return {
+            "window": WINDOW_SLOTS * SLOT_SECONDS,
+            "buckets": dict(zip(BUCKET_LABELS, counts)),
+            "count": sum(counts),
+            "sum": total,
+            "max": maximum,
+        }
+
+
+def _integration(filename: str) -> str:
+    """Return the integration, or package, a source file belongs to."""
+    parts = filename.replace(os.sep, "/").split("/")
+
+    for marker in ("components", "custom_components"):
+        if marker in parts[:-1]:
+            index = len(parts) - parts[::-1].index(marker)
+            return parts[index].rsplit(".", 1)[0]
+
+    if "homeassistant" in parts[:-1]:
+        return "homeassistant"
+
+    if "site-packages" in parts[:-1]:
+        return parts[parts.index("site-packages") + 1].rsplit(".", 1)[0]
+
+    return parts[-1].rsplit(".", 1)[0]
+
+
+def describe_callback(target: Any) -> Tuple[str, str]:
+    """Return the integration and the function name of a loop callback.
+
+    Callbacks that step tasks are attributed to the coroutine of the task.
+    """
+    while isinstance(target, functools.partial):
+        target = target.func
+
+    owner = getattr(target, "__self__", None)
+
+    if isinstance(owner, asyncio.Future):
+        # Task steps and wakeups
+        coro = getattr(owner, "_coro", None)
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+
+        if code is not None:
+            name = getattr(coro, "__qualname__", code.co_name)
+            return _integration(code.co_filename), name
+
+    code = getattr(getattr(target, "__func__", target), "__code__", None)
+    name = getattr(target, "__qualname__", None) or repr(target)
+
+    if code is None:
+        return "unknown", name
+
+    return _integration(code.co_filename), name
+
+
+class LoopMonitor:
+    """Measure the scheduling lag and the slow callbacks of the event loop.
+
+    The lag is the delay of a callback scheduled at a fixed interval. Slow
+    callbacks are found by timing every handle the loop runs, which is a
+    couple of clock reads per callback. That needs an asyncio loop, loops
+    like uvloop run their handles without asyncio.Handle._run and only get
+    the lag measured.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, interval: float, threshold: float
+    ) -> None:
+        """Initialize the monitor."""
+        self.loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = RollingHistogram()
+        self.slow_callbacks = RollingHistogram()
+        # (integration, function) -> count, total duration and max duration
+        self.slow_by_function = {}  # type: Dict[Tuple[str, str], List[float]]
+        self.recent = deque(maxlen=MAX_RECENT)  # type: Deque[Dict[str, Any]]
+        self._timer = None  # type: Optional[asyncio.TimerHandle]
+        self._orig_run = None  # type: Optional[Callable]
+        self._run = None  # type: Optional[Callable]
+        self.slow_callbacks_supported = isinstance(loop, asyncio.BaseEventLoop)
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start monitoring and return a function that stops it."""
+        self._schedule_lag_check()
+
+        if self.slow_callbacks_supported:
+            self._patch_handles()
+        else:
+            _LOGGER.warning(
+                "Slow callbacks can't be timed on %s, only the lag is measured",
+                type(self.loop).__name__,
+            )
+
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop monitoring."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._run is None:
+            return
+
+        if asyncio.Handle._run is self._run:
+            asyncio.Handle._run = self._orig_run  # type: ignore
+        else:
+            # Patched again by someone else, keep passing through
+            _LOGGER.warning(
+                "Handle._run was replaced after the loop monitor patched it, "
+                "callbacks keep passing through the monitor without being timed"
+            )
+            self.threshold = float("inf")
+
+        self._run = None
+
+    def _schedule_lag_check(self) -> None:
+        """Schedule the next lag measurement."""
+        expected = self.loop.time() + self.interval
+        self._timer = self.loop.call_at(expected, self._check_lag, expected)
+
+    def _check_lag(self, expected: float) -> None:
+        """Record how late the lag measurement ran."""
+        self.lag.record(max(self.loop.time() - expected, 0.0))
+        self._schedule_lag_check()
+
+    def _patch_handles(self) -> None:
+        """Time the callbacks run by the loop."""
+        orig_run = self._orig_run = asyncio.Handle._run
+        loop = self.loop
+        monitor = self
+
+        def _run(handle: asyncio.Handle) -> None:
+            """Run the callback of a handle and time it."""
+            if handle._loop is not loop:  # type: ignore
+                orig_run(handle)
+                return
+
+            start = perf_counter()
+            orig_run(handle)
+            duration = perf_counter() - start
+
+            if duration >= monitor.threshold:
+                monitor.record_slow_callback(
+                    handle._callback, duration  # type: ignore
+                )
+
+        asyncio.Handle._run = self._run = _run  # type: ignore
+
+    def record_slow_callback(self, target: Any, duration: float) -> None:
+        """Record a callback that blocked the loop for too long."""
+        integration, function = describe_callback(target)
+        self.slow_callbacks.record(duration)
+
+        stats = self.slow_by_function.get((integration, function))
+
+        if stats is None:
+            stats = self.slow_by_function[(integration, function)] = [0, 0.0, 0.0]
+
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+
+        self.recent.append(
+            {
+                "integration": integration,
+                "function": function,
+                "duration": duration,
+                "time": time(),
+            }
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the measurements."""
+        return {
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "slow_callbacks_supported": self.slow_callbacks_supported,
+            "lag": self.lag.as_dict(),
+            "slow_callbacks": self.slow_callbacks.as_dict(),
+            "slow_by_function": [
+                {
+                    "integration": integration,
+                    "function": function,
+                    "count": stats[0],
+                    "sum": stats[1],
+                    "max": stats[2],
+                }
+                for (integration, function), stats in sorted(
+                    self.slow_by_function.items(), key=lambda item: -item[1][1]
+                )
+            ],
+            "recent": list(self.recent),
+        }
@@ -1,30 +1,37 @@
 """Support for Prometheus metrics export."""
+import gzip
 import logging
 
-from aiohttp import web
+from aiohttp import hdrs, web
 import voluptuous as vol
 
 from homeassistant import core as hacore
 from homeassistant.components.climate.const import ATTR_CURRENT_TEMPERATURE
-from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http import KEY_HTTP_METRICS, HomeAssistantView
+from homeassistant.components.http.metrics import metrics_lines
+from homeassistant.components.http.static import accepted_encodings
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     ATTR_UNIT_OF_MEASUREMENT,
     ATTR_DEVICE_CLASS,
     CONTENT_TYPE_TEXT_PLAIN,
-    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
     TEMP_FAHRENHEIT,
     TEMP_CELSIUS,
 )
-from homeassistant.helpers import entityfilter, state as state_helper
+from homeassistant.helpers import entityfilter, state as state_helper, state_exporter
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.temperature import fahrenheit_to_celsius
 from homeassistant.helpers.entity_values import EntityValues
 
+from .registry import MetricRegistry
+
 _LOGGER = logging.getLogger(__name__)
 
 API_ENDPOINT = "/api/prometheus"
 
+GZIP_LEVEL = 6
+
 DOMAIN = "prometheus"
 CONF_FILTER = "filter"
 CONF_PROM_NAMESPACE = "namespace"
@@ -65,11 +72,17 @@ def setup(hass, config):
     """Activate Prometheus component."""
     import prometheus_client
 
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
+    registry = MetricRegistry()
+
+    hass.http.register_view(
+        PrometheusView(
+            prometheus_client, registry, f"{namespace}_" if namespace else ""
+        )
+    )
+
     climate_units = hass.config.units.temperature_unit
     override_metric = conf.get(CONF_OVERRIDE_METRIC)
     default_metric = conf.get(CONF_DEFAULT_METRIC)
@@ -80,8 +93,7 @@ def setup(hass, config):
     )
 
     metrics = PrometheusMetrics(
-        prometheus_client,
-        entity_filter,
+        registry,
         namespace,
         climate_units,
         component_config,
@@ -89,7 +101,9 @@ def setup(hass, config):
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    state_exporter.subscribe(
+        hass, DOMAIN, metrics.handle_records, entity_filter, removals=True
+    )
     return True
 
 
@@ -98,8 +112,7 @@ class PrometheusMetrics:
 
     def __init__(
         self,
-        prometheus_client,
-        entity_filter,
+        registry,
         namespace,
         climate_units,
         component_config,
@@ -107,11 +120,10 @@ class PrometheusMetrics:
         default_metric,
     ):
         """Initialize Prometheus Metrics."""
-        self.prometheus_client = prometheus_client
+        self.registry = registry
         self._component_config = component_config
         self._override_metric = override_metric
         self._default_metric = default_metric
-        self._filter = entity_filter
         self._sensor_metric_handlers = [
             self._sensor_override_component_metric,
             self._sensor_override_metric,
@@ -127,40 +139,41 @@ class PrometheusMetrics:
         self._metrics = {}
         self._climate_units = climate_units
 
-    def handle_event(self, event):
-        """Listen for new messages on the bus, and add them to Prometheus."""
-        state = event.data.get("new_state")
-        if state is None:
-            return
+    @hacore.callback
+    def handle_records(self, records):
+        """Add batches of state changes to Prometheus."""
+        for record in records:
+            if record.removed:
+                self.registry.remove_entity(record.entity_id)
+            else:
+                self.handle_state(record.new_state)
 
+    def handle_state(self, state):
+        """Add a state to Prometheus."""
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
         domain, _ = hacore.split_entity_id(entity_id)
 
-        if not self._filter(state.entity_id):
-            return
-
         handler = f"_handle_{domain}"
 
-        if hasattr(self, handler):
-            getattr(self, handler)(state)
-
-        metric = self._metric(
-            "state_change",
-            self.prometheus_client.Counter,
-            "The number of state changes",
-        )
-        metric.labels(**self._labels(state)).inc()
+        # Unavailable entities lose their attributes, keep the last values
+        with self.registry.update_entity(
+            entity_id, remove_stale=state.state != STATE_UNAVAILABLE
+        ):
+            if hasattr(self, handler):
+                getattr(self, handler)(state)
 
-    def _metric(self, metric, factory, documentation, labels=None):
-        if labels is None:
-            labels = ["entity", "friendly_name", "domain"]
+            metric = self._metric(
+                "state_change", self.registry.counter, "The number of state changes"
+            )
+            metric.labels(**self._labels(state)).inc()
 
+    def _metric(self, metric, factory, documentation):
         try:
             return self._metrics[metric]
         except KeyError:
             full_metric_name = f"{self.metrics_prefix}{metric}"
-            self._metrics[metric] = factory(full_metric_name, documentation, labels)
+            self._metrics[metric] = factory(full_metric_name, documentation)
             return self._metrics[metric]
 
     @staticmethod
@@ -185,7 +198,7 @@ class PrometheusMetrics:
         if "battery_level" in state.attributes:
             metric = self._metric(
                 "battery_level_percent",
-                self.prometheus_client.Gauge,
+                self.registry.gauge,
                 "Battery level as a percentage of its capacity",
             )
             try:
@@ -197,7 +210,7 @@ class PrometheusMetrics:
     def _handle_binary_sensor(self, state):
         metric = self._metric(
             "binary_sensor_state",
-            self.prometheus_client.Gauge,
+            self.registry.gauge,
             "State of the binary sensor (0/1)",
         )
         value = self.state_as_number(state)
@@ -206,7 +219,7 @@ class PrometheusMetrics:
     def _handle_input_boolean(self, state):
         metric = self._metric(
             "input_boolean_state",
-            self.prometheus_client.Gauge,
+            self.registry.gauge,
             "State of the input boolean (0/1)",
         )
         value = self.state_as_number(state)
@@ -215,7 +228,7 @@ class PrometheusMetrics:
     def _handle_device_tracker(self, state):
         metric = self._metric(
             "device_tracker_state",
-            self.prometheus_client.Gauge,
+            self.registry.gauge,
             "State of the device tracker (0/1)",
         )
         value = self.state_as_number(state)
@@ -223,14 +236,14 @@ class PrometheusMetrics:
 
     def _handle_person(self, state):
         metric = self._metric(
-            "person_state", self.prometheus_client.Gauge, "State of the person (0/1)"
+            "person_state", self.registry.gauge, "State of the person (0/1)"
         )
         value = self.state_as_number(state)
         metric.labels(**self._labels(state)).set(value)
 
     def _handle_light(self, state):
         metric = self._metric(
-            "light_state", self.prometheus_client.Gauge, "Load level of a light (0..1)"
+            "light_state", self.registry.gauge, "Load level of a light (0..1)"
         )
 
         try:
@@ -245,7 +258,7 @@ class PrometheusMetrics:
 
     def _handle_lock(self, state):
         metric = self._metric(
-            "lock_state", self.prometheus_client.Gauge, "State of the lock (0/1)"
+            "lock_state", self.registry.gauge, "State of the lock (0/1)"
         )
         value = self.state_as_number(state)
         metric.labels(**self._labels(state)).set(value)
@@ -256,9 +269,7 @@ class PrometheusMetrics:
             if self._climate_units == TEMP_FAHRENHEIT:
                 temp = fahrenheit_to_celsius(temp)
             metric = self._metric(
-                "temperature_c",
-                self.prometheus_client.Gauge,
-                "Temperature in degrees Celsius",
+                "temperature_c", self.registry.gauge, "Temperature in degrees Celsius"
             )
             metric.labels(**self._labels(state)).set(temp)
 
@@ -268,15 +279,13 @@ class PrometheusMetrics:
                 current_temp = fahrenheit_to_celsius(current_temp)
             metric = self._metric(
                 "current_temperature_c",
-                self.prometheus_client.Gauge,
+                self.registry.gauge,
                 "Current Temperature in degrees Celsius",
             )
             metric.labels(**self._labels(state)).set(current_temp)
 
         metric = self._metric(
-            "climate_state",
-            self.prometheus_client.Gauge,
-            "State of the thermostat (0/1)",
+            "climate_state", self.registry.gauge, "State of the thermostat (0/1)"
         )
         try:
             value = self.state_as_number(state)
@@ -294,7 +303,7 @@ class PrometheusMetrics:
 
         if metric is not None:
             _metric = self._metric(
-                metric, self.prometheus_client.Gauge, f"Sensor data measured in {unit}"
+                metric, self.registry.gauge, f"Sensor data measured in {unit}"
             )
 
             try:
@@ -354,7 +363,7 @@ class PrometheusMetrics:
 
     def _handle_switch(self, state):
         metric = self._metric(
-            "switch_state", self.prometheus_client.Gauge, "State of the switch (0/1)"
+            "switch_state", self.registry.gauge, "State of the switch (0/1)"
         )
 
         try:
@@ -369,7 +378,7 @@ class PrometheusMetrics:
     def _handle_automation(self, state):
         metric = self._metric(
             "automation_triggered_count",
-            self.prometheus_client.Counter,
+            self.registry.counter,
             "Count of times an automation has been triggered",
         )
 
@@ -382,15 +391,35 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_client):
+    def __init__(self, prometheus_client, registry, metrics_prefix=""):
         """Initialize Prometheus view."""
         self.prometheus_client = prometheus_client
+        self.registry = registry
+        self.metrics_prefix = metrics_prefix
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
+        # The metrics of states are rendered as they change, the registry of
+        # the client library only has the few metrics of the process
+        body = self.registry.render() + self.prometheus_client.generate_latest()
+        http_metrics = request.app.get(KEY_HTTP_METRICS)
+
+        if http_metrics is not None:
+            lines = metrics_lines(http_metrics, self.metrics_prefix)
+            body += "\n".join(lines).encode() + b"\n"
+
+        accepted = accepted_encodings(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+
+        if accepted.get("gzip", accepted.get("*", 0.0)) <= 0:
+            return web.Response(body=body, content_type=CONTENT_TYPE_TEXT_PLAIN)
+
+        body = await request.app["hass"].async_add_executor_job(
+            gzip.compress, body, GZIP_LEVEL
+        )
         return web.Response(
-            body=self.prometheus_client.generate_latest(),
+            body=body,
             content_type=CONTENT_TYPE_TEXT_PLAIN,
+            headers={hdrs.CONTENT_ENCODING: "gzip"},
         )
@@ -0,0 +1,233 @@
+"""Registry of the metrics derived from states, with cached exposition."""
+from contextlib import contextmanager
+import math
+import time
+
+LABEL_ENTITY = "entity"
+
+KIND_COUNTER = "counter"
+KIND_GAUGE = "gauge"
+
+
+def format_value(value):
+    """Format a sample value like the Prometheus client library."""
+    value = float(value)
+
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+
+    text = repr(value)
+    dot = text.find(".")
+
+    # Go switches to exponents sooner than Python
+    if value > 0 and dot > 6:
+        mantissa = f"{text[0]}.{text[1:dot]}{text[dot + 1:]}".rstrip("0.")
+        return f"{mantissa}e+0{dot - 1}"
+
+    return text
+
+
+def _escape_label(value):
+    """Escape a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value):
+    """Escape a help text for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+class Series:
+    """A series of a metric with its rendered sample line."""
+
+    __slots__ = ("family", "key", "prefix", "value", "line", "created")
+
+    def __init__(self, family, key):
+        """Initialize the series."""
+        labels = ",".join(f'{name}="{_escape_label(value)}"' for name, value in key)
+        self.family = family
+        self.key = key
+        self.prefix = f"{family.sample_name}{{{labels}}} "
+        self.value = None
+        self.line = None
+        self.created = None
+
+        if family.kind == KIND_COUNTER:
+            self.value = 0.0
+            self.line = self.prefix + "0.0"
+            self.created = (
+                f"{family.name}_created{{{labels}}} {format_value(time.time())}"
+            )
+
+    def set(self, value):
+        """Set the value of a gauge."""
+        if value == self.value:
+            return
+
+        self.value = value
+        self.line = self.prefix + format_value(value)
+        self.family.changed()
+
+    def inc(self, amount=1):
+        """Increment a counter."""
+        self.set(self.value + amount)
+
+
+class MetricFamily:
+    """A metric, the rendered lines of its series are kept.
+
+    Only series that changed are rendered again, the text of the family is
+    joined again when any of its series changed.
+    """
+
+    def __init__(self, registry, name, kind, documentation):
+        """Initialize the metric."""
+        self.registry = registry
+        self.name = name
+        self.kind = kind
+        # Counters are exposed like the Prometheus client library does
+        self.sample_name = f"{name}_total" if kind == KIND_COUNTER else name
+        self._header = (
+            f"# HELP {self.sample_name} {_escape_help(documentation)}\n"
+            f"# TYPE {self.sample_name} {kind}\n"
+        )
+        self.series = {}
+        self._text = None
+
+    def labels(self, **labels):
+        """Return the series with the labels, add it if it is new."""
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+
+        if series is None:
+            series = self.series[key] = Series(self, key)
+            self.changed()
+
+        self.registry.touch(labels.get(LABEL_ENTITY), series)
+        return series
+
+    def remove(self, series):
+        """Remove a series."""
+        if self.series.get(series.key) is series:
+            del self.series[series.key]
+            self.changed()
+
+    def changed(self):
+        """Mark the text of the family as stale."""
+        self._text = None
+        self.registry.changed()
+
+    def render(self):
+        """Return the family in the text exposition format."""
+        if self._text is not None:
+            return self._text
+
+        samples = [series for series in self.series.values() if series.line]
+
+        if not samples:
+            self._text = ""
+            return self._text
+
+        lines = [series.line for series in samples]
+
+        if self.kind == KIND_COUNTER:
+            lines.append(f"# TYPE {self.name}_created gauge")
+            lines.extend(series.created for series in samples)
+
+        self._text = self._header + "\n".join(lines) + "\n"
+        return self._text
+
+
+class MetricRegistry:
+    """Metrics of the states of entities.
+
+    The series an entity does not get during an update of its state are
+    removed, unless the update asks to keep them, as are all its series when
+    the entity is removed. Metrics of values that went away do thus not
+    linger.
+
+    Not thread safe, only used in the event loop.
+    """
+
+    def __init__(self):
+        """Initialize the registry."""
+        self.families = {}
+        # Entity id -> series of the entity
+        self._entity_series = {}
+        self._updating = None
+        self._touched = None
+        self._body = None
+
+    def gauge(self, name, documentation):
+        """Return a gauge, add it if it is new."""
+        return self._family(name, KIND_GAUGE, documentation)
+
+    def counter(self, name, documentation):
+        """Return a counter, add it if it is new."""
+        return self._family(name, KIND_COUNTER, documentation)
+
+    def _family(self, name, kind, documentation):
+        """Return a metric, add it if it is new."""
+        family = self.families.get(name)
+
+        if family is None:
+            family = self.families[name] = MetricFamily(self, name, kind, documentation)
+
+        return family
+
+    def touch(self, entity_id, series):
+        """Keep a series of the entity that is being updated."""
+        if entity_id is None:
+            return
+
+        if entity_id == self._updating:
+            self._touched.add(series)
+        else:
+            self._entity_series.setdefault(entity_id, set()).add(series)
+
+    @contextmanager
+    def update_entity(self, entity_id, remove_stale=True):
+        """Remove the series an entity did not get while updating it."""
+        self._updating = entity_id
+        self._touched = set()
+
+        try:
+            yield
+        finally:
+            touched = self._touched
+            self._updating = self._touched = None
+            stale = self._entity_series.get(entity_id, set()) - touched
+
+            if remove_stale:
+                self._remove_series(stale)
+            else:
+                touched |= stale
+
+            self._entity_series[entity_id] = touched
+
+    def remove_entity(self, entity_id):
+        """Remove all series of an entity."""
+        self._remove_series(self._entity_series.pop(entity_id, ()))
+
+    @staticmethod
+    def _remove_series(series):
+        """Remove series from their metrics."""
+        for stale in series:
+            stale.family.remove(stale)
+
+    def changed(self):
+        """Mark the exposition as stale."""
+        self._body = None
+
+    def render(self):
+        """Return the metrics in the text exposition format, as bytes."""
+        if self._body is None:
+            self._body = "".join(
+                family.render() for family in self.families.values()
+            ).encode("utf-8")
+
+        return self._body
@@ -1,7 +1,7 @@
 """Models for SQLAlchemy."""
-import json
 from datetime import datetime
 import logging
+from types import MappingProxyType
 
 from sqlalchemy import (
     Boolean,
@@ -18,7 +18,7 @@ from sqlalchemy.ext.declarative import declarative_base
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_bytes, json_dumps, json_loads
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
@@ -48,7 +48,7 @@ class Events(Base):  # type: ignore
         """Create an event database object from a native event."""
         return Events(
             event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
+            event_data=json_dumps(event.data),
             origin=str(event.origin),
             time_fired=event.time_fired,
             context_id=event.context.id,
@@ -62,7 +62,7 @@ class Events(Base):  # type: ignore
         try:
             return Event(
                 self.event_type,
-                json.loads(self.event_data),
+                json_loads(self.event_data),
                 EventOrigin(self.origin),
                 _process_timestamp(self.time_fired),
                 context=context,
@@ -73,6 +73,34 @@ class Events(Base):  # type: ignore
             return None
 
 
+# The columns of the events table event_from_row creates an event from
+EVENT_COLUMNS = (
+    Events.event_type,
+    Events.event_data,
+    Events.origin,
+    Events.time_fired,
+    Events.context_id,
+    Events.context_user_id,
+)
+
+
+def event_from_row(row):
+    """Convert the EVENT_COLUMNS of a row to a native HA Event."""
+    event_type, event_data, origin, time_fired, context_id, context_user_id = row
+    try:
+        return Event(
+            event_type,
+            json_loads(event_data),
+            EventOrigin(origin),
+            _process_timestamp(time_fired),
+            context=Context(id=context_id, user_id=context_user_id),
+        )
+    except ValueError:
+        # When json.loads fails
+        _LOGGER.exception("Error converting row to event: %s", row)
+        return None
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -119,7 +147,7 @@ class States(Base):  # type: ignore
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
+            dbstate.attributes = json_dumps(dict(state.attributes))
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -132,7 +160,7 @@ class States(Base):  # type: ignore
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json_loads(self.attributes),
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated),
                 context=context,
@@ -146,6 +174,111 @@ class States(Base):  # type: ignore
             return None
 
 
+# The columns of the states table a LazyState is created from
+LAZY_STATE_COLUMNS = (
+    States.entity_id,
+    States.state,
+    States.attributes,
+    States.last_changed,
+    States.last_updated,
+    States.context_id,
+    States.context_user_id,
+)
+
+
+class LazyState(State):
+    """A state created from the LAZY_STATE_COLUMNS of a row of the states table.
+
+    Creating it skips the ORM and the validation of a new State. The attributes
+    and the context are only decoded when they are used, and the JSON of the
+    state reuses the attributes JSON stored in the database.
+    """
+
+    __slots__ = [
+        "_row_attributes",
+        "_attributes",
+        "_context_id",
+        "_context_user_id",
+        "_context",
+    ]
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, row):
+        """Initialize the state from a row."""
+        (
+            self.entity_id,
+            self.state,
+            self._row_attributes,
+            last_changed,
+            last_updated,
+            self._context_id,
+            self._context_user_id,
+        ) = row
+        self.last_changed = _process_timestamp(last_changed)
+        self.last_updated = _process_timestamp(last_updated)
+        self._attributes = None
+        self._context = None
+        self._as_json = None
+
+    @property  # type: ignore
+    def attributes(self):
+        """Return the attributes, decoding them on first use."""
+        if self._attributes is None:
+            try:
+                attributes = json_loads(self._row_attributes)
+            except ValueError:
+                # When json.loads fails
+                _LOGGER.exception(
+                    "Error converting attributes of state: %s", self.entity_id
+                )
+                attributes = {}
+            self._attributes = MappingProxyType(attributes)
+        return self._attributes
+
+    @property  # type: ignore
+    def context(self):
+        """Return the context of the state."""
+        if self._context is None:
+            self._context = Context(id=self._context_id, user_id=self._context_user_id)
+        return self._context
+
+    def get_attribute(self, name, default=None):
+        """Return an attribute, without decoding attributes that lack it.
+
+        The name must not contain characters that are escaped in JSON.
+        """
+        if self._attributes is None and '"{}"'.format(name) not in self._row_attributes:
+            return default
+        return self.attributes.get(name, default)
+
+    def as_json(self):
+        """Return the JSON representation of the state."""
+        if self._as_json is not None:
+            return self._as_json
+
+        raw = self._row_attributes
+
+        # Stored attributes can contain NaN, which is not valid JSON
+        if self._attributes is not None or "NaN" in raw or "Infinity" in raw:
+            return super().as_json()
+
+        data = json_bytes(
+            {
+                "entity_id": self.entity_id,
+                "state": self.state,
+                "last_changed": self.last_changed,
+                "last_updated": self.last_updated,
+                "context": {
+                    "id": self._context_id,
+                    "parent_id": None,
+                    "user_id": self._context_user_id,
+                },
+            }
+        )
+        self._as_json = b'{"attributes":' + raw.encode("utf-8") + b"," + data[1:]
+        return self._as_json
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -54,9 +54,13 @@ def commit(session, work):
     return False
 
 
-def execute(qry):
+def execute(qry, to_native=None):
     """Query the database and convert the objects to HA native form.
 
+    Rows are converted by to_native if given, for example LazyState for
+    queries of the LAZY_STATE_COLUMNS, otherwise by their to_native method.
+    Rows converted to None are skipped.
+
     This method also retries a few times in the case of stale connections.
     """
     from sqlalchemy.exc import SQLAlchemyError
@@ -64,9 +68,12 @@ def execute(qry):
     for tryno in range(0, RETRIES):
         try:
             timer_start = time.perf_counter()
-            result = [
-                row for row in (row.to_native() for row in qry) if row is not None
-            ]
+            if to_native is None:
+                rows = (row.to_native() for row in qry)
+            else:
+                rows = (to_native(row) for row in qry)
+
+            result = [row for row in rows if row is not None]
 
             if _LOGGER.isEnabledFor(logging.DEBUG):
                 elapsed = time.perf_counter() - timer_start
@@ -82,7 +82,7 @@ async def async_setup(hass, config):
 
     async def reload_service(service):
         """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -141,12 +141,17 @@ async def _async_process_config(hass, config, component):
             return
         await script.async_turn_on(variables=service.data, context=service.context)
 
-    scripts = []
-
-    for object_id, cfg in config.get(DOMAIN, {}).items():
+    def create_entity(object_id, cfg):
+        """Create a script entity."""
         alias = cfg.get(CONF_ALIAS, object_id)
-        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
-        scripts.append(script)
+        return ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
+
+    configs = config.get(DOMAIN, {})
+
+    # Scripts that did not change keep running, removed ones remove their service
+    await component.async_update_config_entities(configs, create_entity)
+
+    for object_id, cfg in configs.items():
         hass.services.async_register(
             DOMAIN, object_id, service_handler, schema=SCRIPT_SERVICE_SCHEMA
         )
@@ -158,8 +163,6 @@ async def _async_process_config(hass, config, component):
         }
         async_set_service_schema(hass, DOMAIN, object_id, service_desc)
 
-    await component.async_add_entities(scripts)
-
 
 class ScriptEntity(ToggleEntity):
     """Representation of a script entity."""
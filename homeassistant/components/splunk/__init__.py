@@ -13,9 +13,8 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_PORT,
     CONF_TOKEN,
-    EVENT_STATE_CHANGED,
 )
-from homeassistant.helpers import state as state_helper
+from homeassistant.helpers import state_exporter
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import FILTER_SCHEMA
 from homeassistant.helpers.json import JSONEncoder
@@ -83,31 +82,22 @@ def setup(hass, config):
     event_collector = "{}{}:{}/services/collector/event".format(uri_scheme, host, port)
     headers = {AUTHORIZATION: "Splunk {}".format(token)}
 
-    def splunk_event_listener(event):
-        """Listen for new messages on the bus and sends them to Splunk."""
-        state = event.data.get("new_state")
-
-        if state is None or not entity_filter(state.entity_id):
-            return
-
-        try:
-            _state = state_helper.state_as_number(state)
-        except ValueError:
-            _state = state.state
-
+    def splunk_event_listener(records):
+        """Send batches of state changes to Splunk."""
         json_body = [
             {
-                "domain": state.domain,
-                "entity_id": state.object_id,
-                "attributes": dict(state.attributes),
-                "time": str(event.time_fired),
-                "value": _state,
+                "domain": record.domain,
+                "entity_id": record.object_id,
+                "attributes": dict(record.attributes),
+                "time": str(record.time_fired),
+                "value": record.state if record.value is None else record.value,
                 "host": name,
             }
+            for record in records
         ]
 
         post_request(event_collector, json_body, headers, verify_ssl)
 
-    hass.bus.listen(EVENT_STATE_CHANGED, splunk_event_listener)
+    state_exporter.subscribe(hass, DOMAIN, splunk_event_listener, entity_filter)
 
     return True
@@ -275,12 +275,16 @@ class StatisticsSensor(Entity):
         If MaxAge is provided then query will restrict to entries younger then
         current datetime - MaxAge.
         """
-        from homeassistant.components.recorder.models import States
+        from homeassistant.components.recorder.models import (
+            LAZY_STATE_COLUMNS,
+            LazyState,
+            States,
+        )
 
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
         with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
+            query = session.query(*LAZY_STATE_COLUMNS).filter(
                 States.entity_id == self._entity_id.lower()
             )
 
@@ -298,7 +302,7 @@ class StatisticsSensor(Entity):
             query = query.order_by(States.last_updated.desc()).limit(
                 self._sampling_size
             )
-            states = execute(query)
+            states = execute(query, LazyState)
 
         for state in reversed(states):
             self._add_state_to_queue(state)
@@ -92,6 +92,28 @@ def _figure_out_source(record, call_stack, hass):
     return record.pathname
 
 
+def _root_cause(record):
+    """Return the last frame of the traceback of a record, if any."""
+    if not record.exc_info or record.exc_info[2] is None:
+        return None
+
+    trace = record.exc_info[2]
+    while trace.tb_next is not None:
+        trace = trace.tb_next
+
+    code = trace.tb_frame.f_code
+    return str(
+        traceback.FrameSummary(
+            code.co_filename, trace.tb_lineno, code.co_name, lookup_line=False
+        )
+    )
+
+
+def _entry_key(message, root_cause):
+    """Return the key of an entry in the DedupStore."""
+    return str(frozenset([message, root_cause]))
+
+
 class LogEntry:
     """Store HA log entries."""
 
@@ -101,20 +123,13 @@ class LogEntry:
         self.level = record.levelname
         self.message = record.getMessage()
         self.exception = ""
-        self.root_cause = None
         if record.exc_info:
             self.exception = "".join(traceback.format_exception(*record.exc_info))
-            _, _, tb = record.exc_info  # pylint: disable=invalid-name
-            # Last line of traceback contains the root cause of the exception
-            if traceback.extract_tb(tb):
-                self.root_cause = str(traceback.extract_tb(tb)[-1])
+        # Last line of traceback contains the root cause of the exception
+        self.root_cause = _root_cause(record)
         self.source = source
         self.count = 1
 
-    def hash(self):
-        """Calculate a key for DedupStore."""
-        return frozenset([self.message, self.root_cause])
-
     def to_dict(self):
         """Convert object into dict to maintain backward compatibility."""
         return vars(self)
@@ -130,7 +145,7 @@ class DedupStore(OrderedDict):
 
     def add_entry(self, entry):
         """Add a new entry."""
-        key = str(entry.hash())
+        key = _entry_key(entry.message, entry.root_cause)
 
         if key in self:
             # Update stored entry
@@ -145,6 +160,22 @@ class DedupStore(OrderedDict):
             # Removes the first record which should also be the oldest
             self.popitem(last=False)
 
+    def add_repeat(self, record):
+        """Count a record as a repeat of a stored entry.
+
+        Returns False if no entry for the record is stored yet.
+        """
+        key = _entry_key(record.getMessage(), _root_cause(record))
+        entry = self.get(key)
+
+        if entry is None:
+            return False
+
+        entry.count += 1
+        entry.timestamp = record.created
+        self.move_to_end(key)
+        return True
+
     def to_list(self):
         """Return reversed list of log entries - LIFO."""
         return [value.to_dict() for value in reversed(self.values())]
@@ -168,6 +199,11 @@ class LogErrorHandler(logging.Handler):
         be changed if needed.
         """
         if record.levelno >= logging.WARN:
+            # Repeats are only counted, so skip extracting the call stack and
+            # formatting the exception unless an event has to be fired.
+            if not self.fire_event and self.records.add_repeat(record):
+                return
+
             stack = []
             if not record.exc_info:
                 stack = [f for f, _, _, _ in traceback.extract_stack()]
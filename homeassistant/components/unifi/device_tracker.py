@@ -115,13 +115,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     registry = await entity_registry.async_get_registry(hass)
 
     # Restore clients that is not a part of active clients list.
-    for entity in registry.entities.values():
+    for entity in entity_registry.async_entries_for_config_entry(
+        registry, config_entry.entry_id
+    ):
 
-        if (
-            entity.config_entry_id == config_entry.entry_id
-            and entity.domain == DOMAIN
-            and "-" in entity.unique_id
-        ):
+        if entity.domain == DOMAIN and "-" in entity.unique_id:
 
             mac, _ = entity.unique_id.split("-", 1)
 
@@ -23,6 +23,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
+    async_reg(hass, handle_http_metrics)
 
 
 def pong_message(iden):
@@ -59,7 +60,9 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            connection.send_message(
+                messages.state_changed_event_message(msg["id"], event)
+            )
 
     else:
 
@@ -172,7 +175,13 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    try:
+        result = messages.result_message_json(msg["id"], messages.states_json(states))
+    except (ValueError, TypeError):
+        # Let the writer report the error
+        result = messages.result_message(msg["id"], states)
+
+    connection.send_message(result)
 
 
 @decorators.async_response
@@ -246,3 +255,22 @@ def handle_render_template(hass, connection, msg):
 
     connection.send_result(msg["id"])
     state_listener()
+
+
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "http/metrics"})
+def handle_http_metrics(hass, connection, msg):
+    """Handle get HTTP metrics command.
+
+    Async friendly.
+    """
+    metrics = getattr(hass.http, "metrics", None)
+
+    if metrics is None:
+        connection.send_error(
+            msg["id"], const.ERR_NOT_FOUND, "HTTP metrics are not enabled"
+        )
+        return
+
+    connection.send_result(msg["id"], metrics.as_dict())
@@ -2,8 +2,8 @@
 import asyncio
 from concurrent import futures
 from functools import partial
-import json
-from homeassistant.helpers.json import JSONEncoder
+
+from homeassistant.helpers.json import json_dumps
 
 DOMAIN = "websocket_api"
 URL = "/api/websocket"
@@ -32,4 +32,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = DOMAIN + ".connections"
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP = partial(json_dumps, allow_nan=False)
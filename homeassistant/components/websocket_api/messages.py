@@ -2,7 +2,10 @@
 
 import voluptuous as vol
 
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import State
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dumps
 
 from . import const
 
@@ -32,6 +35,68 @@ def error_message(iden, code, message):
     }
 
 
+def result_message_json(iden, result_json):
+    """Return a serialized success result message with a serialized result."""
+    return '{{"id": {}, "type": "{}", "success": true, "result": {}}}'.format(
+        iden, const.TYPE_RESULT, result_json
+    )
+
+
+def states_json(states):
+    """Return the serialized list of states, reusing their cached JSON.
+
+    Raises ValueError or TypeError if a state can't be serialized.
+    """
+    return (b"[" + b",".join(state.as_json() for state in states) + b"]").decode(
+        "utf-8"
+    )
+
+
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def state_changed_event_message(iden, event):
+    """Return a serialized state changed event message.
+
+    Reuses the cached JSON of the old and new states. Returns a regular event
+    message for events that don't come from the state machine or can't be
+    serialized.
+    """
+    data = event.data
+    old_state = data.get("old_state")
+    new_state = data.get("new_state")
+
+    if (
+        event.event_type != EVENT_STATE_CHANGED
+        or len(data) != 3
+        or not isinstance(old_state, (State, type(None)))
+        or not isinstance(new_state, (State, type(None)))
+    ):
+        return event_message(iden, event)
+
+    try:
+        return "".join(
+            (
+                '{"id": ',
+                str(iden),
+                ', "type": "event", "event": {"event_type": "',
+                EVENT_STATE_CHANGED,
+                '", "data": {"entity_id": ',
+                json_dumps(data["entity_id"]),
+                ', "old_state": ',
+                "null" if old_state is None else old_state.as_json().decode("utf-8"),
+                ', "new_state": ',
+                "null" if new_state is None else new_state.as_json().decode("utf-8"),
+                '}, "origin": ',
+                json_dumps(str(event.origin)),
+                ', "time_fired": ',
+                json_dumps(event.time_fired),
+                ', "context": ',
+                json_dumps(event.context.as_dict()),
+                "}}",
+            )
+        )
+    except (ValueError, TypeError):
+        return event_message(iden, event)
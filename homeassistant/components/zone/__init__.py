@@ -22,8 +22,8 @@ from homeassistant.util.location import distance
 
 
 from .config_flow import configured_zones
-from .const import CONF_PASSIVE, DOMAIN, HOME_ZONE, ATTR_PASSIVE, ATTR_RADIUS
-from .zone import Zone
+from .const import CONF_PASSIVE, DOMAIN, HOME_ZONE, ATTR_RADIUS
+from .zone import Zone, ZoneIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +34,8 @@ DEFAULT_RADIUS = 100
 ENTITY_ID_FORMAT = "zone.{}"
 ENTITY_ID_HOME = ENTITY_ID_FORMAT.format(HOME_ZONE)
 
+DATA_ZONE_INDEX = "zone_index"
+
 ICON_HOME = "mdi:home"
 ICON_IMPORT = "mdi:import"
 
@@ -57,19 +59,19 @@ def async_active_zone(hass, latitude, longitude, radius=0):
 
     This method must be run in the event loop.
     """
-    # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (
-        hass.states.get(entity_id)
-        for entity_id in sorted(hass.states.async_entity_ids(DOMAIN))
-    )
+    index = hass.data.get(DATA_ZONE_INDEX)
+
+    if index is None:
+        index = hass.data[DATA_ZONE_INDEX] = ZoneIndex(hass)
+        index.async_setup()
+
+    # Zones are sorted so that we are deterministic if equal distance to 2 zones
+    zones = index.async_candidates(latitude, longitude, radius)
 
     min_dist = None
     closest = None
 
     for zone in zones:
-        if zone.attributes.get(ATTR_PASSIVE):
-            continue
-
         zone_dist = distance(
             latitude,
             longitude,
@@ -1,18 +1,77 @@
 """Zone entity and functionality."""
-from homeassistant.const import ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from homeassistant.const import (
+    ATTR_HIDDEN,
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.util.location import distance
 
-from .const import ATTR_PASSIVE, ATTR_RADIUS
+from .const import ATTR_PASSIVE, ATTR_RADIUS, DOMAIN
 
 STATE = "zoning"
 
+# Less than the meters in a degree of latitude, or of longitude at the equator
+METERS_PER_DEGREE = 110000
+# Size in degrees of the grid cells zones are indexed by
+CELL_SIZE = 0.1
+# Zones and queries covering more cells than this are not looked up by cell
+MAX_CELLS = 100
+
+Bounds = Tuple[float, float, float, float]
+Cell = Tuple[int, int]
+
+
+def zone_bounds(latitude, longitude, radius) -> Optional[Bounds]:
+    """Return min and max latitude and longitude around a circle.
+
+    Every point within radius meters of the center is inside the bounds.
+    Returns None near the poles or the antimeridian, where no simple bounds
+    exist.
+
+    Async friendly.
+    """
+    lat_delta = radius / METERS_PER_DEGREE
+    min_lat = latitude - lat_delta
+    max_lat = latitude + lat_delta
+
+    if min_lat < -89 or max_lat > 89:
+        return None
+
+    lon_delta = radius / (
+        METERS_PER_DEGREE * math.cos(math.radians(max(-min_lat, max_lat)))
+    )
+    min_lon = longitude - lon_delta
+    max_lon = longitude + lon_delta
+
+    if min_lon < -180 or max_lon > 180:
+        return None
+
+    return min_lat, max_lat, min_lon, max_lon
+
 
 def in_zone(zone, latitude, longitude, radius=0) -> bool:
     """Test if given latitude, longitude is in given zone.
 
     Async friendly.
     """
+    bounds = zone_bounds(
+        zone.attributes[ATTR_LATITUDE],
+        zone.attributes[ATTR_LONGITUDE],
+        zone.attributes[ATTR_RADIUS] + radius,
+    )
+
+    # Skip computing the distance to zones that are clearly too far away
+    if bounds is not None and not (
+        bounds[0] <= latitude <= bounds[1] and bounds[2] <= longitude <= bounds[3]
+    ):
+        return False
+
     zone_dist = distance(
         latitude,
         longitude,
@@ -23,6 +82,116 @@ def in_zone(zone, latitude, longitude, radius=0) -> bool:
     return zone_dist - radius < zone.attributes[ATTR_RADIUS]
 
 
+def _cells(bounds: Optional[Bounds]) -> Optional[List[Cell]]:
+    """Return the grid cells that bounds overlap, None if there are too many."""
+    if bounds is None:
+        return None
+
+    min_lat, max_lat, min_lon, max_lon = bounds
+    lat_range = range(
+        math.floor(min_lat / CELL_SIZE), math.floor(max_lat / CELL_SIZE) + 1
+    )
+    lon_range = range(
+        math.floor(min_lon / CELL_SIZE), math.floor(max_lon / CELL_SIZE) + 1
+    )
+
+    if len(lat_range) * len(lon_range) > MAX_CELLS:
+        return None
+
+    return [(lat, lon) for lat in lat_range for lon in lon_range]
+
+
+class ZoneIndex:
+    """Grid index of the states of the active zones.
+
+    Zones are indexed by the grid cells their circle overlaps, so finding the
+    zones around a location only needs to compute the distance to zones in
+    the cells near it. The index follows the zone states in the state machine.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        self._zones = {}  # type: Dict[str, object]
+        self._cells = {}  # type: Dict[Cell, Set[str]]
+        # Zones that are checked for every location
+        self._unbounded = set()  # type: Set[str]
+        self._zone_cells = {}  # type: Dict[str, List[Cell]]
+
+    @callback
+    def async_setup(self):
+        """Index the current zones and follow their changes."""
+        for entity_id in self.hass.states.async_entity_ids(DOMAIN):
+            self._async_update(entity_id, self.hass.states.get(entity_id))
+
+        self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, event):
+        """Update the index when a zone changes."""
+        entity_id = event.data["entity_id"]
+
+        if entity_id.startswith(DOMAIN + "."):
+            self._async_update(entity_id, event.data["new_state"])
+
+    @callback
+    def _async_update(self, entity_id, state):
+        """Replace the indexed state of a zone."""
+        if self._zones.pop(entity_id, None) is not None:
+            cells = self._zone_cells.pop(entity_id, None)
+
+            if cells is None:
+                self._unbounded.discard(entity_id)
+
+            for cell in cells or ():
+                entity_ids = self._cells[cell]
+                entity_ids.discard(entity_id)
+                if not entity_ids:
+                    del self._cells[cell]
+
+        if state is None or state.attributes.get(ATTR_PASSIVE):
+            return
+
+        try:
+            bounds = zone_bounds(
+                state.attributes[ATTR_LATITUDE],
+                state.attributes[ATTR_LONGITUDE],
+                state.attributes[ATTR_RADIUS],
+            )
+        except (KeyError, TypeError):
+            # Not a valid zone, it can never contain a location
+            return
+
+        self._zones[entity_id] = state
+        cells = _cells(bounds)
+
+        if cells is None:
+            self._unbounded.add(entity_id)
+            return
+
+        self._zone_cells[entity_id] = cells
+
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(entity_id)
+
+    @callback
+    def async_candidates(self, latitude, longitude, radius=0) -> Iterator:
+        """Return the states of the zones that can contain a location.
+
+        Zones are returned sorted by entity id.
+        """
+        cells = _cells(zone_bounds(latitude, longitude, radius))
+
+        if cells is None:
+            entity_ids = set(self._zones)  # type: Set[str]
+        else:
+            entity_ids = set(self._unbounded)
+            for cell in cells:
+                entity_ids.update(self._cells.get(cell, ()))
+
+        return (self._zones[entity_id] for entity_id in sorted(entity_ids))
+
+
 class Zone(Entity):
     """Representation of a Zone."""
 
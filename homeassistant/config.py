@@ -46,6 +46,7 @@ from homeassistant.const import (
     CONF_CUSTOMIZE_DOMAIN,
     CONF_CUSTOMIZE_GLOB,
     CONF_WHITELIST_EXTERNAL_DIRS,
+    CONF_EXECUTOR_POOLS,
     CONF_AUTH_PROVIDERS,
     CONF_AUTH_MFA_MODULES,
     CONF_TYPE,
@@ -194,6 +195,9 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend(
         # pylint: disable=no-value-for-parameter
         vol.All(cv.ensure_list, [vol.IsDir()]),
         vol.Optional(CONF_PACKAGES, default={}): PACKAGES_CONFIG_SCHEMA,
+        vol.Optional(CONF_EXECUTOR_POOLS, default={}): {
+            cv.string: vol.All(vol.Coerce(int), vol.Range(min=1))
+        },
         vol.Optional(CONF_AUTH_PROVIDERS): vol.All(
             cv.ensure_list,
             [
@@ -547,6 +551,9 @@ async def async_process_ha_core_config(
     if CONF_WHITELIST_EXTERNAL_DIRS in config:
         hac.whitelist_external_dirs.update(set(config[CONF_WHITELIST_EXTERNAL_DIRS]))
 
+    # Executors that were already created keep their size
+    hac.executor_pools = config[CONF_EXECUTOR_POOLS]
+
     # Customize
     cust_exact = dict(config[CONF_CUSTOMIZE])
     cust_domain = dict(config[CONF_CUSTOMIZE_DOMAIN])
@@ -77,6 +77,7 @@ CONF_ENTITY_NAMESPACE = "entity_namespace"
 CONF_ENTITY_PICTURE_TEMPLATE = "entity_picture_template"
 CONF_EVENT = "event"
 CONF_EXCLUDE = "exclude"
+CONF_EXECUTOR_POOLS = "executor_pools"
 CONF_FILE_PATH = "file_path"
 CONF_FILENAME = "filename"
 CONF_FOR = "for"
@@ -432,6 +433,8 @@ URL_API_SERVICES = "/api/services"
 URL_API_SERVICES_SERVICE = "/api/services/{}/{}"
 URL_API_COMPONENTS = "/api/components"
 URL_API_ERROR_LOG = "/api/error_log"
+URL_API_EXECUTORS = "/api/executors"
+URL_API_EXPORTERS = "/api/exporters"
 URL_API_LOG_OUT = "/api/log_out"
 URL_API_TEMPLATE = "/api/template"
 
@@ -5,7 +5,7 @@ Home Assistant is a Home Automation framework for observing the state
 of entities and react to changes.
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor
 import datetime
 import enum
 import functools
@@ -28,6 +28,7 @@ from typing import (  # noqa: F401 pylint: disable=unused-import
     Set,
     TYPE_CHECKING,
     Awaitable,
+    Container,
     Iterator,
 )
 
@@ -68,10 +69,13 @@ from homeassistant.util.async_ import (
     run_coroutine_threadsafe,
     run_callback_threadsafe,
     fire_coroutine_threadsafe,
+    ThreadsafeCallbackQueue,
 )
 from homeassistant import util
+from homeassistant.util.executor import InstrumentedThreadPoolExecutor
 import homeassistant.util.dt as dt_util
 from homeassistant.util import location, slugify
+from homeassistant.util.json import json_bytes
 from homeassistant.util.unit_system import (  # NOQA
     UnitSystem,
     IMPERIAL_SYSTEM,
@@ -163,6 +167,54 @@ class CoreState(enum.Enum):
         return self.value  # type: ignore
 
 
+class HassJobType(enum.Enum):
+    """Represent how a job target is run."""
+
+    coroutine_function = "COROUTINE_FUNCTION"
+    callback = "CALLBACK"
+    executor = "EXECUTOR"
+
+    def __str__(self) -> str:
+        """Return the job type."""
+        return self.value  # type: ignore
+
+
+class HassJob:
+    """A job target and how it is run.
+
+    The target is classified once, so running the job does not need to unwrap
+    partials and inspect the target again.
+    """
+
+    __slots__ = ["target", "job_type"]
+
+    def __init__(self, target: Callable[..., Any]) -> None:
+        """Initialize the job."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine objects can't be used as a job target")
+
+        self.target = target
+        self.job_type = _get_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_job_type(target: Callable[..., Any]) -> HassJobType:
+    """Return how a job target is run."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if is_callback(check_target):
+        return HassJobType.callback
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.coroutine_function
+    return HassJobType.executor
+
+
 class HomeAssistant:
     """Root object of the Home Assistant home automation."""
 
@@ -175,11 +227,15 @@ class HomeAssistant:
             "thread_name_prefix": "SyncWorker",
         }  # type: Dict[str, Any]
 
-        self.executor = ThreadPoolExecutor(**executor_opts)
+        self.executor = InstrumentedThreadPoolExecutor(**executor_opts)
         self.loop.set_default_executor(self.executor)
+        # Named executors, created when first used if their size is configured
+        self.executors = {}  # type: Dict[str, InstrumentedThreadPoolExecutor]
         self.loop.set_exception_handler(async_loop_exception_handler)
         self._pending_tasks: list = []
         self._track_task = True
+        # Callbacks from other threads, run in batches in the event loop
+        self.thread_queue = ThreadsafeCallbackQueue(self.loop)
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
@@ -284,7 +340,7 @@ class HomeAssistant:
         """
         if target is None:
             raise ValueError("Don't call add_job with None")
-        self.loop.call_soon_threadsafe(self.async_add_job, target, *args)
+        self.thread_queue.call_soon(self.async_add_job, target, *args)
 
     @callback
     def async_add_job(
@@ -297,26 +353,37 @@ class HomeAssistant:
         target: target to call.
         args: parameters for method to call.
         """
+        if asyncio.iscoroutine(target):
+            return self.async_create_task(target)  # type: ignore
+
+        return self.async_add_hass_job(HassJob(target), *args)
+
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a job that was classified in advance from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: job to run.
+        args: parameters for method to call.
+        """
         task = None
 
-        # Check for partials to properly determine if coroutine function
-        check_target = target
-        while isinstance(check_target, functools.partial):
-            check_target = check_target.func
-
-        if asyncio.iscoroutine(check_target):
-            task = self.loop.create_task(target)  # type: ignore
-        elif is_callback(check_target):
-            self.loop.call_soon(target, *args)
-        elif asyncio.iscoroutinefunction(check_target):
-            task = self.loop.create_task(target(*args))
+        if hassjob.job_type == HassJobType.callback:
+            self.loop.call_soon(hassjob.target, *args)
+            return None
+
+        if hassjob.job_type == HassJobType.coroutine_function:
+            task = self.loop.create_task(hassjob.target(*args))
         else:
             task = self.loop.run_in_executor(  # type: ignore
-                None, target, *args
+                None, hassjob.target, *args
             )
 
         # If a task is scheduled
-        if self._track_task and task is not None:
+        if self._track_task:
             self._pending_tasks.append(task)
 
         return task
@@ -338,10 +405,13 @@ class HomeAssistant:
 
     @callback
     def async_add_executor_job(
-        self, target: Callable[..., T], *args: Any
+        self, target: Callable[..., T], *args: Any, executor: Optional[Executor] = None
     ) -> Awaitable[T]:
-        """Add an executor job from within the event loop."""
-        task = self.loop.run_in_executor(None, target, *args)
+        """Add an executor job from within the event loop.
+
+        The job runs in the default executor unless another one is passed.
+        """
+        task = self.loop.run_in_executor(executor, target, *args)
 
         # If a task is scheduled
         if self._track_task:
@@ -349,6 +419,40 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_get_executor(self, *names: str) -> Executor:
+        """Return the executor of the first name with a configured pool size.
+
+        Integrations or categories of work with a pool size in the
+        executor_pools core configuration get their own executor, so they
+        can't starve others of workers. Other names share the default executor.
+        """
+        for name in names:
+            executor = self.executors.get(name)
+
+            if executor is not None:
+                return executor
+
+            max_workers = self.config.executor_pools.get(name)
+
+            if max_workers is not None:
+                executor = self.executors[name] = InstrumentedThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"SyncWorker_{name}"
+                )
+                return executor
+
+        return self.executor
+
+    @callback
+    def async_executor_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the metrics of the default and the named executors."""
+        metrics = {"default": self.executor.as_dict()}
+
+        for name, executor in self.executors.items():
+            metrics[name] = executor.as_dict()
+
+        return metrics
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -373,6 +477,26 @@ class HomeAssistant:
         else:
             self.async_add_job(target, *args)
 
+    @callback
+    def async_run_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Run a job that was classified in advance from within the event loop.
+
+        Callbacks are run right away, other jobs are scheduled and their
+        future is returned.
+
+        This method must be run in the event loop.
+
+        hassjob: job to run.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.callback:
+            hassjob.target(*args)
+            return None
+
+        return self.async_add_hass_job(hassjob, *args)
+
     def block_till_done(self) -> None:
         """Block till all pending work is done."""
         run_coroutine_threadsafe(self.async_block_till_done(), self.loop).result()
@@ -428,6 +552,8 @@ class HomeAssistant:
         self.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
         await self.async_block_till_done()
         self.executor.shutdown()
+        for executor in self.executors.values():
+            executor.shutdown()
 
         self.exit_code = exit_code
 
@@ -471,7 +597,7 @@ class Event:
         event_type: str,
         data: Optional[Dict] = None,
         origin: EventOrigin = EventOrigin.local,
-        time_fired: Optional[int] = None,
+        time_fired: Optional[datetime.datetime] = None,
         context: Optional[Context] = None,
     ) -> None:
         """Initialize a new event."""
@@ -521,7 +647,7 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[HassJob]] = {}
         self._hass = hass
 
     @callback
@@ -547,7 +673,7 @@ class EventBus:
         context: Optional[Context] = None,
     ) -> None:
         """Fire an event."""
-        self._hass.loop.call_soon_threadsafe(
+        self._hass.thread_queue.call_soon(
             self.async_fire, event_type, event_data, origin, context
         )
 
@@ -578,8 +704,8 @@ class EventBus:
         if not listeners:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        for job in listeners:
+            self._hass.async_add_hass_job(job, event)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -604,16 +730,24 @@ class EventBus:
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        This method must be run in the event loop.
+        """
+        return self._async_listen_job(event_type, HassJob(listener))
+
+    @callback
+    def _async_listen_job(self, event_type: str, job: HassJob) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with a job.
+
         This method must be run in the event loop.
         """
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(job)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [job]
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            self._async_remove_listener(event_type, job)
 
         return remove_listener
 
@@ -646,6 +780,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        listener_job = HassJob(listener)
 
         @callback
         def onetime_listener(event: Event) -> None:
@@ -658,19 +793,21 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
-            self._async_remove_listener(event_type, onetime_listener)
-            self._hass.async_run_job(listener, event)
+            self._async_remove_listener(event_type, job)
+            self._hass.async_run_hass_job(listener_job, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        job = HassJob(onetime_listener)
+
+        return self._async_listen_job(event_type, job)
 
     @callback
-    def _async_remove_listener(self, event_type: str, listener: Callable) -> None:
+    def _async_remove_listener(self, event_type: str, job: HassJob) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(job)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -678,7 +815,7 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning("Unable to remove unknown listener %s", job.target)
 
 
 class State:
@@ -699,6 +836,7 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "_as_json",
     ]
 
     def __init__(
@@ -738,6 +876,7 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        self._as_json = None  # type: Optional[bytes]
 
     @property
     def domain(self) -> str:
@@ -773,6 +912,19 @@ class State:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> bytes:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The JSON is created once and reused. Raises ValueError if the
+        attributes contain NaN or infinity and TypeError if they can't be
+        serialized.
+        """
+        if self._as_json is None:
+            self._as_json = json_bytes(self.as_dict(), allow_nan=False)
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -809,8 +961,8 @@ class State:
 
     def __eq__(self, other: Any) -> bool:
         """Return the comparison of the state."""
-        return (  # type: ignore
-            self.__class__ == other.__class__
+        return (
+            isinstance(other, State)
             and self.entity_id == other.entity_id
             and self.state == other.state
             and self.attributes == other.attributes
@@ -837,6 +989,10 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states = {}  # type: Dict[str, State]
+        # Entity id -> n, where entity_id_2 up to entity_id_n are known to be
+        # states. Ids only taken in reserved containers are not counted, those
+        # containers can change without us knowing.
+        self._suffixes = {}  # type: Dict[str, int]
         self._bus = bus
         self._loop = loop
 
@@ -864,6 +1020,37 @@ class StateMachine:
             if state.domain == domain_filter
         ]
 
+    @callback
+    def async_unique_entity_id(self, entity_id: str, *reserved: Container[str]) -> str:
+        """Return an entity id that is not in use.
+
+        Returns entity_id if it is free, otherwise entity_id with the lowest
+        free suffix _2, _3, .. Ids are checked against the state machine and
+        the passed in containers of reserved ids, without copying them.
+
+        This method must be run in the event loop.
+        """
+
+        def in_use(test_id: str) -> bool:
+            """Return if an entity id is taken."""
+            return test_id in self._states or any(test_id in ids for ids in reserved)
+
+        if not in_use(entity_id):
+            return entity_id
+
+        known = self._suffixes.get(entity_id, 1)
+        tries = known + 1
+        test_id = f"{entity_id}_{tries}"
+
+        while in_use(test_id):
+            if known == tries - 1 and test_id in self._states:
+                known = tries
+            tries += 1
+            test_id = f"{entity_id}_{tries}"
+
+        self._suffixes[entity_id] = known
+        return test_id
+
     def all(self) -> List[State]:
         """Create a list of all states."""
         return run_callback_threadsafe(  # type: ignore
@@ -916,6 +1103,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        prefix, _, suffix = entity_id.rpartition("_")
+
+        if suffix.isdigit() and self._suffixes.get(prefix, 0) >= int(suffix):
+            self._suffixes[prefix] = int(suffix) - 1
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1293,6 +1485,9 @@ class Config:
         # List of allowed external dirs to access
         self.whitelist_external_dirs = set()  # type: Set[str]
 
+        # Max workers of executors by integration or category name
+        self.executor_pools = {}  # type: Dict[str, int]
+
     def distance(self, lat: float, lon: float) -> Optional[float]:
         """Calculate distance from Home Assistant.
 
@@ -2,8 +2,6 @@
 import logging
 import uuid
 from asyncio import Event
-from collections import OrderedDict
-from typing import MutableMapping  # noqa: F401
 from typing import Iterable, Optional, cast
 
 import attr
@@ -11,6 +9,7 @@ import attr
 from homeassistant.core import callback
 from homeassistant.loader import bind_hass
 
+from .registry import IndexKey, RegistryItems
 from .typing import HomeAssistantType
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,13 +29,22 @@ class AreaEntry:
     id = attr.ib(type=str, default=attr.Factory(lambda: uuid.uuid4().hex))
 
 
+class AreaRegistryItems(RegistryItems[AreaEntry]):
+    """Area registry entries indexed by name."""
+
+    def _index_keys(self, entry: AreaEntry) -> Iterable[IndexKey]:
+        """Return the index keys of an entry."""
+        if entry.name is not None:
+            yield ("name", entry.name)
+
+
 class AreaRegistry:
     """Class to hold a registry of areas."""
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the area registry."""
         self.hass = hass
-        self.areas = {}  # type: MutableMapping[str, AreaEntry]
+        self.areas = AreaRegistryItems()
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
 
     @callback
@@ -110,16 +118,14 @@ class AreaRegistry:
     @callback
     def _async_is_registered(self, name: str) -> Optional[AreaEntry]:
         """Check if a name is currently registered."""
-        for area in self.areas.values():
-            if name == area.name:
-                return area
-        return None
+        area_id = self.areas.get_first_key("name", name)
+        return None if area_id is None else self.areas[area_id]
 
     async def async_load(self) -> None:
         """Load the area registry."""
         data = await self._store.async_load()
 
-        areas = OrderedDict()  # type: OrderedDict[str, AreaEntry]
+        areas = AreaRegistryItems()
 
         if data is not None:
             for area in data["areas"]:
@@ -16,7 +16,6 @@ from urllib.parse import urlparse
 from uuid import UUID
 
 import voluptuous as vol
-from pkg_resources import parse_version
 
 import homeassistant.util.dt as dt_util
 from homeassistant.const import (
@@ -627,6 +626,9 @@ def deprecated(
         if not invalidation_version:
             return
 
+        # Importing pkg_resources is slow, only do it when needed
+        from pkg_resources import parse_version
+
         if parse_version(__version__) >= parse_version(invalidation_version):
             raise vol.Invalid(
                 warning.format(
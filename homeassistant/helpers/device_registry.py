@@ -2,14 +2,15 @@
 import logging
 import uuid
 from asyncio import Event
-from collections import OrderedDict
-from typing import List, Optional, cast
+from typing import Iterable, List, Optional, cast
 
 import attr
 
 from homeassistant.core import callback
 from homeassistant.loader import bind_hass
 
+from .registry import IndexKey, RegistryItems
+from .storage import JournalCollection
 from .typing import HomeAssistantType
 
 
@@ -69,6 +70,24 @@ def format_mac(mac):
     return mac
 
 
+class DeviceRegistryItems(RegistryItems[DeviceEntry]):
+    """Device registry entries indexed by identifiers, connections and more."""
+
+    def _index_keys(self, entry: DeviceEntry) -> Iterable[IndexKey]:
+        """Return the index keys of an entry."""
+        for identifier in entry.identifiers:
+            yield ("identifiers", identifier)
+
+        for connection in entry.connections:
+            yield ("connections", connection)
+
+        for config_entry_id in entry.config_entries:
+            yield ("config_entry_id", config_entry_id)
+
+        if entry.area_id is not None:
+            yield ("area_id", entry.area_id)
+
+
 class DeviceRegistry:
     """Class to hold a registry of devices."""
 
@@ -76,7 +95,14 @@ class DeviceRegistry:
         """Initialize the device registry."""
         self.hass = hass
         self.devices = None
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            journal=True,
+            journal_collections={
+                "devices": JournalCollection(["devices"], ["id"], self._device_data)
+            },
+        )
 
     @callback
     def async_get(self, device_id: str) -> Optional[DeviceEntry]:
@@ -88,11 +114,14 @@ class DeviceRegistry:
         self, identifiers: set, connections: set
     ) -> Optional[DeviceEntry]:
         """Check if device is registered."""
-        for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or any(
-                conn in device.connections for conn in connections
-            ):
-                return device
+        for name, values in (
+            ("identifiers", identifiers),
+            ("connections", connections),
+        ):
+            for value in values:
+                device_id = self.devices.get_first_key(name, value)
+                if device_id is not None:
+                    return self.devices[device_id]
         return None
 
     @callback
@@ -243,7 +272,7 @@ class DeviceRegistry:
             return old
 
         new = self.devices[device_id] = attr.evolve(old, **changes)
-        self.async_schedule_save()
+        self.async_schedule_save(device_id)
 
         self.hass.bus.async_fire(
             EVENT_DEVICE_REGISTRY_UPDATED,
@@ -261,13 +290,13 @@ class DeviceRegistry:
         self.hass.bus.async_fire(
             EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": device_id}
         )
-        self.async_schedule_save()
+        self.async_schedule_save(device_id)
 
     async def async_load(self):
         """Load the device registry."""
         data = await self._store.async_load()
 
-        devices = OrderedDict()
+        devices = DeviceRegistryItems()
 
         if data is not None:
             for device in data["devices"]:
@@ -293,44 +322,42 @@ class DeviceRegistry:
         self.devices = devices
 
     @callback
-    def async_schedule_save(self):
-        """Schedule saving the device registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    def async_schedule_save(self, *device_ids):
+        """Schedule saving the device registry.
+
+        If the ids of the changed devices are passed, only those are written.
+        """
+        self._store.async_delay_save(
+            self._data_to_save,
+            SAVE_DELAY,
+            changed={"devices": device_ids} if device_ids else None,
+        )
 
     @callback
     def _data_to_save(self):
         """Return data of device registry to store in a file."""
         data = {}
 
-        data["devices"] = [
-            {
-                "config_entries": list(entry.config_entries),
-                "connections": list(entry.connections),
-                "identifiers": list(entry.identifiers),
-                "manufacturer": entry.manufacturer,
-                "model": entry.model,
-                "name": entry.name,
-                "sw_version": entry.sw_version,
-                "id": entry.id,
-                "via_device_id": entry.via_device_id,
-                "area_id": entry.area_id,
-                "name_by_user": entry.name_by_user,
-            }
-            for entry in self.devices.values()
-        ]
+        data["devices"] = [_entry_data(entry) for entry in self.devices.values()]
 
         return data
 
+    @callback
+    def _device_data(self, device_id):
+        """Return data of a device to store, None if it was removed."""
+        entry = self.devices.get(device_id)
+        return None if entry is None else _entry_data(entry)
+
     @callback
     def async_clear_config_entry(self, config_entry_id):
         """Clear config entry from registry entries."""
         remove = []
-        for dev_id, device in self.devices.items():
+        for device in self.devices.get_entries("config_entry_id", config_entry_id):
             if device.config_entries == {config_entry_id}:
-                remove.append(dev_id)
+                remove.append(device.id)
             else:
                 self._async_update_device(
-                    dev_id, remove_config_entry_id=config_entry_id
+                    device.id, remove_config_entry_id=config_entry_id
                 )
         for dev_id in remove:
             self.async_remove_device(dev_id)
@@ -338,9 +365,25 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in self.devices.get_keys("area_id", area_id):
+            self._async_update_device(dev_id, area_id=None)
+
+
+def _entry_data(entry):
+    """Return data of an entry to store in a file."""
+    return {
+        "config_entries": list(entry.config_entries),
+        "connections": list(entry.connections),
+        "identifiers": list(entry.identifiers),
+        "manufacturer": entry.manufacturer,
+        "model": entry.model,
+        "name": entry.name,
+        "sw_version": entry.sw_version,
+        "id": entry.id,
+        "via_device_id": entry.via_device_id,
+        "area_id": entry.area_id,
+        "name_by_user": entry.name_by_user,
+    }
 
 
 @bind_hass
@@ -369,4 +412,4 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.devices.get_entries("area_id", area_id)
@@ -1,16 +1,85 @@
 """Helpers for Home Assistant dispatcher & internal component/platform."""
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Dict
 
-from homeassistant.core import callback
+from homeassistant.core import HassJob, HassJobType, callback
 from homeassistant.loader import bind_hass
 from homeassistant.util.async_ import run_callback_threadsafe
-from homeassistant.util.logging import catch_log_exception
 from .typing import HomeAssistantType
 
 
 _LOGGER = logging.getLogger(__name__)
 DATA_DISPATCHER = "dispatcher"
+DATA_DISPATCHER_STATS = "dispatcher_stats"
+
+
+class SignalStats:
+    """Counters of a signal."""
+
+    __slots__ = ["sent", "delivered", "errors"]
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.sent = 0
+        # Targets the signal was handed to, the fan-out is delivered / sent
+        self.delivered = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters."""
+        return {"sent": self.sent, "delivered": self.delivered, "errors": self.errors}
+
+
+def _log_exception(
+    stats: SignalStats, signal: str, target: Callable[..., Any], args: Any
+) -> None:
+    """Log the exception raised by a target."""
+    stats.errors += 1
+    logging.getLogger(getattr(target, "__module__", None) or __name__).exception(
+        "Exception in %s when dispatching '%s': %s",
+        getattr(target, "__name__", target),
+        signal,
+        args,
+    )
+
+
+@callback
+def _run_callback(
+    stats: SignalStats, signal: str, target: Callable[..., Any], *args: Any
+) -> None:
+    """Run a callback target."""
+    try:
+        target(*args)
+    except Exception:  # pylint: disable=broad-except
+        _log_exception(stats, signal, target, args)
+
+
+async def _run_coroutine_function(
+    stats: SignalStats, signal: str, target: Callable[..., Any], *args: Any
+) -> None:
+    """Run a coroutine function target."""
+    try:
+        await target(*args)
+    except Exception:  # pylint: disable=broad-except
+        _log_exception(stats, signal, target, args)
+
+
+def _run_executor(
+    stats: SignalStats, signal: str, target: Callable[..., Any], *args: Any
+) -> None:
+    """Run a target in the executor."""
+    try:
+        target(*args)
+    except Exception:  # pylint: disable=broad-except
+        _log_exception(stats, signal, target, args)
+
+
+# Shared by all targets, so connecting does not wrap each target
+_DISPATCH_JOBS = {
+    HassJobType.callback: HassJob(_run_callback),
+    HassJobType.coroutine_function: HassJob(_run_coroutine_function),
+    HassJobType.executor: HassJob(_run_executor),
+}
 
 
 @bind_hass
@@ -41,35 +110,27 @@ def async_dispatcher_connect(
     if DATA_DISPATCHER not in hass.data:
         hass.data[DATA_DISPATCHER] = {}
 
-    if signal not in hass.data[DATA_DISPATCHER]:
-        hass.data[DATA_DISPATCHER][signal] = []
-
-    wrapped_target = catch_log_exception(
-        target,
-        lambda *args: "Exception in {} when dispatching '{}': {}".format(
-            target.__name__, signal, args
-        ),
-    )
+    # Jobs by the function removing them, for removal in constant time
+    targets = hass.data[DATA_DISPATCHER].get(signal)
 
-    hass.data[DATA_DISPATCHER][signal].append(wrapped_target)
+    if targets is None:
+        targets = hass.data[DATA_DISPATCHER][signal] = {}
 
     @callback
     def async_remove_dispatcher() -> None:
         """Remove signal listener."""
-        try:
-            hass.data[DATA_DISPATCHER][signal].remove(wrapped_target)
-        except (KeyError, ValueError):
-            # KeyError is key target listener did not exist
-            # ValueError if listener did not exist within signal
+        if targets.pop(async_remove_dispatcher, None) is None:
             _LOGGER.warning("Unable to remove unknown dispatcher %s", target)
 
+    targets[async_remove_dispatcher] = HassJob(target)
+
     return async_remove_dispatcher
 
 
 @bind_hass
 def dispatcher_send(hass: HomeAssistantType, signal: str, *args: Any) -> None:
     """Send signal and data."""
-    hass.loop.call_soon_threadsafe(async_dispatcher_send, hass, signal, *args)
+    hass.thread_queue.call_soon(async_dispatcher_send, hass, signal, *args)
 
 
 @callback
@@ -79,7 +140,36 @@ def async_dispatcher_send(hass: HomeAssistantType, signal: str, *args: Any) -> N
 
     This method must be run in the event loop.
     """
-    target_list = hass.data.get(DATA_DISPATCHER, {}).get(signal, [])
+    targets = hass.data.get(DATA_DISPATCHER, {}).get(signal)
+
+    if not targets:
+        return
+
+    all_stats = hass.data.get(DATA_DISPATCHER_STATS)
+
+    if all_stats is None:
+        all_stats = hass.data[DATA_DISPATCHER_STATS] = {}
+
+    stats = all_stats.get(signal)
 
-    for target in target_list:
-        hass.async_add_job(target, *args)
+    if stats is None:
+        stats = all_stats[signal] = SignalStats()
+
+    stats.sent += 1
+    stats.delivered += len(targets)
+
+    # Jobs are only scheduled, targets can not change the dict while iterating
+    for job in targets.values():
+        hass.async_add_hass_job(
+            _DISPATCH_JOBS[job.job_type], stats, signal, job.target, *args
+        )
+
+
+@callback
+@bind_hass
+def async_dispatcher_stats(hass: HomeAssistantType) -> Dict[str, Dict[str, int]]:
+    """Return the counters of the signals sent so far."""
+    return {
+        signal: stats.as_dict()
+        for signal, stats in hass.data.get(DATA_DISPATCHER_STATS, {}).items()
+    }
@@ -72,14 +72,16 @@ def async_generate_entity_id(
     hass: Optional[HomeAssistant] = None,
 ) -> str:
     """Generate a unique entity ID based on given entity IDs or used IDs."""
+    name = (name or DEVICE_DEFAULT_NAME).lower()
+    preferred_string = entity_id_format.format(slugify(name))
+
     if current_ids is None:
         if hass is None:
             raise ValueError("Missing required parameter currentids or hass")
 
-        current_ids = hass.states.async_entity_ids()
-    name = (name or DEVICE_DEFAULT_NAME).lower()
+        return hass.states.async_unique_entity_id(preferred_string)
 
-    return ensure_unique_string(entity_id_format.format(slugify(name)), current_ids)
+    return ensure_unique_string(preferred_string, current_ids)
 
 
 class Entity:
@@ -406,6 +408,19 @@ class Entity:
         """
         self.hass.async_create_task(self.async_update_ha_state(force_refresh))
 
+    @callback
+    def _async_get_executor(self):
+        """Return the executor to update the entity in.
+
+        Integrations and entity domains can have their own executor.
+        """
+        if self.platform is None:
+            return self.hass.executor
+
+        return self.hass.async_get_executor(
+            self.platform.platform_name, self.platform.domain
+        )
+
     async def async_device_update(self, warning=True):
         """Process 'update' or 'async_update' from entity.
 
@@ -433,7 +448,9 @@ class Entity:
             if hasattr(self, "async_update"):
                 await self.async_update()
             elif hasattr(self, "update"):
-                await self.hass.async_add_executor_job(self.update)
+                await self.hass.async_add_executor_job(
+                    self.update, executor=self._async_get_executor()
+                )
         finally:
             self._update_staged = False
             if warning:
@@ -73,6 +73,8 @@ class EntityComponent:
 
         self.config = None
 
+        # Config key -> (config, entity) of the entities created from config
+        self._config_entities = {}
         self._platforms = {domain: self._async_init_entity_platform(domain, None)}
         self.async_add_entities = self._platforms[domain].async_add_entities
         self.add_entities = self._platforms[domain].add_entities
@@ -281,6 +283,7 @@ class EntityComponent:
             await asyncio.wait(tasks)
 
         self._platforms = {self.domain: self._platforms[self.domain]}
+        self._config_entities = {}
         self.config = None
 
         if self.group_name is not None:
@@ -294,9 +297,58 @@ class EntityComponent:
             if entity_id in platform.entities:
                 await platform.async_remove_entity(entity_id)
 
-    async def async_prepare_reload(self):
+    async def async_update_config_entities(
+        self, configs, create_entity, update_before_add=False
+    ):
+        """Add, replace and remove the entities created from config.
+
+        configs maps a key that identifies each entity to its config. Entities
+        of which the config is unchanged are kept as they are, without being
+        recreated. Entities of which the config changed or was removed are
+        removed. create_entity(key, config) is called for every new or changed
+        config and returns the entity to add, or None to skip it.
+
+        This method must be run in the event loop.
+        """
+        removed = False
+
+        for key, (config, entity) in list(self._config_entities.items()):
+            if (
+                key in configs
+                and configs[key] == config
+                and self.get_entity(entity.entity_id) is entity
+            ):
+                continue
+
+            del self._config_entities[key]
+            await self.async_remove_entity(entity.entity_id)
+            removed = True
+
+        entities = []
+
+        for key, config in configs.items():
+            if key in self._config_entities:
+                continue
+
+            entity = create_entity(key, config)
+
+            if entity is None:
+                continue
+
+            self._config_entities[key] = (config, entity)
+            entities.append(entity)
+
+        if entities:
+            await self.async_add_entities(entities, update_before_add)
+        elif removed:
+            self._async_update_group()
+
+    async def async_prepare_reload(self, *, skip_reset=False):
         """Prepare reloading this entity component.
 
+        Pass skip_reset to keep the current entities, for example to update
+        them with async_update_config_entities.
+
         This method must be run in the event loop.
         """
         try:
@@ -314,7 +366,8 @@ class EntityComponent:
         if conf is None:
             return None
 
-        await self._async_reset()
+        if not skip_reset:
+            await self._async_reset()
         return conf
 
     def _async_init_entity_platform(
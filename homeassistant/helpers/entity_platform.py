@@ -100,7 +100,7 @@ class EntityPlatform:
             # This should not be replaced with hass.async_add_job because
             # we don't want to track this task in case it blocks startup.
             return hass.loop.run_in_executor(
-                None,
+                hass.async_get_executor(self.platform_name, self.domain),
                 platform.setup_platform,
                 hass,
                 platform_config,
@@ -387,9 +387,9 @@ class EntityPlatform:
         # Make sure it is valid in case an entity set the value themselves
         if not valid_entity_id(entity.entity_id):
             raise HomeAssistantError(f"Invalid entity id: {entity.entity_id}")
-        if (
-            entity.entity_id in self.entities
-            or entity.entity_id in self.hass.states.async_entity_ids(self.domain)
+        if entity.entity_id in self.entities or (
+            split_entity_id(entity.entity_id)[0] == self.domain
+            and self.hass.states.get(entity.entity_id) is not None
         ):
             msg = f"Entity id already exists: {entity.entity_id}"
             if entity.unique_id is not None:
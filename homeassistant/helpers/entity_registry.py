@@ -8,19 +8,19 @@ registered. Registering a new entity while a timer is in progress resets the
 timer.
 """
 from asyncio import Event
-from collections import OrderedDict
-from itertools import chain
 import logging
-from typing import List, Optional, cast
+from typing import Iterable, List, Optional, cast
 
 import attr
 
 from homeassistant.core import callback, split_entity_id, valid_entity_id
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.loader import bind_hass
-from homeassistant.util import ensure_unique_string, slugify
+from homeassistant.util import slugify
 from homeassistant.util.yaml import load_yaml
 
+from .registry import IndexKey, RegistryItems
+from .storage import JournalCollection
 from .typing import HomeAssistantType
 
 
@@ -78,6 +78,20 @@ class RegistryEntry:
         return self.disabled_by is not None
 
 
+class EntityRegistryItems(RegistryItems[RegistryEntry]):
+    """Entity registry entries indexed by unique id, device and config entry."""
+
+    def _index_keys(self, entry: RegistryEntry) -> Iterable[IndexKey]:
+        """Return the index keys of an entry."""
+        yield ("unique_id", (entry.domain, entry.platform, entry.unique_id))
+
+        if entry.device_id is not None:
+            yield ("device_id", entry.device_id)
+
+        if entry.config_entry_id is not None:
+            yield ("config_entry_id", entry.config_entry_id)
+
+
 class EntityRegistry:
     """Class to hold a registry of entities."""
 
@@ -85,7 +99,16 @@ class EntityRegistry:
         """Initialize the registry."""
         self.hass = hass
         self.entities = None
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            journal=True,
+            journal_collections={
+                "entities": JournalCollection(
+                    ["entities"], ["entity_id"], self._entity_data
+                )
+            },
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
         )
@@ -105,14 +128,7 @@ class EntityRegistry:
         self, domain: str, platform: str, unique_id: str
     ) -> Optional[str]:
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if (
-                entity.domain == domain
-                and entity.platform == platform
-                and entity.unique_id == unique_id
-            ):
-                return entity.entity_id
-        return None
+        return self.entities.get_first_key("unique_id", (domain, platform, unique_id))
 
     @callback
     def async_generate_entity_id(
@@ -122,13 +138,10 @@ class EntityRegistry:
 
         Conflicts checked against registered and currently existing entities.
         """
-        return ensure_unique_string(
+        return self.hass.states.async_unique_entity_id(
             "{}.{}".format(domain, slugify(suggested_object_id)),
-            chain(
-                self.entities.keys(),
-                self.hass.states.async_entity_ids(domain),
-                known_object_ids if known_object_ids else [],
-            ),
+            self.entities,
+            known_object_ids if known_object_ids is not None else (),
         )
 
     @callback
@@ -186,7 +199,7 @@ class EntityRegistry:
         )
         self.entities[entity_id] = entity
         _LOGGER.info("Registered new %s.%s entity: %s", domain, platform, entity_id)
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "create", "entity_id": entity_id}
@@ -201,7 +214,7 @@ class EntityRegistry:
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "remove", "entity_id": entity_id}
         )
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
     @callback
     def async_device_removed(self, event):
@@ -275,20 +288,13 @@ class EntityRegistry:
             entity_id = changes["entity_id"] = new_entity_id
 
         if new_unique_id is not _UNDEF:
-            conflict = next(
-                (
-                    entity
-                    for entity in self.entities.values()
-                    if entity.unique_id == new_unique_id
-                    and entity.domain == old.domain
-                    and entity.platform == old.platform
-                ),
-                None,
+            conflict_entity_id = self.async_get_entity_id(
+                old.domain, old.platform, new_unique_id
             )
-            if conflict:
+            if conflict_entity_id:
                 raise ValueError(
                     "Unique id '{}' is already in use by '{}'".format(
-                        new_unique_id, conflict.entity_id
+                        new_unique_id, conflict_entity_id
                     )
                 )
             changes["unique_id"] = new_unique_id
@@ -298,7 +304,7 @@ class EntityRegistry:
 
         new = self.entities[entity_id] = attr.evolve(old, **changes)
 
-        self.async_schedule_save()
+        self.async_schedule_save(old.entity_id, entity_id)
 
         data = {"action": "update", "entity_id": entity_id, "changes": list(changes)}
 
@@ -317,7 +323,7 @@ class EntityRegistry:
             old_conf_load_func=load_yaml,
             old_conf_migrate_func=_async_migrate,
         )
-        entities = OrderedDict()
+        entities = EntityRegistryItems()
 
         if data is not None:
             for entity in data["entities"]:
@@ -334,41 +340,52 @@ class EntityRegistry:
         self.entities = entities
 
     @callback
-    def async_schedule_save(self):
-        """Schedule saving the entity registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    def async_schedule_save(self, *entity_ids):
+        """Schedule saving the entity registry.
+
+        If the ids of the changed entities are passed, only those are written.
+        """
+        self._store.async_delay_save(
+            self._data_to_save,
+            SAVE_DELAY,
+            changed={"entities": entity_ids} if entity_ids else None,
+        )
 
     @callback
     def _data_to_save(self):
         """Return data of entity registry to store in a file."""
         data = {}
 
-        data["entities"] = [
-            {
-                "entity_id": entry.entity_id,
-                "config_entry_id": entry.config_entry_id,
-                "device_id": entry.device_id,
-                "unique_id": entry.unique_id,
-                "platform": entry.platform,
-                "name": entry.name,
-                "disabled_by": entry.disabled_by,
-            }
-            for entry in self.entities.values()
-        ]
+        data["entities"] = [_entry_data(entry) for entry in self.entities.values()]
 
         return data
 
+    @callback
+    def _entity_data(self, entity_id):
+        """Return data of an entity to store, None if it was removed."""
+        entry = self.entities.get(entity_id)
+        return None if entry is None else _entry_data(entry)
+
     @callback
     def async_clear_config_entry(self, config_entry):
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in self.entities.get_keys("config_entry_id", config_entry):
             self.async_remove(entity_id)
 
 
+def _entry_data(entry):
+    """Return data of an entry to store in a file."""
+    return {
+        "entity_id": entry.entity_id,
+        "config_entry_id": entry.config_entry_id,
+        "device_id": entry.device_id,
+        "unique_id": entry.unique_id,
+        "platform": entry.platform,
+        "name": entry.name,
+        "disabled_by": entry.disabled_by,
+    }
+
+
 @bind_hass
 async def async_get_registry(hass: HomeAssistantType) -> EntityRegistry:
     """Return entity registry instance."""
@@ -397,9 +414,15 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    return registry.entities.get_entries("device_id", device_id)
+
+
+@callback
+def async_entries_for_config_entry(
+    registry: EntityRegistry, config_entry_id: str
+) -> List[RegistryEntry]:
+    """Return entries that match a config entry."""
+    return registry.entities.get_entries("config_entry_id", config_entry_id)
 
 
 async def _async_migrate(entities):
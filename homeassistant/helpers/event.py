@@ -7,7 +7,7 @@ import attr
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.core import HomeAssistant, callback, CALLBACK_TYPE
+from homeassistant.core import HassJob, HomeAssistant, callback, CALLBACK_TYPE
 from homeassistant.const import (
     ATTR_NOW,
     EVENT_STATE_CHANGED,
@@ -74,6 +74,8 @@ def async_track_state_change(hass, entity_ids, action, from_state=None, to_state
     else:
         entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
 
+    job = HassJob(action)
+
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
@@ -89,8 +91,8 @@ def async_track_state_change(hass, entity_ids, action, from_state=None, to_state
             new_state = new_state.state
 
         if match_from_state(old_state) and match_to_state(new_state):
-            hass.async_run_job(
-                action,
+            hass.async_run_hass_job(
+                job,
                 event.data.get("entity_id"),
                 event.data.get("old_state"),
                 event.data.get("new_state"),
@@ -110,6 +112,7 @@ def async_track_template(hass, template, action, variables=None):
 
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
+    job = HassJob(action)
 
     @callback
     def template_condition_listener(entity_id, from_s, to_s):
@@ -120,7 +123,7 @@ def async_track_template(hass, template, action, variables=None):
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            hass.async_run_hass_job(job, entity_id, from_s, to_s)
         elif not template_result:
             already_triggered = False
 
@@ -144,6 +147,7 @@ def async_track_same_state(
     """
     async_remove_state_for_cancel = None
     async_remove_state_for_listener = None
+    job = HassJob(action)
 
     @callback
     def clear_listener():
@@ -163,7 +167,7 @@ def async_track_same_state(
         nonlocal async_remove_state_for_listener
         async_remove_state_for_listener = None
         clear_listener()
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     @callback
     def state_for_cancel_listener(entity, from_state, to_state):
@@ -190,11 +194,12 @@ track_same_state = threaded_listener_factory(async_track_same_state)
 def async_track_point_in_time(hass, action, point_in_time) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in time."""
     utc_point_in_time = dt_util.as_utc(point_in_time)
+    job = HassJob(action)
 
     @callback
     def utc_converter(utc_now):
         """Convert passed in UTC now to local now."""
-        hass.async_run_job(action, dt_util.as_local(utc_now))
+        hass.async_run_hass_job(job, dt_util.as_local(utc_now))
 
     return async_track_point_in_utc_time(hass, utc_converter, utc_point_in_time)
 
@@ -208,6 +213,7 @@ def async_track_point_in_utc_time(hass, action, point_in_time) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in UTC time."""
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
+    job = HassJob(action)
 
     @callback
     def point_in_time_listener(event):
@@ -225,7 +231,7 @@ def async_track_point_in_utc_time(hass, action, point_in_time) -> CALLBACK_TYPE:
         point_in_time_listener.run = True
         async_unsub()
 
-        hass.async_run_job(action, now)
+        hass.async_run_hass_job(job, now)
 
     async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
 
@@ -252,6 +258,7 @@ call_later = threaded_listener_factory(async_call_later)
 def async_track_time_interval(hass, action, interval):
     """Add a listener that fires repetitively at every timedelta interval."""
     remove = None
+    job = HassJob(action)
 
     def next_interval():
         """Return the next interval."""
@@ -262,7 +269,7 @@ def async_track_time_interval(hass, action, interval):
         """Handle elapsed intervals."""
         nonlocal remove
         remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
-        hass.async_run_job(action, now)
+        hass.async_run_hass_job(job, now)
 
     remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
 
@@ -286,6 +293,11 @@ class SunListener:
     offset = attr.ib(type=timedelta)
     _unsub_sun = attr.ib(default=None)
     _unsub_config = attr.ib(default=None)
+    _job = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        """Classify the action once."""
+        self._job = HassJob(self.action)
 
     @callback
     def async_attach(self):
@@ -325,7 +337,7 @@ class SunListener:
         """Handle solar event."""
         self._unsub_sun = None
         self._listen_next_sun_event()
-        self.hass.async_run_job(self.action)
+        self.hass.async_run_hass_job(self._job)
 
     @callback
     def _handle_config_event(self, _event):
@@ -366,6 +378,8 @@ def async_track_utc_time_change(
     hass, action, hour=None, minute=None, second=None, local=False
 ):
     """Add a listener that will fire if time matches a pattern."""
+    job = HassJob(action)
+
     # We do not have to wrap the function with time pattern matching logic
     # if no pattern given
     if all(val is None for val in (hour, minute, second)):
@@ -373,7 +387,7 @@ def async_track_utc_time_change(
         @callback
         def time_change_listener(event):
             """Fire every time event that comes in."""
-            hass.async_run_job(action, event.data[ATTR_NOW])
+            hass.async_run_hass_job(job, event.data[ATTR_NOW])
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
@@ -410,7 +424,7 @@ def async_track_utc_time_change(
         last_now = now
 
         if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
+            hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
             calculate_next(now + timedelta(seconds=1))
 
     # We can't use async_track_point_in_utc_time here because it would
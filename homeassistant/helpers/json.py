@@ -1,26 +1,18 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
-from datetime import datetime
-import json
 import logging
-from typing import Any
 
-_LOGGER = logging.getLogger(__name__)
-
-
-class JSONEncoder(json.JSONEncoder):
-    """JSONEncoder that supports Home Assistant objects."""
+from homeassistant.core import Context, Event, State
+from homeassistant.util.json import (  # noqa: F401 pylint: disable=unused-import
+    JSONEncoder,
+    json_bytes,
+    json_dumps,
+    json_encoder_default,
+    json_loads,
+    register_json_converter,
+)
 
-    # pylint: disable=method-hidden
-    def default(self, o: Any) -> Any:
-        """Convert Home Assistant objects.
-
-        Hand other objects to the original method.
-        """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
+_LOGGER = logging.getLogger(__name__)
 
-        return json.JSONEncoder.default(self, o)
+register_json_converter(State, State.as_dict)
+register_json_converter(Event, Event.as_dict)
+register_json_converter(Context, Context.as_dict)
@@ -0,0 +1,138 @@
+"""Provide a mapping of registry entries with secondary indexes."""
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    ValuesView,
+)
+
+_T = TypeVar("_T")
+
+IndexKey = Tuple[str, Hashable]
+
+
+class RegistryItems(MutableMapping[str, _T]):
+    """Registry entries keyed by their id.
+
+    Subclasses yield the (index name, value) pairs an entry is found under from
+    `_index_keys`. The indexes are updated on every assignment and deletion, so
+    lookups by those values don't need to scan all entries.
+    """
+
+    def __init__(self, entries: Optional[Mapping[str, _T]] = None) -> None:
+        """Initialize the container."""
+        self.data = {}  # type: Dict[str, _T]
+        # (index name, value) -> ids of the entries, in insertion order
+        self._index = {}  # type: Dict[IndexKey, Dict[str, None]]
+
+        if entries:
+            self.update(entries)
+
+    def _index_keys(self, entry: _T) -> Iterable[IndexKey]:
+        """Return the index keys of an entry."""
+        raise NotImplementedError
+
+    def __getitem__(self, key: str) -> _T:
+        """Return an entry."""
+        return self.data[key]
+
+    def __setitem__(self, key: str, entry: _T) -> None:
+        """Add or replace an entry and update the indexes."""
+        old = self.data.get(key)
+        old_keys = set() if old is None else set(self._index_keys(old))
+        new_keys = set(self._index_keys(entry))
+
+        for index_key in old_keys - new_keys:
+            self._unindex(index_key, key)
+
+        for index_key in new_keys - old_keys:
+            self._index.setdefault(index_key, {})[key] = None
+
+        self.data[key] = entry
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry and update the indexes."""
+        entry = self.data.pop(key)
+
+        for index_key in set(self._index_keys(entry)):
+            self._unindex(index_key, key)
+
+    def __contains__(self, key: object) -> bool:
+        """Return if an entry with this id exists."""
+        return key in self.data
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the entry ids."""
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return "<{} {!r}>".format(self.__class__.__name__, self.data)
+
+    def get(  # type: ignore
+        self, key: str, default: Optional[_T] = None
+    ) -> Optional[_T]:
+        """Return an entry, default if it does not exist."""
+        return self.data.get(key, default)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove and return an entry, default if given and it does not exist."""
+        if key not in self.data:
+            if default:
+                return default[0]
+            raise KeyError(key)
+
+        entry = self.data[key]
+        del self[key]
+        return entry
+
+    def update(self, entries: Mapping[str, _T]) -> None:  # type: ignore
+        """Add or replace entries, updating the indexes."""
+        for key, entry in entries.items():
+            self[key] = entry
+
+    def keys(self) -> KeysView[str]:
+        """Return the entry ids."""
+        return self.data.keys()
+
+    def values(self) -> ValuesView[_T]:
+        """Return the entries."""
+        return self.data.values()
+
+    def items(self) -> ItemsView[str, _T]:
+        """Return the entry ids and entries."""
+        return self.data.items()
+
+    def _unindex(self, index_key: IndexKey, key: str) -> None:
+        """Remove an entry id from an index."""
+        keys = self._index[index_key]
+        del keys[key]
+
+        if not keys:
+            del self._index[index_key]
+
+    def get_keys(self, name: str, value: Hashable) -> List[str]:
+        """Return the ids of the entries indexed under name and value."""
+        return list(self._index.get((name, value), ()))
+
+    def get_first_key(self, name: str, value: Hashable) -> Optional[str]:
+        """Return the id of the first entry indexed under name and value."""
+        return next(iter(self._index.get((name, value), ())), None)
+
+    def get_entries(self, name: str, value: Hashable) -> List[_T]:
+        """Return the entries indexed under name and value."""
+        return [self.data[key] for key in self._index.get((name, value), ())]
@@ -2,7 +2,15 @@
 import asyncio
 import logging
 from datetime import timedelta, datetime
-from typing import Any, Dict, List, Set, Optional  # noqa  pylint_disable=unused-import
+from typing import (  # noqa  pylint_disable=unused-import
+    Any,
+    Dict,
+    List,
+    Set,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from homeassistant.core import (
     HomeAssistant,
@@ -16,8 +24,11 @@ import homeassistant.util.dt as dt_util
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.json import JSONEncoder
-from homeassistant.helpers.storage import Store  # noqa  pylint_disable=unused-import
+from homeassistant.helpers.json import JSONEncoder, json_bytes, json_loads
+from homeassistant.helpers.storage import (  # noqa  pylint_disable=unused-import
+    JournalCollection,
+    Store,
+)
 
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -36,6 +47,9 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How often the last seen time of an unchanged entity is refreshed on disk
+LAST_SEEN_REFRESH_INTERVAL = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -60,6 +74,10 @@ class StoredState:
         return cls(State.from_dict(json_dict["state"]), last_seen)
 
 
+# Source state, last seen and JSON representation of a dumped state
+_DumpedState = Tuple[Union[State, StoredState], datetime, Dict]
+
+
 class RestoreStateData:
     """Helper class for managing the helper saved data."""
 
@@ -110,10 +128,24 @@ class RestoreStateData:
         """Initialize the restore state data class."""
         self.hass = hass  # type: HomeAssistant
         self.store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            encoder=JSONEncoder,
+            journal=True,
+            journal_collections={
+                "states": JournalCollection(
+                    [], ["state", "entity_id"], self._dumped_data
+                )
+            },
         )  # type: Store
         self.last_states = {}  # type: Dict[str, StoredState]
         self.entity_ids = set()  # type: Set[str]
+        # Serialized states of the last dump, keyed by entity id and in the
+        # order they were written. The state or stored state they were
+        # created from is kept to detect which entities changed.
+        self._dumped = {}  # type: Dict[str, _DumpedState]
+        self._dump_lock = asyncio.Lock()
 
     def async_get_stored_states(self) -> List[StoredState]:
         """Get the set of states which should be stored.
@@ -149,17 +181,96 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        """Save the current state machine to storage.
+
+        Only states that changed since the previous dump are serialized, in
+        the executor. The last seen time of unchanged entities is refreshed
+        every LAST_SEEN_REFRESH_INTERVAL.
+        """
         _LOGGER.debug("Dumping states")
-        try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
-            )
-        except HomeAssistantError as exc:
-            _LOGGER.error("Error saving current states", exc_info=exc)
+        async with self._dump_lock:
+            now = dt_util.utcnow()
+            refresh_before = now - LAST_SEEN_REFRESH_INTERVAL
+            expiration_time = now - STATE_EXPIRATION
+            selected = []  # type: List[str]
+            changed = []  # type: List[Tuple[Union[State, StoredState], StoredState]]
+            all_states = self.hass.states.async_all()
+            current_entity_ids = set()  # type: Set[str]
+
+            for state in all_states:
+                entity_id = state.entity_id
+                current_entity_ids.add(entity_id)
+                if entity_id not in self.entity_ids:
+                    continue
+                selected.append(entity_id)
+                dumped = self._dumped.get(entity_id)
+                if (
+                    dumped is None
+                    or dumped[0] is not state
+                    or dumped[1] < refresh_before
+                ):
+                    changed.append((state, StoredState(state, now)))
+
+            for entity_id, stored_state in self.last_states.items():
+                # Don't save old states that have entities in the current run
+                # or that have expired
+                if (
+                    entity_id in current_entity_ids
+                    or stored_state.last_seen < expiration_time
+                ):
+                    continue
+                selected.append(entity_id)
+                dumped = self._dumped.get(entity_id)
+                if dumped is None or dumped[0] is not stored_state:
+                    changed.append((stored_state, stored_state))
+
+            updates = {}  # type: Dict[str, _DumpedState]
+            if changed:
+                encoded = await self.hass.async_add_executor_job(
+                    _encode_stored_states, [item[1] for item in changed]
+                )
+                updates = {
+                    stored_state.state.entity_id: (source, stored_state.last_seen, data)
+                    for (source, stored_state), data in zip(changed, encoded)
+                }
+
+            selected_ids = set(selected)
+            # The stored states of the previous run are only known by a diff
+            changed_keys = None  # type: Optional[Dict[str, List[str]]]
+            if self._dumped:
+                changed_keys = {
+                    "states": list(updates)
+                    + [
+                        entity_id
+                        for entity_id in self._dumped
+                        if entity_id not in selected_ids
+                    ]
+                }
+
+            # Keep the previous order so the stored list changes as little
+            # as possible between dumps.
+            dumped_states = {
+                entity_id: updates.get(entity_id, dumped)
+                for entity_id, dumped in self._dumped.items()
+                if entity_id in selected_ids
+            }
+            for entity_id in selected:
+                if entity_id not in dumped_states:
+                    dumped_states[entity_id] = updates[entity_id]
+            self._dumped = dumped_states
+
+            try:
+                await self.store.async_save(
+                    [dumped[2] for dumped in dumped_states.values()],
+                    changed=changed_keys,
+                )
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving current states", exc_info=exc)
+
+    def _dumped_data(self, entity_id: str) -> Optional[Dict]:
+        """Return the serialized state of an entity, None if it was removed."""
+        dumped = self._dumped.get(entity_id)
+        return None if dumped is None else dumped[2]
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -204,6 +315,13 @@ class RestoreStateData:
         self.entity_ids.remove(entity_id)
 
 
+def _encode_stored_states(stored_states: List[StoredState]) -> List[Dict]:
+    """Serialize stored states to their JSON representation."""
+    return [
+        json_loads(json_bytes(stored_state.as_dict())) for stored_state in stored_states
+    ]
+
+
 def _encode(value):
     """Little helper to JSON encode a value."""
     try:
@@ -0,0 +1,409 @@
+"""Pipeline that hands state changes to the integrations exporting them."""
+import asyncio
+from collections import deque
+from datetime import datetime
+import logging
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional
+
+import attr
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.loader import bind_hass
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .state import state_as_number
+from .typing import HomeAssistantType
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_EXPORTER = "state_exporter"
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_QUEUE = 10000
+
+ExportHandler = Callable[[List["StateRecord"]], Any]
+
+
+@attr.s(slots=True, frozen=True)
+class StateRecord:
+    """A state change, normalized once for all exporters.
+
+    Exporters that subscribe to removals also get records of removed
+    entities, with removed set and without a new state.
+    """
+
+    entity_id = attr.ib(type=str)
+    domain = attr.ib(type=str)
+    object_id = attr.ib(type=str)
+    state = attr.ib(type=str)
+    # The state as a number, see state_as_number, or None
+    value = attr.ib(type=Optional[float])
+    # If the state itself is a number, rather than mapped to one
+    state_is_number = attr.ib(type=bool)
+    unit = attr.ib(type=Optional[str])
+    attributes = attr.ib(type=Mapping[str, Any])
+    # Attributes with int, float or bool values
+    numeric_attributes = attr.ib(type=Dict[str, Any])
+    time_fired = attr.ib(type=datetime)
+    new_state = attr.ib(type=Optional[State])
+    removed = attr.ib(type=bool, default=False)
+
+    @classmethod
+    def from_state(cls, state: State, time_fired: datetime) -> "StateRecord":
+        """Return the record of a new state."""
+        try:
+            value = state_as_number(state)  # type: Optional[float]
+        except ValueError:
+            value = None
+
+        attributes = state.attributes
+
+        return cls(
+            entity_id=state.entity_id,
+            domain=state.domain,
+            object_id=state.object_id,
+            state=state.state,
+            value=value,
+            # The states mapped to a number are mapped to an int
+            state_is_number=isinstance(value, float),
+            unit=attributes.get("unit_of_measurement"),
+            attributes=attributes,
+            numeric_attributes={
+                key: attr_value
+                for key, attr_value in attributes.items()
+                if isinstance(attr_value, (float, int))
+            },
+            time_fired=time_fired,
+            new_state=state,
+        )
+
+    @classmethod
+    def from_removal(cls, entity_id: str, time_fired: datetime) -> "StateRecord":
+        """Return the record of a removed entity."""
+        domain, object_id = split_entity_id(entity_id)
+
+        return cls(
+            entity_id=entity_id,
+            domain=domain,
+            object_id=object_id,
+            state="",
+            value=None,
+            state_is_number=False,
+            unit=None,
+            attributes={},
+            numeric_attributes={},
+            time_fired=time_fired,
+            new_state=None,
+            removed=True,
+        )
+
+    @classmethod
+    def from_event(cls, event: Event) -> Optional["StateRecord"]:
+        """Return the record of a state changed event, None for removals."""
+        state = event.data.get("new_state")
+
+        if state is None:
+            return None
+
+        return cls.from_state(state, event.time_fired)
+
+
+class ExportSubscription:
+    """Records waiting for an exporter, and the batches handed to it.
+
+    The handler gets a list of at most batch_size records. A partial batch
+    waits batch_timeout seconds for more records, or is handed over right
+    away with a timeout of 0. Only one batch per exporter is handled at a
+    time, records pile up while the exporter is busy. Beyond max_queue
+    records the oldest are dropped, so a slow exporter can not take all the
+    memory. The counters of the exporter itself, returned by stats, are
+    added to those of the subscription.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistantType,
+        name: str,
+        handler: ExportHandler,
+        entity_filter: Optional[Callable[[str], bool]],
+        batch_size: int,
+        batch_timeout: float,
+        max_queue: int,
+        stats: Optional[Callable[[], Dict[str, Any]]] = None,
+        removals: bool = False,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self.name = name
+        self.removals = removals
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.max_queue = max_queue
+        self._job = HassJob(handler)
+        self._stats = stats
+        self._filter = entity_filter
+        # Filters only look at the entity id, so their result is kept
+        self._accepted = {}  # type: Dict[str, bool]
+        self._queue = deque()  # type: Deque[StateRecord]
+        self._timer = None  # type: Optional[asyncio.TimerHandle]
+        self._pending = None  # type: Optional[asyncio.Future]
+        self.exported = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+
+    def accepts(self, entity_id: str) -> bool:
+        """Return if records of an entity are exported."""
+        if self._filter is None:
+            return True
+
+        accepted = self._accepted.get(entity_id)
+
+        if accepted is None:
+            accepted = self._accepted[entity_id] = self._filter(entity_id)
+
+        return accepted
+
+    @callback
+    def async_put(self, record: StateRecord) -> None:
+        """Queue a record for the exporter."""
+        if len(self._queue) >= self.max_queue:
+            if not self.dropped:
+                _LOGGER.warning(
+                    "Exporter %s can not keep up, dropping the oldest states", self.name
+                )
+            self._queue.popleft()
+            self.dropped += 1
+
+        self._queue.append(record)
+        self._async_schedule()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Hand over a batch, or wait for more records."""
+        if self._pending is not None or not self._queue:
+            return
+
+        if len(self._queue) >= self.batch_size or not self.batch_timeout:
+            self.async_flush()
+        elif self._timer is None:
+            self._timer = self.hass.loop.call_later(
+                self.batch_timeout, self.async_flush
+            )
+
+    @callback
+    def async_flush(self) -> None:
+        """Hand the queued records over to the exporter."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending is None and self._queue:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.batch_size, len(self._queue)))
+            ]
+            self.batches += 1
+            self.exported += len(batch)
+
+            try:
+                self._pending = self.hass.async_run_hass_job(self._job, batch)
+            except Exception:  # pylint: disable=broad-except
+                self.errors += 1
+                _LOGGER.exception("Error exporting states to %s", self.name)
+
+            if self._pending is not None:
+                self._pending.add_done_callback(self._async_batch_done)
+
+    @callback
+    def _async_batch_done(self, future: asyncio.Future) -> None:
+        """Log the error of a batch and hand over the next one."""
+        self._pending = None
+
+        if not future.cancelled() and future.exception() is not None:
+            self.errors += 1
+            _LOGGER.error(
+                "Error exporting states to %s", self.name, exc_info=future.exception()
+            )
+
+        self._async_schedule()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop waiting for more records."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters of the subscription."""
+        stats = {
+            "name": self.name,
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+        if self._stats is not None:
+            stats["exporter"] = self._stats()
+
+        return stats
+
+
+class StateExporter:
+    """Turn each state change into a record once and queue it for exporters."""
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the exporter."""
+        self.hass = hass
+        self.subscriptions = []  # type: List[ExportSubscription]
+        self._unsub_state_changed = None  # type: Optional[CALLBACK_TYPE]
+
+    @callback
+    def async_subscribe(self, subscription: ExportSubscription) -> CALLBACK_TYPE:
+        """Queue records for a subscription."""
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+
+        self.subscriptions.append(subscription)
+
+        @callback
+        def async_unsubscribe() -> None:
+            """Stop queueing records for the subscription."""
+            subscription.async_cancel()
+            self.subscriptions.remove(subscription)
+
+            if not self.subscriptions and self._unsub_state_changed is not None:
+                self._unsub_state_changed()
+                self._unsub_state_changed = None
+
+        return async_unsubscribe
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue the record of a state change for the exporters of it."""
+        new_state = event.data.get("new_state")
+        record = None
+
+        if new_state is None:
+            entity_id = event.data["entity_id"]
+
+            for subscription in self.subscriptions:
+                if not subscription.removals or not subscription.accepts(entity_id):
+                    continue
+
+                if record is None:
+                    record = StateRecord.from_removal(entity_id, event.time_fired)
+
+                subscription.async_put(record)
+
+            return
+
+        for subscription in self.subscriptions:
+            if not subscription.accepts(new_state.entity_id):
+                continue
+
+            if record is None:
+                record = StateRecord.from_state(new_state, event.time_fired)
+
+            subscription.async_put(record)
+
+    @callback
+    def async_flush(self, _event: Optional[Event] = None) -> None:
+        """Hand all queued records over to the exporters."""
+        for subscription in self.subscriptions:
+            subscription.async_flush()
+
+
+@callback
+def _async_get_exporter(hass: HomeAssistantType) -> StateExporter:
+    """Return the state exporter, set it up on first use."""
+    exporter = hass.data.get(DATA_STATE_EXPORTER)
+
+    if exporter is None:
+        exporter = hass.data[DATA_STATE_EXPORTER] = StateExporter(hass)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, exporter.async_flush)
+
+    return exporter
+
+
+@bind_hass
+def subscribe(
+    hass: HomeAssistantType,
+    name: str,
+    handler: ExportHandler,
+    entity_filter: Optional[Callable[[str], bool]] = None,
+    **kwargs: Any,
+) -> CALLBACK_TYPE:
+    """Hand batches of state records to an exporter."""
+    async_unsub = run_callback_threadsafe(
+        hass.loop, lambda: async_subscribe(hass, name, handler, entity_filter, **kwargs)
+    ).result()
+
+    def unsubscribe() -> None:
+        """Stop handing records to the exporter."""
+        run_callback_threadsafe(hass.loop, async_unsub).result()
+
+    return unsubscribe
+
+
+@callback
+@bind_hass
+def async_subscribe(
+    hass: HomeAssistantType,
+    name: str,
+    handler: ExportHandler,
+    entity_filter: Optional[Callable[[str], bool]] = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batch_timeout: float = 0,
+    max_queue: int = DEFAULT_MAX_QUEUE,
+    stats: Optional[Callable[[], Dict[str, Any]]] = None,
+    removals: bool = False,
+) -> CALLBACK_TYPE:
+    """Hand batches of state records to an exporter.
+
+    The handler is called with lists of StateRecord, for the entities that
+    pass entity_filter. With removals, records of removed entities are
+    handed over too. stats can return the counters of the exporter, to be
+    served with those of the subscription. Return a function that
+    unsubscribes.
+
+    This method must be run in the event loop.
+    """
+    subscription = ExportSubscription(
+        hass,
+        name,
+        handler,
+        entity_filter,
+        batch_size,
+        batch_timeout,
+        max(max_queue, batch_size),
+        stats,
+        removals,
+    )
+    return _async_get_exporter(hass).async_subscribe(subscription)
+
+
+@callback
+@bind_hass
+def async_export_stats(hass: HomeAssistantType) -> List[Dict[str, Any]]:
+    """Return the counters of the exporters."""
+    exporter = hass.data.get(DATA_STATE_EXPORTER)
+
+    if exporter is None:
+        return []
+
+    return [subscription.as_dict() for subscription in exporter.subscriptions]
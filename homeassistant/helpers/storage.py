@@ -3,10 +3,24 @@ import asyncio
 from json import JSONEncoder
 import logging
 import os
-from typing import Dict, List, Optional, Callable, Union, Any, Type
+import tempfile
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Callable,
+    Union,
+    Any,
+    Set,
+    Tuple,
+    Type,
+)
+import zlib
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
 from homeassistant.helpers.event import async_call_later
@@ -15,8 +29,30 @@ from homeassistant.helpers.event import async_call_later
 # mypy: allow-untyped-calls, allow-untyped-defs, no-warn-return-any
 
 STORAGE_DIR = ".storage"
+JOURNAL_SUFFIX = ".journal"
+# Never compact journals smaller than this, regardless of the store size
+JOURNAL_MIN_COMPACT_SIZE = 64 * 1024
 _LOGGER = logging.getLogger(__name__)
 
+_JOURNAL_SET = "s"
+_JOURNAL_DELETE = "d"
+_JOURNAL_SPLICE = "r"
+_JOURNAL_PUT_ITEM = "p"
+_JOURNAL_REMOVE_ITEM = "x"
+
+
+class JournalCollection(NamedTuple):
+    """A list in the stored data whose items are journaled one by one.
+
+    path is the path of the list in the data and key the path of the unique
+    key in an item. item_func returns the data to store of the item with a
+    key, or None once the item was removed.
+    """
+
+    path: List[Any]
+    key: List[str]
+    item_func: Callable[[Any], Optional[Dict]]
+
 
 @bind_hass
 async def async_migrator(
@@ -64,8 +100,16 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        journal: bool = False,
+        journal_collections: Optional[Dict[str, JournalCollection]] = None,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        With journal enabled, saves only append the changes since the last
+        save to a journal next to the store file. Saves that pass the keys of
+        the items they changed in journal_collections only serialize those
+        items, other saves serialize and diff the whole data.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -76,6 +120,11 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task = None  # type: Optional[asyncio.Future]
         self._encoder = encoder
+        self._journal = StoreJournal(key) if journal else None
+        self._journal_collections = journal_collections or {}
+        # Keys of the changed items by collection, None if all data changed
+        self._changed = {}  # type: Optional[Dict[str, Set[Any]]]
+        self._compact_task = None  # type: Optional[asyncio.Future]
 
     @property
     def path(self):
@@ -106,13 +155,19 @@ class Store:
             # If we didn't generate data yet, do it now.
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
-        else:
+        elif self._journal is None:
             data = await self.hass.async_add_executor_job(
                 json_util.load_json, self.path
             )
+        else:
+            # Don't read the journal while it is being appended to
+            async with self._write_lock:
+                data = await self.hass.async_add_executor_job(
+                    self._journal.load, self.path
+                )
 
-            if data == {}:
-                return None
+        if data == {}:
+            return None
         if data["version"] == self.version:
             stored = data["data"]
         else:
@@ -124,12 +179,23 @@ class Store:
             )
             stored = await self._async_migrate_func(data["version"], data["data"])
 
+            # The journal applies to the old layout, start over with the new one
+            if self._journal is not None:
+                self._journal.reset()
+
         self._load_task = None
         return stored
 
-    async def async_save(self, data: Union[Dict, List]) -> None:
-        """Save data."""
+    async def async_save(
+        self, data: Union[Dict, List], *, changed: Optional[Dict[str, List[Any]]] = None
+    ) -> None:
+        """Save data.
+
+        changed maps journal collections to the keys of the items that were
+        added, updated or removed. Leave it out if other data changed.
+        """
         self._data = {"version": self.version, "key": self.key, "data": data}
+        self._async_mark_changed(changed)
 
         self._async_cleanup_delay_listener()
         self._async_cleanup_stop_listener()
@@ -137,10 +203,18 @@ class Store:
 
     @callback
     def async_delay_save(
-        self, data_func: Callable[[], Dict], delay: Optional[int] = None
+        self,
+        data_func: Callable[[], Dict],
+        delay: Optional[int] = None,
+        *,
+        changed: Optional[Dict[str, List[Any]]] = None,
     ) -> None:
-        """Save data with an optional delay."""
+        """Save data with an optional delay.
+
+        changed is like for async_save.
+        """
         self._data = {"version": self.version, "key": self.key, "data_func": data_func}
+        self._async_mark_changed(changed)
 
         self._async_cleanup_delay_listener()
 
@@ -150,6 +224,16 @@ class Store:
 
         self._async_ensure_stop_listener()
 
+    @callback
+    def _async_mark_changed(self, changed: Optional[Dict[str, List[Any]]]) -> None:
+        """Add the changed items to those of the pending write."""
+        if changed is None or self._changed is None:
+            self._changed = None
+            return
+
+        for name, keys in changed.items():
+            self._changed.setdefault(name, set()).update(keys)
+
     @callback
     def _async_ensure_stop_listener(self):
         """Ensure that we write if we quit before delay has passed."""
@@ -187,28 +271,465 @@ class Store:
     async def _async_handle_write_data(self, *_args):
         """Handle writing the config."""
         data = self._data
-
-        if "data_func" in data:
-            data["data"] = data.pop("data_func")()
-
+        changed = self._changed
         self._data = None
+        self._changed = {}
 
         async with self._write_lock:
             try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
-                )
+                if (
+                    changed is not None
+                    and self._journal is not None
+                    and self._journal.primed
+                ):
+                    await self.hass.async_add_executor_job(
+                        self._journal.write_items,
+                        self.path,
+                        self._changed_items(changed),
+                        self._encoder,
+                    )
+                else:
+                    if "data_func" in data:
+                        data["data"] = data.pop("data_func")()
+
+                    await self.hass.async_add_executor_job(
+                        self._write_data, self.path, data
+                    )
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
+        self._async_schedule_compact()
+
+    @callback
+    def _async_schedule_compact(self) -> None:
+        """Compact the journal in the background once it outgrew the store file."""
+        if (
+            self._journal is None
+            or not self._journal.needs_compaction
+            or self._compact_task is not None
+        ):
+            return
+
+        self._compact_task = self.hass.async_create_task(self._async_compact_task())
+
+    async def _async_compact_task(self) -> None:
+        """Compact the journal, allow scheduling the next compaction after."""
+        try:
+            await self.async_compact()
+        finally:
+            self._compact_task = None
+
+    def _changed_items(
+        self, changed: Dict[str, Set[Any]]
+    ) -> List[Tuple[JournalCollection, Any, Optional[Dict]]]:
+        """Return the collection, key and data of the changed items."""
+        items = []
+        for name, keys in changed.items():
+            collection = self._journal_collections[name]
+            for key in keys:
+                items.append((collection, key, collection.item_func(key)))
+        return items
+
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
+
+        if self._journal is not None:
+            self._journal.write(path, data, self._private, self._encoder)
+            return
+
         json_util.save_json(path, data, self._private, encoder=self._encoder)
 
+    async def async_compact(self) -> None:
+        """Fold the journal into the store file.
+
+        Afterwards the store file is an up to date JSON export of the data.
+        """
+        if self._journal is None:
+            return
+
+        async with self._write_lock:
+            try:
+                await self.hass.async_add_executor_job(
+                    self._journal.compact, self.path, self._private
+                )
+            except json_util.WriteError as err:
+                _LOGGER.error("Error compacting journal for %s: %s", self.key, err)
+
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
         raise NotImplementedError
+
+
+class StoreJournal:
+    """Append-only journal of changes to a store file.
+
+    The store file itself stays a regular JSON document. Each save appends a
+    single line with the differences against the previous save to
+    ``<path>.journal``. The first line of the journal holds the checksum of
+    the store file it applies to, so a journal left behind by an interrupted
+    compaction, or a store file edited by hand, is detected and ignored.
+    A line torn by a crash is dropped when loading.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Initialize the journal."""
+        self.key = key
+        # Last document written, as it would be read back from disk
+        self._doc = None  # type: Any
+        self._base_size = 0
+        # Bytes in the journal file, None if the journal needs to be restarted
+        self._size = None  # type: Optional[int]
+        # Positions of the items of journal collections in the document
+        self._indexes = {}  # type: Dict[Tuple, Dict[Any, int]]
+
+    @property
+    def primed(self) -> bool:
+        """Return if changes can be appended to the journal."""
+        return self._doc is not None and self._size is not None
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Return if the journal outgrew the store file."""
+        return self._size is not None and self._size > max(
+            JOURNAL_MIN_COMPACT_SIZE, self._base_size
+        )
+
+    def reset(self) -> None:
+        """Forget the document, the next write replaces the store file."""
+        self._doc = None
+        self._indexes = {}
+
+    def load(self, path: str) -> Union[Dict, List]:
+        """Load the store file and replay the journal on top of it."""
+        try:
+            with open(path, "rb") as fdesc:
+                raw = fdesc.read()
+            doc = json_util.json_loads(raw)
+        except FileNotFoundError:
+            _LOGGER.debug("JSON file not found: %s", path)
+            self._doc = None
+            self._size = None
+            return {}
+        except ValueError as error:
+            _LOGGER.exception("Could not parse JSON content: %s", path)
+            raise HomeAssistantError(error)
+        except OSError as error:
+            _LOGGER.exception("JSON file reading failed: %s", path)
+            raise HomeAssistantError(error)
+
+        self._base_size = len(raw)
+        self._size = None
+        doc = self._replay(path + JOURNAL_SUFFIX, zlib.crc32(raw), doc)
+
+        # The caller owns the returned data and may mutate it.
+        self._doc = json_util.json_loads(json_util.json_bytes(doc))
+        self._indexes = {}
+        return doc
+
+    def _replay(self, journal_path: str, checksum: int, doc: Any) -> Any:
+        """Apply the journal to the document if it belongs to it."""
+        try:
+            with open(journal_path, "rb") as fdesc:
+                header = fdesc.readline()
+                try:
+                    if json_util.json_loads(header)["base"] != checksum:
+                        raise ValueError("Checksum mismatch")
+                except (ValueError, KeyError, TypeError):
+                    _LOGGER.debug("Ignoring stale journal %s", journal_path)
+                    return doc
+
+                size = len(header)
+                indexes = {}  # type: Dict[Tuple, Dict[Any, int]]
+                for line in fdesc:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("Incomplete record")
+                        doc = _journal_apply(doc, json_util.json_loads(line), indexes)
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        _LOGGER.warning(
+                            "Dropping incomplete journal record for %s", self.key
+                        )
+                        break
+                    size += len(line)
+        except FileNotFoundError:
+            return doc
+        except OSError as error:
+            _LOGGER.exception("Journal reading failed: %s", journal_path)
+            raise HomeAssistantError(error)
+
+        try:
+            os.truncate(journal_path, size)
+        except OSError as error:
+            _LOGGER.exception("Journal truncating failed: %s", journal_path)
+            raise HomeAssistantError(error)
+        self._size = size
+        return doc
+
+    def write(
+        self,
+        path: str,
+        data: Any,
+        private: bool,
+        encoder: Optional[Type[JSONEncoder]] = None,
+    ) -> None:
+        """Record the new data, appending only what changed."""
+        try:
+            doc = json_util.json_loads(json_util.json_bytes(data, encoder=encoder))
+        except TypeError as error:
+            _LOGGER.exception("Failed to serialize to JSON: %s", path)
+            raise json_util.SerializationError(error)
+
+        if not self.primed:
+            self._doc = doc
+            self._indexes = {}
+            self.compact(path, private)
+            return
+
+        ops = []  # type: List[List[Any]]
+        _journal_diff(self._doc, doc, [], ops)
+        self._doc = doc
+        self._indexes = {}
+        self._append(path, ops)
+
+    def write_items(
+        self,
+        path: str,
+        items: List[Tuple[JournalCollection, Any, Optional[Dict]]],
+        encoder: Optional[Type[JSONEncoder]] = None,
+    ) -> None:
+        """Record added, updated and removed items of journal collections.
+
+        Only the items are serialized, the cost does not depend on the size
+        of the document. The journal needs to be primed.
+        """
+        ops = []  # type: List[List[Any]]
+
+        for collection, key, item in items:
+            list_path = ["data"] + list(collection.path)
+            index = _item_index(self._doc, list_path, collection.key, self._indexes)
+
+            if item is None:
+                if key not in index:
+                    continue
+                operation = [_JOURNAL_REMOVE_ITEM, list_path, collection.key, key]
+            else:
+                try:
+                    item = json_util.json_loads(
+                        json_util.json_bytes(item, encoder=encoder)
+                    )
+                except TypeError as error:
+                    _LOGGER.exception("Failed to serialize to JSON: %s", path)
+                    raise json_util.SerializationError(error)
+
+                position = index.get(key)
+                if position is not None and _same(
+                    _resolve(self._doc, list_path)[position], item
+                ):
+                    continue
+                operation = [_JOURNAL_PUT_ITEM, list_path, collection.key, key, item]
+
+            self._doc = _journal_apply(self._doc, [operation], self._indexes)
+            ops.append(operation)
+
+        self._append(path, ops)
+
+    def _append(self, path: str, ops: List[List[Any]]) -> None:
+        """Append a record of operations."""
+        if not ops:
+            return
+
+        record = json_util.json_bytes(ops) + b"\n"
+        try:
+            with open(path + JOURNAL_SUFFIX, "ab") as fdesc:
+                fdesc.write(record)
+        except OSError as error:
+            _LOGGER.exception("Appending to journal failed: %s", path)
+            # We don't know what made it to disk, start over on next write
+            self._size = None
+            raise json_util.WriteError(error)
+
+        assert self._size is not None
+        self._size += len(record)
+
+    def compact(self, path: str, private: bool) -> None:
+        """Write the current document to the store file and reset the journal."""
+        if self._doc is None:
+            return
+
+        _LOGGER.debug("Compacting journal for %s", self.key)
+        json_util.save_json(path, self._doc, private)
+
+        tmp_filename = ""
+        try:
+            with open(path, "rb") as fdesc:
+                raw = fdesc.read()
+            header = json_util.json_bytes({"base": zlib.crc32(raw)}) + b"\n"
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(path), delete=False
+            ) as tmp_fdesc:
+                tmp_fdesc.write(header)
+                tmp_filename = tmp_fdesc.name
+            if not private:
+                os.chmod(tmp_filename, 0o644)
+            os.replace(tmp_filename, path + JOURNAL_SUFFIX)
+        except OSError as error:
+            _LOGGER.exception("Resetting journal failed: %s", path)
+            self._size = None
+            raise json_util.WriteError(error)
+        finally:
+            if tmp_filename and os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+
+        self._base_size = len(raw)
+        self._size = len(header)
+
+
+def _journal_diff(old: Any, new: Any, path: List[Any], ops: List[List[Any]]) -> None:
+    """Append the operations that turn old into new to ops."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append([_JOURNAL_DELETE, path + [key]])
+        for key, value in new.items():
+            if key not in old:
+                ops.append([_JOURNAL_SET, path + [key], value])
+            elif not _same(old[key], value):
+                _journal_diff(old[key], value, path + [key], ops)
+
+    elif isinstance(old, list) and isinstance(new, list):
+        shortest = min(len(old), len(new))
+        start = 0
+        while start < shortest and _same(old[start], new[start]):
+            start += 1
+        end = 0
+        while end < shortest - start and _same(old[-1 - end], new[-1 - end]):
+            end += 1
+
+        # Either diff the items in place and splice the tail, which suits
+        # updated and appended items, or splice the differing middle part,
+        # which suits items inserted or removed in the middle.
+        changed = [
+            index
+            for index in range(start, shortest)
+            if not _same(old[index], new[index])
+        ]
+        if len(changed) < len(new) - end - start or len(old) == len(new):
+            for index in changed:
+                _journal_diff(old[index], new[index], path + [index], ops)
+            if len(old) != len(new):
+                ops.append([_JOURNAL_SPLICE, path, shortest, len(old), new[shortest:]])
+        else:
+            ops.append(
+                [
+                    _JOURNAL_SPLICE,
+                    path,
+                    start,
+                    len(old) - end,
+                    new[start : len(new) - end],
+                ]
+            )
+
+    elif not _same(old, new):
+        ops.append([_JOURNAL_SET, path, new])
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Return if two JSON values are equal, types included.
+
+    Unlike ==, 1, 1.0 and True are different values.
+    """
+    if type(old) is not type(new):  # pylint: disable=unidiomatic-typecheck
+        return False
+
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(
+            _same(value, new[key]) for key, value in old.items()
+        )
+
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(_same, old, new))
+
+    return bool(old == new)
+
+
+def _resolve(doc: Any, path: List[Any]) -> Any:
+    """Return the value at a path of the document."""
+    for key in path:
+        doc = doc[key]
+    return doc
+
+
+def _item_index(
+    doc: Any, path: List[Any], key: List[str], indexes: Dict[Tuple, Dict[Any, int]]
+) -> Dict[Any, int]:
+    """Return the positions of the items of a list by their key."""
+    cache_key = (tuple(path), tuple(key))
+    index = indexes.get(cache_key)
+
+    if index is None:
+        index = indexes[cache_key] = {
+            _resolve(item, key): position
+            for position, item in enumerate(_resolve(doc, path))
+        }
+
+    return index
+
+
+def _journal_apply(
+    doc: Any,
+    ops: List[List[Any]],
+    indexes: Optional[Dict[Tuple, Dict[Any, int]]] = None,
+) -> Any:
+    """Apply journal operations to a document and return the result.
+
+    indexes caches the positions of the items of journal collections across
+    calls, it is kept up to date.
+    """
+    if indexes is None:
+        indexes = {}
+
+    for operation in ops:
+        kind, path = operation[0], operation[1]
+
+        if kind in (_JOURNAL_PUT_ITEM, _JOURNAL_REMOVE_ITEM):
+            items = _resolve(doc, path)
+            index = _item_index(doc, path, operation[2], indexes)
+            position = index.get(operation[3])
+
+            if kind == _JOURNAL_REMOVE_ITEM:
+                del items[index.pop(operation[3])]
+                # The items after it moved
+                del indexes[(tuple(path), tuple(operation[2]))]
+            elif position is None:
+                index[operation[3]] = len(items)
+                items.append(operation[4])
+            else:
+                items[position] = operation[4]
+            continue
+
+        # Any other operation may move items
+        indexes.clear()
+
+        if kind == _JOURNAL_SPLICE:
+            target = _resolve(doc, path)
+            target[operation[2] : operation[3]] = operation[4]
+            continue
+
+        if not path:
+            doc = operation[2]
+            continue
+
+        parent = _resolve(doc, path[:-1])
+
+        if kind == _JOURNAL_SET:
+            parent[path[-1]] = operation[2]
+        elif kind == _JOURNAL_DELETE:
+            del parent[path[-1]]
+        else:
+            raise ValueError("Unknown journal operation {}".format(kind))
+
+    return doc
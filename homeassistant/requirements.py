@@ -3,17 +3,20 @@ import asyncio
 from pathlib import Path
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.package as pkg_util
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.loader import async_get_integration, Integration
 
 DATA_PIP_LOCK = "pip_lock"
 DATA_PKG_CACHE = "pkg_cache"
 CONSTRAINT_FILE = "package_constraints.txt"
 PROGRESS_FILE = ".pip_progress"
+STORAGE_KEY = "core.requirements"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -61,14 +64,75 @@ async def async_process_requirements(
     kwargs = pip_kwargs(hass.config.config_dir)
 
     async with pip_lock:
+        cache = await _async_get_pkg_cache(hass)
+
+        if all(req in cache.satisfied for req in requirements):
+            return
+
         for req in requirements:
-            if pkg_util.is_installed(req):
+            if req in cache.satisfied:
                 continue
 
-            ret = await hass.async_add_executor_job(_install, hass, req, kwargs)
+            if not await hass.async_add_executor_job(pkg_util.is_installed, req):
+                ret = await hass.async_add_executor_job(_install, hass, req, kwargs)
+
+                if not ret:
+                    raise RequirementsNotFound(name, [req])
+
+                # The install may have changed other packages
+                cache.satisfied.clear()
+                cache.fingerprint = await hass.async_add_executor_job(
+                    pkg_util.environment_fingerprint
+                )
+
+            cache.satisfied.add(req)
+
+        cache.async_schedule_save()
+
+
+class PackageCache:
+    """Requirements known to be satisfied by the installed packages.
+
+    The cache is stored together with a fingerprint of the environment and
+    discarded when the fingerprint no longer matches.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the package cache."""
+        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self.fingerprint = None  # type: Optional[str]
+        self.satisfied = set()  # type: Set[str]
+
+    async def async_load(self, fingerprint: str) -> None:
+        """Load the cache if it matches the environment fingerprint."""
+        self.fingerprint = fingerprint
+        data = await self._store.async_load()
+
+        if data is not None and data["fingerprint"] == fingerprint:
+            self.satisfied = set(data["satisfied"])
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return data of the cache to store in a file."""
+        return {"fingerprint": self.fingerprint, "satisfied": sorted(self.satisfied)}
+
+
+async def _async_get_pkg_cache(hass: HomeAssistant) -> PackageCache:
+    """Return the loaded package cache."""
+    cache = hass.data.get(DATA_PKG_CACHE)  # type: Optional[PackageCache]
+
+    if cache is None:
+        cache = hass.data[DATA_PKG_CACHE] = PackageCache(hass)
+        await cache.async_load(
+            await hass.async_add_executor_job(pkg_util.environment_fingerprint)
+        )
 
-            if not ret:
-                raise RequirementsNotFound(name, [req])
+    return cache
 
 
 def _install(hass: HomeAssistant, req: str, kwargs: Dict) -> bool:
@@ -2,13 +2,17 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 import logging
+import os
+import tempfile
 from timeit import default_timer as timer
 from typing import Callable, Dict
 
 from homeassistant import core
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers.json import JSONEncoder, json_bytes, json_dumps
 from homeassistant.util import dt as dt_util
 
 
@@ -68,11 +72,40 @@ async def async_million_events(hass):
 
     hass.bus.async_listen(event_name, listener)
 
+    # Firing schedules the listeners, so it is part of the measurement
+    start = timer()
+
     for _ in range(10 ** 6):
         hass.bus.async_fire(event_name)
 
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def million_jobs_from_thread(hass):
+    """Run a million callbacks added from a worker thread."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def job():
+        """Handle job."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 6:
+            event.set()
+
+    def add_jobs():
+        """Add the jobs."""
+        for _ in range(10 ** 6):
+            hass.add_job(job)
+
     start = timer()
 
+    await hass.async_add_executor_job(add_jobs)
     await event.wait()
 
     return timer() - start
@@ -186,3 +219,146 @@ def _logbook_filtering(hass, last_changed, last_updated):
     list(logbook.humanify(None, yield_events(event)))
 
     return timer() - start
+
+
+def _typical_states():
+    """Return state payloads like the ones sent to the frontend."""
+    return [
+        core.State(
+            "sensor.sensor_{}".format(idx),
+            str(idx * 1.5),
+            {
+                "unit_of_measurement": "°C",
+                "friendly_name": "Sensor {}".format(idx),
+                "device_class": "temperature",
+                "last_reset": dt_util.utcnow(),
+                "options": {"min": 0, "max": 100, "step": 0.5},
+            },
+        )
+        for idx in range(1000)
+    ]
+
+
+@benchmark
+async def json_serialize_states(hass):
+    """Serialize 1000 states 100 times with the JSON codec."""
+    states = _typical_states()
+    start = timer()
+
+    for _ in range(100):
+        json_dumps(states)
+
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize 1000 states 100 times with the plain JSONEncoder class."""
+    states = _typical_states()
+    start = timer()
+
+    for _ in range(100):
+        json.dumps(states, cls=JSONEncoder)
+
+    return timer() - start
+
+
+@benchmark
+async def async_add_10k_entities(hass):
+    """Add 10k entities with the same name to an entity platform."""
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_platform import EntityPlatform
+
+    # Registries are loaded from here, nothing is written as the entities
+    # have no unique id.
+    hass.config.config_dir = os.path.join(tempfile.gettempdir(), "ha_benchmark")
+
+    class BenchmarkEntity(Entity):
+        """Entity without polling that only has a name."""
+
+        should_poll = False
+        name = "Benchmark"
+
+    platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain="sensor",
+        platform_name="benchmark",
+        platform=None,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+        async_entities_added_callback=lambda: None,
+    )
+    entities = [BenchmarkEntity() for _ in range(10 ** 4)]
+
+    start = timer()
+
+    await platform.async_add_entities(entities)
+
+    return timer() - start
+
+
+def _states_database(rows):
+    """Return a session of an in-memory database with rows of states."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from homeassistant.components.recorder.models import Base, States
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    now = dt_util.utcnow()
+    attributes = json_dumps(
+        {"unit_of_measurement": "°C", "friendly_name": "Sensor", "icon": "mdi:sun"}
+    )
+    engine.execute(
+        States.__table__.insert(),
+        [
+            {
+                "domain": "sensor",
+                "entity_id": "sensor.sensor_{}".format(idx % 100),
+                "state": str(idx % 1000),
+                "attributes": attributes,
+                "last_changed": now + timedelta(seconds=idx),
+                "last_updated": now + timedelta(seconds=idx),
+                "context_id": "01234567890123456789012345678901",
+            }
+            for idx in range(rows)
+        ],
+    )
+    return sessionmaker(bind=engine)()
+
+
+@benchmark
+async def recorder_read_1m_states(hass):
+    """Read 1M states with the column query and encode them to JSON."""
+    from homeassistant.components.recorder.models import (
+        LAZY_STATE_COLUMNS,
+        LazyState,
+        States,
+    )
+    from homeassistant.components.recorder.util import execute
+
+    session = _states_database(10 ** 6)
+    start = timer()
+
+    states = execute(
+        session.query(*LAZY_STATE_COLUMNS).order_by(States.last_updated), LazyState
+    )
+    b",".join(state.as_json() for state in states)
+
+    return timer() - start
+
+
+@benchmark
+async def recorder_read_1m_states_orm(hass):
+    """Read 1M states as ORM objects and encode them to JSON."""
+    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.util import execute
+
+    session = _states_database(10 ** 6)
+    start = timer()
+
+    states = execute(session.query(States).order_by(States.last_updated))
+    json_bytes(states)
+
+    return timer() - start
@@ -169,7 +169,10 @@ async def _async_setup_component(
             )
         elif hasattr(component, "setup"):
             result = await hass.async_add_executor_job(
-                component.setup, hass, processed_config  # type: ignore
+                component.setup,  # type: ignore
+                hass,
+                processed_config,
+                executor=hass.async_get_executor(domain),
             )
         else:
             log_error("No setup function defined.")
@@ -18,6 +18,7 @@ from typing import (
     Union,  # noqa
     Iterable,
     Coroutine,
+    Container,
 )
 
 import slugify as unicode_slug
@@ -80,7 +81,11 @@ def ensure_unique_string(
     If preferred string exists will append _2, _3, ..
     """
     test_string = preferred_string
-    current_strings_set = set(current_strings)
+
+    if isinstance(current_strings, (set, frozenset, KeysView)):
+        current_strings_set = current_strings  # type: Container[str]
+    else:
+        current_strings_set = set(current_strings)
 
     tries = 1
 
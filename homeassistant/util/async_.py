@@ -1,7 +1,9 @@
 """Asyncio backports for Python 3.4.3 compatibility."""
+from collections import deque
 import concurrent.futures
 import threading
 import logging
+from time import monotonic
 from asyncio import coroutines
 from asyncio.events import AbstractEventLoop
 from asyncio.futures import Future
@@ -10,6 +12,9 @@ import asyncio
 from asyncio import ensure_future
 from typing import (
     Any,
+    Deque,
+    Dict,
+    Tuple,
     Union,
     Coroutine,
     Callable,
@@ -214,3 +219,88 @@ def run_callback_threadsafe(
 
     loop.call_soon_threadsafe(run_callback)
     return future
+
+
+class ThreadsafeCallbackQueue:
+    """Queue of callbacks from other threads to run in the event loop.
+
+    Every loop.call_soon_threadsafe writes to the self-pipe of the loop to wake
+    it up. Callbacks added here are collected in a deque instead and the loop
+    is only woken up once for all callbacks added before it gets to run them.
+    Callbacks run in the order they were added.
+    """
+
+    def __init__(self, loop: AbstractEventLoop) -> None:
+        """Initialize the queue."""
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._callbacks = deque()  # type: Deque[Tuple[Callable, Tuple, float]]
+        self._scheduled = False
+        self.batches = 0
+        self.calls = 0
+        self.max_depth = 0
+        # Seconds between adding a callback and running it
+        self.latency_sum = 0.0
+        self.max_latency = 0.0
+
+    def call_soon(self, callback: Callable, *args: Any) -> None:
+        """Add a callback to run in the event loop.
+
+        This method can be called from any thread.
+        """
+        with self._lock:
+            self._callbacks.append((callback, args, monotonic()))
+
+            # A run still pending when the loop was closed will never happen
+            if self._scheduled and not self._loop.is_closed():
+                return
+
+            self._scheduled = True
+
+        try:
+            self._loop.call_soon_threadsafe(self._run)
+        except RuntimeError:
+            # The loop is closed, the callbacks will never run
+            with self._lock:
+                self._callbacks.clear()
+                self._scheduled = False
+            raise
+
+    def _run(self) -> None:
+        """Run the callbacks added since the last run."""
+        with self._lock:
+            callbacks = self._callbacks
+            self._callbacks = deque()
+            self._scheduled = False
+
+        now = monotonic()
+        depth = len(callbacks)
+        self.batches += 1
+        self.calls += depth
+        self.max_depth = max(self.max_depth, depth)
+
+        latency = now - callbacks[0][2]
+        self.max_latency = max(self.max_latency, latency)
+        self.latency_sum += sum(now - added for _, _, added in callbacks)
+
+        for callback, args, _ in callbacks:
+            try:
+                callback(*args)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._loop.call_exception_handler(
+                    {"message": f"Exception in callback {callback}", "exception": exc}
+                )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the metrics of the queue."""
+        with self._lock:
+            depth = len(self._callbacks)
+
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "batches": self.batches,
+            "calls": self.calls,
+            "latency_sum": self.latency_sum,
+            "max_latency": self.max_latency,
+        }
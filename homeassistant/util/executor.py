@@ -0,0 +1,77 @@
+"""Executor that keeps metrics of the jobs it runs."""
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict, TypeVar
+
+_T = TypeVar("_T")
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool executor that keeps metrics of its jobs."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the executor."""
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        # Jobs submitted but not started yet
+        self.queued = 0
+        # Jobs being run
+        self.active = 0
+        self.completed = 0
+        # Seconds jobs waited for a worker and seconds jobs ran
+        self.wait_sum = 0.0
+        self.duration_sum = 0.0
+        self.max_duration = 0.0
+
+    # pylint: disable=arguments-differ
+    def submit(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> Future:
+        """Submit a job to the executor."""
+        with self._metrics_lock:
+            self.queued += 1
+
+        future = super().submit(self._run, fn, monotonic(), args, kwargs)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _run(
+        self, job: Callable[..., _T], submitted: float, args: Any, kwargs: Any
+    ) -> _T:
+        """Run a job and measure it."""
+        start = monotonic()
+
+        with self._metrics_lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_sum += start - submitted
+
+        try:
+            return job(*args, **kwargs)
+        finally:
+            duration = monotonic() - start
+
+            with self._metrics_lock:
+                self.active -= 1
+                self.completed += 1
+                self.duration_sum += duration
+                self.max_duration = max(self.max_duration, duration)
+
+    def _job_done(self, future: Future) -> None:
+        """Count jobs cancelled before they started."""
+        if future.cancelled():
+            with self._metrics_lock:
+                self.queued -= 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the metrics of the executor."""
+        with self._metrics_lock:
+            return {
+                "max_workers": self._max_workers,  # type: ignore
+                "workers": len(self._threads),  # type: ignore
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "wait_sum": self.wait_sum,
+                "duration_sum": self.duration_sum,
+                "max_duration": self.max_duration,
+            }
@@ -1,6 +1,14 @@
-"""JSON utility functions."""
+"""JSON utility functions.
+
+All JSON produced by Home Assistant goes through json_dumps/json_bytes. When
+orjson is installed it is used to encode and decode, otherwise the standard
+library json module is used. orjson writes NaN and infinity as null, also
+with allow_nan=False where the standard library raises ValueError. It only
+supports an indent of 2, so other indents use the standard library.
+"""
+from datetime import datetime
 import logging
-from typing import Union, List, Dict, Optional, Type
+from typing import Any, Callable, Union, List, Dict, Optional, Type
 
 import json
 import os
@@ -8,8 +16,25 @@ import tempfile
 
 from homeassistant.exceptions import HomeAssistantError
 
+try:
+    import orjson  # pylint: disable=import-error
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# mypy: allow-untyped-calls
+
 _LOGGER = logging.getLogger(__name__)
 
+JSON_BACKEND = "orjson" if HAS_ORJSON else "json"
+
+# Converters for objects the JSON backends can't serialize, by exact type
+_TYPE_CONVERTERS = {
+    datetime: datetime.isoformat,
+    set: list,
+}  # type: Dict[type, Callable[[Any], Any]]
+
 
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
@@ -19,6 +44,127 @@ class WriteError(HomeAssistantError):
     """Error writing the data."""
 
 
+def register_json_converter(obj_type: type, converter: Callable[[Any], Any]) -> None:
+    """Register a fast path to convert objects of exactly this type."""
+    _TYPE_CONVERTERS[obj_type] = converter
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert objects that the JSON backends can't serialize natively.
+
+    Raises TypeError for objects that can't be converted.
+    """
+    converter = _TYPE_CONVERTERS.get(type(obj))
+    if converter is not None:
+        return converter(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(type(obj).__name__)
+    )
+
+
+class JSONEncoder(json.JSONEncoder):
+    """JSONEncoder that supports Home Assistant objects."""
+
+    # pylint: disable=method-hidden
+    def default(self, o: Any) -> Any:
+        """Convert Home Assistant objects.
+
+        Hand other objects to the original method.
+        """
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+def _use_orjson(
+    indent: Optional[int], encoder: Optional[Type[json.JSONEncoder]]
+) -> bool:
+    """Return if orjson encodes like json.dumps with these arguments."""
+    return (
+        HAS_ORJSON
+        and indent in (None, 2)
+        and (encoder is None or encoder is JSONEncoder)
+    )
+
+
+def _orjson_option(sort_keys: bool, indent: Optional[int]) -> int:
+    """Return orjson options matching the json.dumps arguments."""
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent is not None:
+        option |= orjson.OPT_INDENT_2
+    return option  # type: ignore
+
+
+def json_dumps(
+    data: Any,
+    *,
+    sort_keys: bool = False,
+    indent: Optional[int] = None,
+    allow_nan: bool = True,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+) -> str:
+    """Serialize data to a JSON string.
+
+    A custom encoder class forces the standard library backend.
+    """
+    if _use_orjson(indent, encoder):
+        return orjson.dumps(
+            data, default=json_encoder_default, option=_orjson_option(sort_keys, indent)
+        ).decode("utf-8")
+
+    if encoder is None or encoder is JSONEncoder:
+        return json.dumps(
+            data,
+            sort_keys=sort_keys,
+            indent=indent,
+            allow_nan=allow_nan,
+            default=json_encoder_default,
+        )
+
+    return json.dumps(
+        data, sort_keys=sort_keys, indent=indent, allow_nan=allow_nan, cls=encoder
+    )
+
+
+def json_bytes(
+    data: Any,
+    *,
+    sort_keys: bool = False,
+    indent: Optional[int] = None,
+    allow_nan: bool = True,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+) -> bytes:
+    """Serialize data to UTF-8 encoded JSON."""
+    if _use_orjson(indent, encoder):
+        return orjson.dumps(
+            data, default=json_encoder_default, option=_orjson_option(sort_keys, indent)
+        )
+
+    return json_dumps(
+        data, sort_keys=sort_keys, indent=indent, allow_nan=allow_nan, encoder=encoder
+    ).encode("utf-8")
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON data.
+
+    Raises ValueError if the data is not valid JSON.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_json(
     filename: str, default: Union[List, Dict, None] = None
 ) -> Union[List, Dict]:
@@ -28,7 +174,7 @@ def load_json(
     """
     try:
         with open(filename, encoding="utf-8") as fdesc:
-            return json.loads(fdesc.read())  # type: ignore
+            return json_loads(fdesc.read())  # type: ignore
     except FileNotFoundError:
         # This is not a fatal error
         _LOGGER.debug("JSON file not found: %s", filename)
@@ -55,7 +201,7 @@ def save_json(
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        json_data = json_dumps(data, sort_keys=True, indent=4, encoder=encoder)
         # Modern versions of Python tempfile create this file with mode 0o600
         with tempfile.NamedTemporaryFile(
             mode="w", encoding="utf-8", dir=tmp_path, delete=False
@@ -1,14 +1,13 @@
 """Logging utilities."""
 import asyncio
 from asyncio.events import AbstractEventLoop
+from collections import deque
 from functools import partial, wraps
 import inspect
 import logging
 import threading
 import traceback
-from typing import Any, Callable, Coroutine, Optional
-
-from .async_ import run_coroutine_threadsafe
+from typing import Any, Callable, Coroutine, Deque, Optional
 
 
 class HideSensitiveDataFilter(logging.Filter):
@@ -26,17 +25,39 @@ class HideSensitiveDataFilter(logging.Filter):
         return True
 
 
+# Records kept waiting for the writer thread before new ones are dropped
+DEFAULT_MAX_QUEUE_SIZE = 10000
+
+
 # pylint: disable=invalid-name
 class AsyncHandler:
-    """Logging handler wrapper to add an async layer."""
+    """Logging handler wrapper to add an async layer.
 
-    def __init__(self, loop: AbstractEventLoop, handler: logging.Handler) -> None:
+    Records are appended to a bounded queue without involving the event loop
+    and written by a separate thread in batches. When the writer can't keep up
+    and the queue is full, new records are dropped and a warning with the
+    number of dropped records is written once there is room again.
+    """
+
+    def __init__(
+        self,
+        loop: AbstractEventLoop,
+        handler: logging.Handler,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ) -> None:
         """Initialize async logging handler wrapper."""
         self.handler = handler
         self.loop = loop
-        self._queue = asyncio.Queue(loop=loop)  # type: asyncio.Queue
+        self.max_queue_size = max_queue_size
+        # Appending and popping from a deque are thread-safe
+        self._queue = deque()  # type: Deque[Optional[logging.LogRecord]]
+        self._wakeup = threading.Event()
         self._thread = threading.Thread(target=self._process)
 
+        # Records can be dropped from any thread, so the count is approximate
+        self.dropped = 0
+        self._dropped_reported = 0
+
         # Delegate from handler
         self.setLevel = handler.setLevel
         self.setFormatter = handler.setFormatter
@@ -59,22 +80,25 @@ class AsyncHandler:
 
         When blocking=True, will wait till closed.
         """
-        await self._queue.put(None)
+        self.emit(None)
 
         if blocking:
             while self._thread.is_alive():
                 await asyncio.sleep(0)
 
     def emit(self, record: Optional[logging.LogRecord]) -> None:
-        """Process a record."""
-        ident = self.loop.__dict__.get("_thread_ident")
+        """Queue a record for the writer thread."""
+        # The close request (None) is never dropped
+        if record is not None and len(self._queue) >= self.max_queue_size:
+            self.dropped += 1
+            return
+
+        self._queue.append(record)
 
-        # inside eventloop
-        if ident is not None and ident == threading.get_ident():
-            self._queue.put_nowait(record)
-        # from a thread/executor
-        else:
-            self.loop.call_soon_threadsafe(self._queue.put_nowait, record)
+        # Only wake the writer if it is waiting, after appending so the record
+        # is seen by the writer either way.
+        if not self._wakeup.is_set():
+            self._wakeup.set()
 
     def __repr__(self) -> str:
         """Return the string names."""
@@ -82,14 +106,44 @@ class AsyncHandler:
 
     def _process(self) -> None:
         """Process log in a thread."""
-        while True:
-            record = run_coroutine_threadsafe(self._queue.get(), self.loop).result()
+        queue = self._queue
 
-            if record is None:
-                self.handler.close()
-                return
-
-            self.handler.emit(record)
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Write everything queued since the last wakeup as one batch
+            while queue:
+                record = queue.popleft()
+
+                if record is None:
+                    self._report_dropped()
+                    self.handler.close()
+                    return
+
+                self.handler.emit(record)
+
+            self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        """Write a warning about records dropped since the last report."""
+        dropped = self.dropped - self._dropped_reported
+
+        if not dropped:
+            return
+
+        self._dropped_reported += dropped
+        self.handler.emit(
+            logging.LogRecord(
+                __name__,
+                logging.WARNING,
+                __file__,
+                0,
+                "Dropped %d log records because the log writer could not keep up",
+                (dropped,),
+                None,
+            )
+        )
 
     def createLock(self) -> None:
         """Ignore lock stuff."""
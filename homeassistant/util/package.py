@@ -1,5 +1,6 @@
 """Helpers to install PyPi packages."""
 import asyncio
+import hashlib
 import logging
 import os
 from subprocess import PIPE, Popen
@@ -8,7 +9,6 @@ from typing import Optional
 from urllib.parse import urlparse
 from pathlib import Path
 
-import pkg_resources
 from importlib_metadata import version, PackageNotFoundError
 
 
@@ -34,6 +34,9 @@ def is_installed(package: str) -> bool:
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
+    # Importing pkg_resources is slow, only do it when needed
+    import pkg_resources
+
     try:
         req = pkg_resources.Requirement.parse(package)
     except ValueError:
@@ -47,6 +50,29 @@ def is_installed(package: str) -> bool:
         return False
 
 
+# Names of the directories pip installs packages into, the deps dir included
+PACKAGE_DIRS = ("site-packages", "dist-packages")
+
+
+def environment_fingerprint() -> str:
+    """Return a fingerprint of the directories packages are installed in.
+
+    Installing, upgrading or removing a package changes the modification
+    time of the directory it is installed in, and so the fingerprint. Other
+    entries of sys.path, like the current and the config directory, change
+    all the time and are left out.
+    """
+    entries = []
+    for path in sys.path:
+        if os.path.basename(os.path.normpath(path)) not in PACKAGE_DIRS:
+            continue
+        try:
+            entries.append("{}:{}".format(path, os.stat(path).st_mtime_ns))
+        except OSError:
+            continue
+    return hashlib.sha1("\n".join(entries).encode("utf-8")).hexdigest()
+
+
 def install_package(
     package: str,
     upgrade: bool = True,
@@ -119,6 +119,7 @@ TEST_REQUIREMENTS = (
     "pyiqvia",
     "pylitejet",
     "pymfy",
+    "pymodbus",
     "pymonoprice",
     "pynws",
     "pynx584",
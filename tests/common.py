@@ -8,7 +8,6 @@ import uuid
 import sys
 import threading
 
-from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import timedelta
 from io import StringIO
@@ -158,11 +157,11 @@ async def async_test_home_assistant(loop):
             return mock_coro(target(*args))
         return orig_async_add_job(target, *args)
 
-    def async_add_executor_job(target, *args):
+    def async_add_executor_job(target, *args, **kwargs):
         """Add executor job."""
         if isinstance(target, Mock):
             return mock_coro(target(*args))
-        return orig_async_add_executor_job(target, *args)
+        return orig_async_add_executor_job(target, *args, **kwargs)
 
     def async_create_task(coroutine):
         """Create task."""
@@ -351,7 +350,7 @@ def mock_component(hass, component):
 def mock_registry(hass, mock_entries=None):
     """Mock the Entity Registry."""
     registry = entity_registry.EntityRegistry(hass)
-    registry.entities = mock_entries or OrderedDict()
+    registry.entities = entity_registry.EntityRegistryItems(mock_entries)
 
     hass.data[entity_registry.DATA_REGISTRY] = registry
     return registry
@@ -360,7 +359,7 @@ def mock_registry(hass, mock_entries=None):
 def mock_area_registry(hass, mock_entries=None):
     """Mock the Area Registry."""
     registry = area_registry.AreaRegistry(hass)
-    registry.areas = mock_entries or OrderedDict()
+    registry.areas = area_registry.AreaRegistryItems(mock_entries)
 
     hass.data[area_registry.DATA_REGISTRY] = registry
     return registry
@@ -369,7 +368,7 @@ def mock_area_registry(hass, mock_entries=None):
 def mock_device_registry(hass, mock_entries=None):
     """Mock the Device Registry."""
     registry = device_registry.DeviceRegistry(hass)
-    registry.devices = mock_entries or OrderedDict()
+    registry.devices = device_registry.DeviceRegistryItems(mock_entries)
 
     hass.data[device_registry.DATA_REGISTRY] = registry
     return registry
@@ -11,6 +11,7 @@ import voluptuous as vol
 from homeassistant import const
 from homeassistant.bootstrap import DATA_LOGGING
 import homeassistant.core as ha
+from homeassistant.helpers import state_exporter
 from homeassistant.setup import async_setup_component
 
 from tests.common import async_mock_service
@@ -507,6 +508,36 @@ async def test_event_stream_requires_admin(hass, mock_api_client, hass_admin_use
     assert resp.status == 401
 
 
+async def test_api_get_executors(hass, mock_api_client, hass_admin_user):
+    """Test the return of the executor metrics."""
+    resp = await mock_api_client.get(const.URL_API_EXECUTORS)
+    assert resp.status == 200
+    result = await resp.json()
+    assert "queued" in result["default"]
+
+    hass_admin_user.groups = []
+    resp = await mock_api_client.get(const.URL_API_EXECUTORS)
+    assert resp.status == 401
+
+
+async def test_api_get_exporters(hass, mock_api_client, hass_admin_user):
+    """Test the return of the state exporter counters."""
+    state_exporter.async_subscribe(hass, "test", lambda records: None)
+    hass.states.async_set("test.entity", "on")
+    await hass.async_block_till_done()
+
+    resp = await mock_api_client.get(const.URL_API_EXPORTERS)
+    assert resp.status == 200
+    result = await resp.json()
+    assert result[0]["name"] == "test"
+    assert result[0]["exported"] == 1
+    assert result[0]["dropped"] == 0
+
+    hass_admin_user.groups = []
+    resp = await mock_api_client.get(const.URL_API_EXPORTERS)
+    assert resp.status == 401
+
+
 async def test_states_view_filters(hass, mock_api_client, hass_admin_user):
     """Test filtering only visible states."""
     hass_admin_user.mock_policy({"entities": {"entity_ids": {"test.entity": True}}})
@@ -167,3 +167,67 @@ async def test_if_not_fires_if_event_data_not_matches(hass, calls):
     hass.bus.async_fire("test_event", {"some_attr": "some_other_value"})
     await hass.async_block_till_done()
     assert 0 == len(calls)
+
+
+async def test_event_triggers_indexed(hass, calls):
+    """Test many triggers on one event type only fire when they match."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                {
+                    "alias": "button_{}".format(idx),
+                    "trigger": {
+                        "platform": "event",
+                        "event_type": "test_event",
+                        "event_data": {"device": "button_{}".format(idx), "press": 1},
+                    },
+                    "action": {"service": "test.automation", "data": {"button": idx}},
+                }
+                for idx in range(3)
+            ]
+            + [
+                {
+                    "alias": "complex",
+                    "trigger": {
+                        "platform": "event",
+                        "event_type": "test_event",
+                        "event_data": {"device": ["button_0", "button_2"]},
+                    },
+                    "action": {
+                        "service": "test.automation",
+                        "data": {"button": "complex"},
+                    },
+                }
+            ]
+        },
+    )
+
+    hass.bus.async_fire("test_event", {"device": "button_1", "press": 1})
+    await hass.async_block_till_done()
+    assert [call.data["button"] for call in calls] == [1]
+
+    hass.bus.async_fire("test_event", {"device": "button_2", "press": 2})
+    await hass.async_block_till_done()
+    assert [call.data["button"] for call in calls] == [1]
+
+    # Unhashable values don't match literals
+    hass.bus.async_fire("test_event", {"device": ["button_1"]})
+    await hass.async_block_till_done()
+    assert [call.data["button"] for call in calls] == [1]
+
+    # Keys missing from the event are not checked
+    hass.bus.async_fire("test_event", {"press": 1})
+    await hass.async_block_till_done()
+    assert sorted(str(call.data["button"]) for call in calls[1:]) == [
+        "0",
+        "1",
+        "2",
+        "complex",
+    ]
+
+    await common.async_turn_off(hass)
+    await hass.async_block_till_done()
+
+    assert "test_event" not in hass.bus.async_listeners()
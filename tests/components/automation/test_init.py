@@ -509,6 +509,52 @@ async def test_reload_config_service(hass, calls):
     assert calls[1].data.get("event") == "test_event2"
 
 
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test reload only sets up automations of which the config changed."""
+    hello = {
+        "alias": "hello",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"service": "test.automation"},
+    }
+    bye = {
+        "alias": "bye",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"service": "test.automation"},
+    }
+    assert await async_setup_component(
+        hass, automation.DOMAIN, {automation.DOMAIN: [hello, bye]}
+    )
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    hello_state = hass.states.get("automation.hello")
+    bye_state = hass.states.get("automation.bye")
+    assert hello_state.attributes.get("last_triggered") is not None
+
+    bye_changed = dict(bye, trigger={"platform": "event", "event_type": "test_event3"})
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: [hello, bye_changed]},
+    ):
+        with patch("homeassistant.config.find_config_file", return_value=""):
+            await common.async_reload(hass)
+            await hass.async_block_till_done()
+
+    # The unchanged automation did not write a new state
+    assert hass.states.get("automation.hello") is hello_state
+    assert hass.states.get("automation.bye") is not bye_state
+    listeners = hass.bus.async_listeners()
+    assert listeners.get("test_event") == 1
+    assert listeners.get("test_event2") is None
+    assert listeners.get("test_event3") == 1
+
+    hass.bus.async_fire("test_event3")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
 async def test_reload_config_when_invalid_config(hass, calls):
     """Test the reload config service handling invalid config."""
     with assert_setup_component(1, automation.DOMAIN):
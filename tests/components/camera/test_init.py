@@ -2,6 +2,7 @@
 import asyncio
 import base64
 import io
+import threading
 from unittest.mock import patch, mock_open, PropertyMock
 
 import pytest
@@ -382,3 +383,22 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_get_image_in_camera_executor(hass, mock_camera):
+    """Test images are fetched in the executor of the camera domain."""
+    hass.config.executor_pools = {"camera": 1}
+    threads = []
+
+    def camera_image(_camera):
+        """Record the thread the image is fetched in."""
+        threads.append(threading.current_thread().name)
+        return b"Test"
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.camera_image", camera_image
+    ):
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+
+    assert image.content == b"Test"
+    assert threads[0].startswith("SyncWorker_camera")
@@ -2,12 +2,8 @@
 from unittest import mock
 import unittest
 
-from homeassistant.const import (
-    EVENT_LOGBOOK_ENTRY,
-    EVENT_STATE_CHANGED,
-    STATE_OFF,
-    STATE_ON,
-)
+from homeassistant.const import EVENT_LOGBOOK_ENTRY, STATE_OFF, STATE_ON
+from homeassistant.helpers.state_exporter import StateRecord
 from homeassistant.setup import setup_component
 import homeassistant.components.datadog as datadog
 import homeassistant.core as ha
@@ -39,11 +35,21 @@ class TestDatadog(unittest.TestCase):
         self.hass.bus.listen = mock.MagicMock()
         mock_connection = mock_datadog.initialize
 
-        assert setup_component(
-            self.hass,
-            datadog.DOMAIN,
-            {datadog.DOMAIN: {"host": "host", "port": 123, "rate": 1, "prefix": "foo"}},
-        )
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(
+                self.hass,
+                datadog.DOMAIN,
+                {
+                    datadog.DOMAIN: {
+                        "host": "host",
+                        "port": 123,
+                        "rate": 1,
+                        "prefix": "foo",
+                    }
+                },
+            )
 
         assert mock_connection.call_count == 1
         assert mock_connection.call_args == mock.call(
@@ -52,7 +58,8 @@ class TestDatadog(unittest.TestCase):
 
         assert self.hass.bus.listen.called
         assert EVENT_LOGBOOK_ENTRY == self.hass.bus.listen.call_args_list[0][0][0]
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[1][0][0]
+        assert mock_subscribe.called
+        assert datadog.DOMAIN == mock_subscribe.call_args[0][1]
 
     @MockDependency("datadog")
     def test_datadog_setup_defaults(self, mock_datadog):
@@ -113,23 +120,25 @@ class TestDatadog(unittest.TestCase):
     @MockDependency("datadog")
     def test_state_changed(self, mock_datadog):
         """Test event listener."""
-        self.hass.bus.listen = mock.MagicMock()
         mock_client = mock_datadog.statsd
 
-        assert setup_component(
-            self.hass,
-            datadog.DOMAIN,
-            {
-                datadog.DOMAIN: {
-                    "host": "host",
-                    "prefix": "ha",
-                    "rate": datadog.DEFAULT_RATE,
-                }
-            },
-        )
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(
+                self.hass,
+                datadog.DOMAIN,
+                {
+                    datadog.DOMAIN: {
+                        "host": "host",
+                        "prefix": "ha",
+                        "rate": datadog.DEFAULT_RATE,
+                    }
+                },
+            )
 
-        assert self.hass.bus.listen.called
-        handler_method = self.hass.bus.listen.call_args_list[1][0][1]
+        assert mock_subscribe.called
+        handler_method = mock_subscribe.call_args[0][2]
 
         valid = {"1": 1, "1.0": 1.0, STATE_ON: 1, STATE_OFF: 0}
 
@@ -142,7 +151,9 @@ class TestDatadog(unittest.TestCase):
                 state=in_,
                 attributes=attributes,
             )
-            handler_method(mock.MagicMock(data={"new_state": state}))
+            handler_method(
+                [StateRecord.from_event(mock.MagicMock(data={"new_state": state}))]
+            )
 
             assert mock_client.gauge.call_count == 3
 
@@ -169,6 +180,6 @@ class TestDatadog(unittest.TestCase):
 
         for invalid in ("foo", "", object):
             handler_method(
-                mock.MagicMock(data={"new_state": ha.State("domain.test", invalid, {})})
+                [StateRecord.from_state(ha.State("domain.test", invalid, {}), None)]
             )
             assert not mock_client.gauge.called
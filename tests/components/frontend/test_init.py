@@ -13,6 +13,7 @@ from homeassistant.components.frontend import (
     CONF_EXTRA_HTML_URL,
     CONF_EXTRA_HTML_URL_ES5,
     EVENT_PANELS_UPDATED,
+    add_extra_html_url,
 )
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 
@@ -221,6 +222,37 @@ def test_extra_urls(mock_http_client_with_urls, mock_onboarded):
     assert text.find('href="https://domain.com/my_extra_url.html"') >= 0
 
 
+async def test_index_page_cache(hass, mock_http_client_with_themes, mock_onboarded):
+    """Test the index page is cached until the urls or the theme change."""
+    client = mock_http_client_with_themes
+
+    resp = await client.get("/states")
+    assert resp.status == 200
+    etag = resp.headers["ETag"]
+
+    resp = await client.get("/profile", headers={"If-None-Match": etag})
+    assert resp.status == 304
+    assert resp.headers["ETag"] == etag
+
+    add_extra_html_url(hass, "https://domain.com/my_new_url.html")
+
+    resp = await client.get("/states", headers={"If-None-Match": etag})
+    assert resp.status == 200
+    assert 'href="https://domain.com/my_new_url.html"' in await resp.text()
+    assert resp.headers["ETag"] != etag
+    etag = resp.headers["ETag"]
+
+    await hass.services.async_call(DOMAIN, "set_theme", {"name": "happy"})
+    await hass.async_block_till_done()
+
+    resp = await client.get("/states", headers={"If-None-Match": etag})
+    assert resp.status == 200
+    assert resp.headers["ETag"] != etag
+
+    await hass.services.async_call(DOMAIN, "set_theme", {"name": "default"})
+    await hass.async_block_till_done()
+
+
 async def test_get_panels(hass, hass_ws_client, mock_http_client):
     """Test get_panels command."""
     events = async_capture_events(hass, EVENT_PANELS_UPDATED)
@@ -7,13 +7,8 @@ from unittest.mock import patch
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
 import homeassistant.components.graphite as graphite
-from homeassistant.const import (
-    EVENT_STATE_CHANGED,
-    EVENT_HOMEASSISTANT_START,
-    EVENT_HOMEASSISTANT_STOP,
-    STATE_ON,
-    STATE_OFF,
-)
+from homeassistant.helpers.state_exporter import StateRecord
+from homeassistant.const import STATE_ON, STATE_OFF
 from tests.common import get_test_home_assistant
 
 
@@ -62,38 +57,21 @@ class TestGraphite(unittest.TestCase):
     def test_subscribe(self):
         """Test the subscription."""
         fake_hass = mock.MagicMock()
-        gf = graphite.GraphiteFeeder(fake_hass, "foo", 123, "ha")
-        fake_hass.bus.listen_once.has_calls(
-            [
-                mock.call(EVENT_HOMEASSISTANT_START, gf.start_listen),
-                mock.call(EVENT_HOMEASSISTANT_STOP, gf.shutdown),
-            ]
-        )
-        assert fake_hass.bus.listen.call_count == 1
-        assert fake_hass.bus.listen.call_args == mock.call(
-            EVENT_STATE_CHANGED, gf.event_listener
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            gf = graphite.GraphiteFeeder(fake_hass, "foo", 123, "ha")
+        assert mock_subscribe.call_count == 1
+        assert mock_subscribe.call_args == mock.call(
+            fake_hass, graphite.DOMAIN, gf.event_listener
         )
 
-    def test_start(self):
-        """Test the start."""
-        with mock.patch.object(self.gf, "start") as mock_start:
-            self.gf.start_listen("event")
-            assert mock_start.call_count == 1
-            assert mock_start.call_args == mock.call()
-
-    def test_shutdown(self):
-        """Test the shutdown."""
-        with mock.patch.object(self.gf, "_queue") as mock_queue:
-            self.gf.shutdown("event")
-            assert mock_queue.put.call_count == 1
-            assert mock_queue.put.call_args == mock.call(self.gf._quit_object)
-
     def test_event_listener(self):
-        """Test the event listener."""
-        with mock.patch.object(self.gf, "_queue") as mock_queue:
-            self.gf.event_listener("foo")
-            assert mock_queue.put.call_count == 1
-            assert mock_queue.put.call_args == mock.call("foo")
+        """Test the event listener reports the batch."""
+        with mock.patch.object(self.gf, "_report_attributes") as mock_report:
+            self.gf.event_listener(["foo"])
+            assert mock_report.call_count == 1
+            assert mock_report.call_args == mock.call(["foo"])
 
     @patch("time.time")
     def test_report_attributes(self, mock_time):
@@ -102,15 +80,15 @@ class TestGraphite(unittest.TestCase):
         attrs = {"foo": 1, "bar": 2.0, "baz": True, "bat": "NaN"}
 
         expected = [
-            "ha.entity.state 0.000000 12345",
-            "ha.entity.foo 1.000000 12345",
-            "ha.entity.bar 2.000000 12345",
-            "ha.entity.baz 1.000000 12345",
+            "ha.domain.entity.state 0.000000 12345",
+            "ha.domain.entity.foo 1.000000 12345",
+            "ha.domain.entity.bar 2.000000 12345",
+            "ha.domain.entity.baz 1.000000 12345",
         ]
 
-        state = mock.MagicMock(state=0, attributes=attrs)
+        state = ha.State("domain.entity", "0", attrs)
         with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
             actual = mock_send.call_args_list[0][0][0].split("\n")
             assert sorted(expected) == sorted(actual)
 
@@ -118,11 +96,14 @@ class TestGraphite(unittest.TestCase):
     def test_report_with_string_state(self, mock_time):
         """Test the reporting with strings."""
         mock_time.return_value = 12345
-        expected = ["ha.entity.foo 1.000000 12345", "ha.entity.state 1.000000 12345"]
+        expected = [
+            "ha.domain.entity.foo 1.000000 12345",
+            "ha.domain.entity.state 1.000000 12345",
+        ]
 
-        state = mock.MagicMock(state="above_horizon", attributes={"foo": 1.0})
+        state = ha.State("domain.entity", "above_horizon", {"foo": 1.0})
         with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
             actual = mock_send.call_args_list[0][0][0].split("\n")
             assert sorted(expected) == sorted(actual)
 
@@ -132,20 +113,20 @@ class TestGraphite(unittest.TestCase):
         mock_time.return_value = 12345
         state = ha.State("domain.entity", STATE_ON, {"foo": 1.0})
         with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
             expected = [
-                "ha.entity.foo 1.000000 12345",
-                "ha.entity.state 1.000000 12345",
+                "ha.domain.entity.foo 1.000000 12345",
+                "ha.domain.entity.state 1.000000 12345",
             ]
             actual = mock_send.call_args_list[0][0][0].split("\n")
             assert sorted(expected) == sorted(actual)
 
         state.state = STATE_OFF
         with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
             expected = [
-                "ha.entity.foo 1.000000 12345",
-                "ha.entity.state 0.000000 12345",
+                "ha.domain.entity.foo 1.000000 12345",
+                "ha.domain.entity.state 0.000000 12345",
             ]
             actual = mock_send.call_args_list[0][0][0].split("\n")
             assert sorted(expected) == sorted(actual)
@@ -157,9 +138,9 @@ class TestGraphite(unittest.TestCase):
         state = ha.State("domain.entity", STATE_ON, {"foo": 1.0})
         with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
             mock_send.side_effect = socket.error
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
             mock_send.side_effect = socket.gaierror
-            self.gf._report_attributes("entity", state)
+            self.gf._report_attributes([StateRecord.from_state(state, None)])
 
     @patch("socket.socket")
     def test_send_to_graphite(self, mock_socket):
@@ -177,40 +158,20 @@ class TestGraphite(unittest.TestCase):
         assert sock.close.call_count == 1
         assert sock.close.call_args == mock.call()
 
-    def test_run_stops(self):
-        """Test the stops."""
-        with mock.patch.object(self.gf, "_queue") as mock_queue:
-            mock_queue.get.return_value = self.gf._quit_object
-            assert self.gf.run() is None
-            assert mock_queue.get.call_count == 1
-            assert mock_queue.get.call_args == mock.call()
-            assert mock_queue.task_done.call_count == 1
-            assert mock_queue.task_done.call_args == mock.call()
-
-    def test_run(self):
-        """Test the running."""
-        runs = []
-        event = mock.MagicMock(
-            event_type=EVENT_STATE_CHANGED,
-            data={"entity_id": "entity", "new_state": mock.MagicMock()},
-        )
+    @patch("time.time")
+    def test_report_batch(self, mock_time):
+        """Test a batch of states is sent at once."""
+        mock_time.return_value = 12345
+        records = [
+            StateRecord.from_state(ha.State("domain.one", "1", {}), None),
+            StateRecord.from_state(ha.State("domain.two", "2", {}), None),
+        ]
 
-        def fake_get():
-            if len(runs) >= 2:
-                return self.gf._quit_object
-            if runs:
-                runs.append(1)
-                return mock.MagicMock(
-                    event_type="somethingelse", data={"new_event": None}
-                )
-            runs.append(1)
-            return event
-
-        with mock.patch.object(self.gf, "_queue") as mock_queue:
-            with mock.patch.object(self.gf, "_report_attributes") as mock_r:
-                mock_queue.get.side_effect = fake_get
-                self.gf.run()
-                # Twice for two events, once for the stop
-                assert 3 == mock_queue.task_done.call_count
-                assert mock_r.call_count == 1
-                assert mock_r.call_args == mock.call("entity", event.data["new_state"])
+        with mock.patch.object(self.gf, "_send_to_graphite") as mock_send:
+            self.gf._report_attributes(records)
+
+        assert mock_send.call_count == 1
+        assert mock_send.call_args[0][0].split("\n") == [
+            "ha.domain.one.state 1.000000 12345",
+            "ha.domain.two.state 2.000000 12345",
+        ]
@@ -630,6 +630,30 @@ async def test_fetch_period_api(hass, hass_client):
     assert response.status == 200
 
 
+async def test_fetch_period_api_states(hass, hass_client):
+    """Test the fetch period view returns the recorded states."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("sensor.hidden", "on", {"hidden": True})
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"filter_entity_id": "light.kitchen,sensor.hidden"},
+    )
+    assert response.status == 200
+    result = await response.json()
+
+    assert len(result) == 1
+    assert result[0][0]["entity_id"] == "light.kitchen"
+    assert result[0][0]["state"] == "on"
+    assert result[0][0]["attributes"] == {"brightness": 100}
+    assert result[0][0]["context"]["id"] is not None
+
+
 async def test_fetch_period_api_with_include_order(hass, hass_client):
     """Test the fetch period view for history."""
     await hass.async_add_job(init_recorder_component, hass)
@@ -0,0 +1,69 @@
+"""Test the HTTP request metrics."""
+from aiohttp import web
+
+from homeassistant.components.http.const import KEY_HTTP_METRICS
+from homeassistant.components.http.metrics import (
+    ROUTE_UNMATCHED,
+    metrics_lines,
+    setup_metrics,
+)
+
+
+async def mock_handler(request):
+    """Return a response."""
+    return web.Response(text="hello")
+
+
+async def mock_unauthorized_handler(request):
+    """Raise an unauthorized error."""
+    raise web.HTTPUnauthorized
+
+
+async def test_metrics(aiohttp_client):
+    """Test requests are recorded per route."""
+    app = web.Application()
+    app.router.add_get("/api/states/{entity_id}", mock_handler)
+    app.router.add_get("/unauthorized", mock_unauthorized_handler)
+    metrics = setup_metrics(app)
+    assert app[KEY_HTTP_METRICS] is metrics
+
+    client = await aiohttp_client(app)
+
+    for entity_id in ("light.kitchen", "light.bedroom"):
+        resp = await client.get(f"/api/states/{entity_id}")
+        assert resp.status == 200
+
+    resp = await client.get("/unauthorized")
+    assert resp.status == 401
+
+    resp = await client.get("/missing")
+    assert resp.status == 404
+
+    data = metrics.as_dict()
+    assert data["in_flight"] == 0
+    assert data["max_in_flight"] == 1
+
+    routes = data["routes"]
+    assert set(routes) == {"/api/states/{entity_id}", "/unauthorized", ROUTE_UNMATCHED}
+
+    states = routes["/api/states/{entity_id}"]
+    assert states["requests"] == 2
+    assert states["statuses"] == {200: 2}
+    assert sum(states["latency_buckets"].values()) == 2
+    assert states["response_bytes"] == 10
+    assert 0 < states["handler_sum"] <= states["latency_sum"]
+
+    assert routes["/unauthorized"]["statuses"] == {401: 1}
+    assert routes[ROUTE_UNMATCHED]["statuses"] == {404: 1}
+
+    lines = metrics_lines(metrics, "hass_")
+    assert "hass_http_requests_in_flight 0" in lines
+    assert (
+        'hass_http_requests_total{route="/api/states/{entity_id}",status="200"} 2'
+        in lines
+    )
+    assert (
+        'hass_http_request_duration_seconds_bucket{route="/unauthorized",le="+Inf"} 1'
+        in lines
+    )
+    assert 'hass_http_response_bytes_total{route="/api/states/{entity_id}"} 10' in lines
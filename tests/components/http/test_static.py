@@ -0,0 +1,131 @@
+"""The tests for http static files."""
+import gzip
+import mimetypes
+from unittest.mock import patch
+
+from aiohttp import web
+import pytest
+
+from homeassistant.components.http import static
+from homeassistant.components.http.static import CachingStaticResource
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Return a directory with static files."""
+    (tmp_path / "app.js").write_text("console.log('hello');")
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"console.log('hello');"))
+    (tmp_path / "large.bin").write_bytes(b"x" * (static.MAX_CACHED_FILE_SIZE + 1))
+    return tmp_path
+
+
+@pytest.fixture
+def mock_client(aiohttp_client, static_dir):
+    """Return a client of an app serving the static directory."""
+    app = web.Application()
+    app.router.register_resource(CachingStaticResource("/static", str(static_dir)))
+    return aiohttp_client(app)
+
+
+async def test_serve_cached_and_compressed(mock_client, static_dir):
+    """Test files are served from memory, precompressed when accepted."""
+    client = await mock_client
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Content-Type"] == mimetypes.guess_type("app.js")[0]
+    assert "public" in resp.headers["Cache-Control"]
+    assert await resp.text() == "console.log('hello');"
+    gzip_etag = resp.headers["ETag"]
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+    assert resp.headers["ETag"] != gzip_etag
+
+    # Removing the file is not noticed until the cache is checked again
+    (static_dir / "app.js").unlink()
+
+    resp = await client.get(
+        "/static/app.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+    )
+    assert resp.status == 304
+    assert resp.headers["ETag"] == gzip_etag
+
+    with patch.object(static, "CACHE_CHECK_INTERVAL", -1):
+        resp = await client.get("/static/app.js")
+    assert resp.status == 404
+
+
+async def test_file_changes(mock_client, static_dir):
+    """Test changed files are loaded again."""
+    client = await mock_client
+
+    resp = await client.get("/static/app.js")
+    etag = resp.headers["ETag"]
+
+    (static_dir / "app.js").write_text("console.log('changed');")
+    (static_dir / "app.js.gz").unlink()
+
+    with patch.object(static, "CACHE_CHECK_INTERVAL", -1):
+        resp = await client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+    assert resp.status == 200
+    assert resp.headers["ETag"] != etag
+    assert await resp.text() == "console.log('changed');"
+
+
+async def test_large_and_missing_files(mock_client):
+    """Test large files are streamed and missing files are not found."""
+    client = await mock_client
+
+    resp = await client.get("/static/large.bin")
+    assert resp.status == 200
+    assert "ETag" in resp.headers
+    assert len(await resp.read()) == static.MAX_CACHED_FILE_SIZE + 1
+
+    resp = await client.get("/static/missing.js")
+    assert resp.status == 404
+
+    resp = await client.get("/static/../test_static.py")
+    assert resp.status == 404
+
+
+async def test_accept_encoding_quality(mock_client):
+    """Test encodings refused with a zero quality are not served."""
+    client = await mock_client
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "*;q=0.5"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "*, gzip;q=0"}
+    )
+    assert "Content-Encoding" not in resp.headers
+
+
+async def test_cache_limit(mock_client, static_dir):
+    """Test least recently used files are dropped beyond the cache size."""
+    client = await mock_client
+    for name in ("one.txt", "two.txt", "three.txt"):
+        (static_dir / name).write_text("x" * 10)
+
+    with patch.object(static, "MAX_CACHE_SIZE", 25):
+        for name in ("one.txt", "two.txt", "one.txt", "three.txt"):
+            resp = await client.get("/static/" + name)
+            assert resp.status == 200
+
+    # two.txt was dropped, so its removal is noticed right away
+    (static_dir / "one.txt").unlink()
+    (static_dir / "two.txt").unlink()
+    assert (await client.get("/static/one.txt")).status == 200
+    assert (await client.get("/static/two.txt")).status == 404
@@ -1,5 +1,5 @@
 """Tests for Home Assistant View."""
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from aiohttp.web_exceptions import (
     HTTPInternalServerError,
@@ -34,6 +34,20 @@ async def test_invalid_json(caplog):
     assert str(float("NaN")) in caplog.text
 
 
+async def test_json_orjson():
+    """Test responses are encoded with orjson when it is installed."""
+    orjson = Mock(OPT_NON_STR_KEYS=1, OPT_SORT_KEYS=2)
+    orjson.dumps.return_value = b'"orjson"'
+
+    with patch("homeassistant.util.json.orjson", orjson, create=True), patch(
+        "homeassistant.util.json.HAS_ORJSON", True
+    ):
+        response = HomeAssistantView().json({"value": float("NaN")})
+
+    assert response.body == b'"orjson"'
+    assert orjson.dumps.call_args[1]["option"] == 1 | 2
+
+
 async def test_handling_unauthorized(mock_request):
     """Test handling unauth exceptions."""
     with pytest.raises(HTTPUnauthorized):
@@ -3,16 +3,27 @@ import datetime
 import unittest
 from unittest import mock
 
+from influxdb.line_protocol import make_lines
+
 from homeassistant.setup import setup_component
 import homeassistant.components.influxdb as influxdb
-from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON, STATE_STANDBY
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_STANDBY
+from homeassistant.helpers.state_exporter import StateRecord
 
 from tests.common import get_test_home_assistant
 
 
+def write_call(body):
+    """Return the call that writes points as line protocol."""
+    return mock.call(
+        [make_lines({"points": [point]}).rstrip("\n") for point in body],
+        protocol="line",
+    )
+
+
 @mock.patch("influxdb.InfluxDBClient")
 @mock.patch(
-    "homeassistant.components.influxdb.InfluxThread.batch_timeout",
+    "homeassistant.components.influxdb.writer.InfluxWriter.batch_timeout",
     mock.Mock(return_value=0),
 )
 class TestInfluxDB(unittest.TestCase):
@@ -22,12 +33,24 @@ class TestInfluxDB(unittest.TestCase):
         """Set up things to be run when tests are started."""
         self.hass = get_test_home_assistant()
         self.handler_method = None
-        self.hass.bus.listen = mock.Mock()
+        self.entity_filter = None
+        self.subscribe_patcher = mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        )
+        self.mock_subscribe = self.subscribe_patcher.start()
 
     def tearDown(self):
         """Clear data."""
+        self.subscribe_patcher.stop()
         self.hass.stop()
 
+    def _handle(self, event):
+        """Hand a state change to the handler like the state exporter does."""
+        record = StateRecord.from_event(event)
+
+        if self.entity_filter(record.entity_id):
+            self.handler_method([record])
+
     def test_setup_config_full(self, mock_client):
         """Test the setup with full configuration."""
         config = {
@@ -43,16 +66,20 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        assert self.mock_subscribe.called
+        assert influxdb.DOMAIN == self.mock_subscribe.call_args[0][1]
+        assert (
+            self.mock_subscribe.call_args[1]["stats"]
+            == self.hass.data[influxdb.DOMAIN].as_dict
+        )
         assert mock_client.return_value.write_points.call_count == 1
 
     def test_setup_config_defaults(self, mock_client):
         """Test the setup with default configuration."""
         config = {"influxdb": {"host": "host", "username": "user", "password": "pass"}}
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        assert self.mock_subscribe.called
+        assert influxdb.DOMAIN == self.mock_subscribe.call_args[0][1]
 
     def test_setup_minimal_config(self, mock_client):
         """Test the setup with minimal configuration."""
@@ -81,7 +108,7 @@ class TestInfluxDB(unittest.TestCase):
         }
         config["influxdb"].update(kwargs)
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener(self, mock_client):
@@ -90,10 +117,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            "1": [None, 1],
+            "1": [None, 1.0],
             "1.0": [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             "foo": ["foo", None],
         }
@@ -131,7 +158,7 @@ class TestInfluxDB(unittest.TestCase):
                         "last_seen_str": "Last seen 23 minutes ago",
                         "last_seen": 23.0,
                         "updated_at_str": "2017-01-01 00:00:00",
-                        "updated_at": 20170101000000,
+                        "updated_at": 20170101000000.0,
                         "multi_periods_str": "0.120.240.2023873",
                     },
                 }
@@ -141,11 +168,11 @@ class TestInfluxDB(unittest.TestCase):
             if out[1] is not None:
                 body[0]["fields"]["value"] = out[1]
 
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
 
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_no_units(self, mock_client):
@@ -170,13 +197,13 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.entity-id",
                     "tags": {"domain": "fake", "entity_id": "entity"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_inf(self, mock_client):
@@ -197,13 +224,13 @@ class TestInfluxDB(unittest.TestCase):
                 "measurement": "fake.entity-id",
                 "tags": {"domain": "fake", "entity_id": "entity"},
                 "time": 12345,
-                "fields": {"value": 8},
+                "fields": {"value": 8.0},
             }
         ]
-        self.handler_method(event)
+        self._handle(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_states(self, mock_client):
@@ -224,14 +251,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.entity-id",
                     "tags": {"domain": "fake", "entity_id": "entity"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if state_state == 1:
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -256,14 +283,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.{}".format(entity_id),
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -288,14 +315,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "{}.something".format(domain),
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -313,7 +340,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         for entity_id in ("included", "default"):
@@ -330,14 +357,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "fake.{}".format(entity_id),
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "included":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -355,7 +382,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         for domain in ("fake", "another_fake"):
@@ -372,14 +399,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "{}.something".format(domain),
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -397,7 +424,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         for domain in ("fake", "another_fake"):
@@ -414,14 +441,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "{}.something".format(domain),
                     "tags": {"domain": domain, "entity_id": "something"},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -442,14 +469,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "other.{}".format(entity_id),
                     "tags": {"domain": "other", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "one":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -462,10 +489,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            "1": [None, 1],
+            "1": [None, 1.0],
             "1.0": [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             "foo": ["foo", None],
         }
@@ -501,10 +528,10 @@ class TestInfluxDB(unittest.TestCase):
             if out[1] is not None:
                 body[0]["fields"]["value"] = out[1]
 
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_default_measurement(self, mock_client):
@@ -519,7 +546,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         for entity_id in ("ok", "blacklisted"):
@@ -536,14 +563,14 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": "state",
                     "tags": {"domain": "fake", "entity_id": entity_id},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
-                assert mock_client.return_value.write_points.call_args == mock.call(
+                assert mock_client.return_value.write_points.call_args == write_call(
                     body
                 )
             else:
@@ -561,7 +588,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         attrs = {"unit_of_measurement": "foobars"}
@@ -581,10 +608,10 @@ class TestInfluxDB(unittest.TestCase):
                 "fields": {"state": "foo", "unit_of_measurement_str": "foobars"},
             }
         ]
-        self.handler_method(event)
+        self._handle(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_tags_attributes(self, mock_client):
@@ -598,7 +625,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         attrs = {"friendly_fake": "tag_str", "field_fake": "field_str"}
@@ -619,13 +646,13 @@ class TestInfluxDB(unittest.TestCase):
                     "friendly_fake": "tag_str",
                 },
                 "time": 12345,
-                "fields": {"value": 1, "field_fake_str": "field_str"},
+                "fields": {"value": 1.0, "field_fake_str": "field_str"},
             }
         ]
-        self.handler_method(event)
+        self._handle(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == write_call(body)
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_component_override_measurement(self, mock_client):
@@ -647,7 +674,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         test_components = [
@@ -670,13 +697,13 @@ class TestInfluxDB(unittest.TestCase):
                     "measurement": comp["res"],
                     "tags": {"domain": comp["domain"], "entity_id": comp["id"]},
                     "time": 12345,
-                    "fields": {"value": 1},
+                    "fields": {"value": 1.0},
                 }
             ]
-            self.handler_method(event)
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == write_call(body)
             mock_client.return_value.write_points.reset_mock()
 
     def test_scheduled_write(self, mock_client):
@@ -690,7 +717,7 @@ class TestInfluxDB(unittest.TestCase):
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.handler_method, self.entity_filter = self.mock_subscribe.call_args[0][2:]
         mock_client.return_value.write_points.reset_mock()
 
         state = mock.MagicMock(
@@ -703,50 +730,26 @@ class TestInfluxDB(unittest.TestCase):
         event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
         mock_client.return_value.write_points.side_effect = IOError("foo")
 
-        # Write fails
-        with mock.patch.object(influxdb.time, "sleep") as mock_sleep:
-            self.handler_method(event)
+        # Write fails, is retried once and dropped
+        with mock.patch("homeassistant.components.influxdb.writer.RETRY_DELAY", 0):
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
-            assert mock_sleep.called
-        json_data = mock_client.return_value.write_points.call_args[0][0]
+        lines = mock_client.return_value.write_points.call_args[0][0]
         assert mock_client.return_value.write_points.call_count == 2
-        mock_client.return_value.write_points.assert_called_with(json_data)
+        mock_client.return_value.write_points.assert_called_with(lines, protocol="line")
+        assert self.hass.data[influxdb.DOMAIN].dropped == 1
 
         # Write works again
         mock_client.return_value.write_points.side_effect = None
-        with mock.patch.object(influxdb.time, "sleep") as mock_sleep:
-            self.handler_method(event)
+        with mock.patch("homeassistant.components.influxdb.writer.RETRY_DELAY", 0):
+            self._handle(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
-            assert not mock_sleep.called
         assert mock_client.return_value.write_points.call_count == 3
+        assert self.hass.data[influxdb.DOMAIN].written == 1
 
-    def test_queue_backlog_full(self, mock_client):
-        """Test the event listener to drop old events."""
-        self._setup(mock_client)
+    def test_setup_journal(self, mock_client):
+        """Test the journal is kept in the config directory."""
+        self._setup(mock_client, journal=True)
 
-        state = mock.MagicMock(
-            state=1,
-            domain="fake",
-            entity_id="entity.id",
-            object_id="entity",
-            attributes={},
-        )
-        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
-
-        monotonic_time = 0
-
-        def fast_monotonic():
-            """Monotonic time that ticks fast enough to cause a timeout."""
-            nonlocal monotonic_time
-            monotonic_time += 60
-            return monotonic_time
-
-        with mock.patch(
-            "homeassistant.components.influxdb.time.monotonic", new=fast_monotonic
-        ):
-            self.handler_method(event)
-            self.hass.data[influxdb.DOMAIN].block_till_done()
-
-            assert mock_client.return_value.write_points.call_count == 0
-
-        mock_client.return_value.write_points.reset_mock()
+        journal = self.hass.data[influxdb.DOMAIN].journal
+        assert journal.path == self.hass.config.path(influxdb.JOURNAL_FILE)
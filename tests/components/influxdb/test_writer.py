@@ -0,0 +1,233 @@
+"""The tests for the InfluxDB writer, against a stub InfluxDB server."""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import os
+import threading
+from unittest import mock
+
+from influxdb import InfluxDBClient
+import pytest
+
+from homeassistant.components.influxdb.writer import InfluxWriter, Journal
+
+
+class StubInflux(HTTPServer):
+    """HTTP server that answers writes like InfluxDB."""
+
+    def __init__(self):
+        """Initialize the server on a free port."""
+        super().__init__(("127.0.0.1", 0), StubInfluxHandler)
+        self.status = 204
+        self.writes = []
+
+    @property
+    def lines(self):
+        """Return all lines written."""
+        return [line for write in self.writes for line in write]
+
+
+class StubInfluxHandler(BaseHTTPRequestHandler):
+    """Answer a write request."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Store the lines of a write."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if self.server.status == 204:
+            self.server.writes.append(body.decode("utf-8").splitlines())
+
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log requests."""
+
+
+@pytest.fixture
+def server():
+    """Return a running stub server."""
+    stub = StubInflux()
+    thread = threading.Thread(target=stub.serve_forever, args=(0.01,))
+    thread.start()
+    yield stub
+    stub.shutdown()
+    thread.join()
+    stub.server_close()
+
+
+@pytest.fixture
+def client(server):
+    """Return a client of the stub server."""
+    influx = InfluxDBClient("127.0.0.1", server.server_address[1], database="ha")
+    yield influx
+    influx.close()
+
+
+def event_to_json(value):
+    """Return the point of a test record."""
+    return {"measurement": "test", "tags": {}, "time": value, "fields": {"x": value}}
+
+
+def line(value):
+    """Return the line of a test record."""
+    return "test x={}i {}".format(value, value)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+    """Retry right away."""
+    with mock.patch("homeassistant.components.influxdb.writer.RETRY_DELAY", 0):
+        yield
+
+
+def test_size_and_time_batches(client, server):
+    """Test full batches are written right away and partial ones after a wait."""
+    writer = InfluxWriter(client, event_to_json, 0, batch_size=3)
+    writer.event_listener(range(7))
+
+    with mock.patch.object(writer, "batch_timeout", return_value=60):
+        for _ in range(3):
+            writer._process(0)
+
+        assert len(server.writes) == 2
+        assert writer.as_dict()["buffered"] == 1
+
+        # The partial batch is written on shutdown
+        writer.queue.put(None)
+        writer.run()
+
+    assert server.writes == [
+        [line(0), line(1), line(2)],
+        [line(3), line(4), line(5)],
+        [line(6)],
+    ]
+    assert writer.written == 7
+    assert writer.batches == 3
+
+
+def test_partial_batch_timeout(client, server):
+    """Test a partial batch is written once it waited batch_timeout."""
+    writer = InfluxWriter(client, event_to_json, 0)
+
+    with mock.patch.object(writer, "batch_timeout", return_value=0.01):
+        writer.start()
+        writer.event_listener([1, 2])
+        writer.block_till_done()
+
+    assert server.writes == [[line(1), line(2)]]
+    assert writer.lag > 0
+
+    writer.queue.put(None)
+    writer.join()
+
+
+def test_retry_until_database_back(client, server):
+    """Test failed batches are kept and retried, while new points come in."""
+    server.status = 500
+    writer = InfluxWriter(client, event_to_json, 10, batch_size=2)
+    writer.event_listener([1, 2, 3])
+    writer._process(0)
+    writer._process(0)
+
+    assert server.writes == []
+    assert writer.write_errors == 2
+
+    server.status = 204
+    writer.event_listener([4])
+    for _ in range(3):
+        writer._process(0)
+
+    assert server.lines == [line(1), line(2), line(3), line(4)]
+    assert writer.as_dict()["dropped"] == 0
+
+
+def test_bounded_buffer_drops_oldest(client, server):
+    """Test the oldest batch is dropped when the buffer is full."""
+    server.status = 500
+    writer = InfluxWriter(client, event_to_json, 10, batch_size=2, max_buffer=4)
+
+    for value in range(6):
+        writer.event_listener([value])
+        writer._process(0)
+
+    assert writer.as_dict()["buffered"] == 4
+    assert writer.dropped == 2
+
+    server.status = 204
+    for _ in range(2):
+        writer._process(0)
+
+    assert server.lines == [line(2), line(3), line(4), line(5)]
+
+
+def test_full_queue_drops(client):
+    """Test states are dropped when the writer does not keep up."""
+    writer = InfluxWriter(client, event_to_json, 0, max_buffer=2)
+    writer.event_listener([1, 2, 3])
+
+    assert writer.as_dict()["queued"] == 2
+    assert writer.as_dict()["dropped"] == 1
+
+
+def test_rejected_batch_dropped(client, server):
+    """Test batches the database rejects are not retried."""
+    server.status = 400
+    writer = InfluxWriter(client, event_to_json, 10, batch_size=2)
+    writer.event_listener([1, 2])
+    writer._process(0)
+
+    assert writer.dropped == 2
+    assert writer.as_dict()["buffered"] == 0
+    assert writer.write_errors == 0
+
+
+def test_spill_and_replay(client, server, tmpdir):
+    """Test batches are spilled to the journal and replayed once back."""
+    path = str(tmpdir.join("journal"))
+    server.status = 500
+    writer = InfluxWriter(client, event_to_json, 0, Journal(path), batch_size=2)
+    writer.event_listener([1, 2, 3])
+    writer._process(0)
+    writer._process(0)
+
+    assert writer.spilled == 3
+    assert writer.as_dict()["buffered"] == 0
+    assert writer.as_dict()["journal_backlog"] == os.path.getsize(path)
+
+    server.status = 204
+    writer.event_listener([4])
+    for _ in range(3):
+        writer._process(0)
+
+    assert sorted(server.lines) == [line(1), line(2), line(3), line(4)]
+    assert writer.replayed == 3
+    assert not os.path.exists(path)
+
+
+def test_spill_on_shutdown(client, server, tmpdir):
+    """Test points that can not be written on shutdown are spilled."""
+    path = str(tmpdir.join("journal"))
+    server.status = 500
+    writer = InfluxWriter(client, event_to_json, 10, Journal(path))
+    writer.start()
+    writer.event_listener([1, 2])
+    writer.queue.put(None)
+    writer.join()
+
+    assert writer.spilled == 2
+
+    # Replayed by the next writer
+    server.status = 204
+    writer = InfluxWriter(client, event_to_json, 0, Journal(path))
+    writer._process(0)
+
+    assert server.lines == [line(1), line(2)]
+
+
+def test_journal_full(tmpdir):
+    """Test lines are not appended beyond the size of the journal."""
+    journal = Journal(str(tmpdir.join("journal")), max_size=10)
+
+    assert journal.append(["a" * 4])
+    assert not journal.append(["a" * 5])
+    assert journal.read(10) == (["aaaa"], 5)
@@ -3,6 +3,7 @@
 import logging
 from datetime import timedelta, datetime
 import unittest
+from unittest.mock import patch
 
 import pytest
 import voluptuous as vol
@@ -1336,6 +1337,117 @@ async def test_logbook_view_period_entity(hass, hass_client):
     assert json[0]["entity_id"] == entity_id_test
 
 
+async def test_logbook_page_view(hass, hass_client):
+    """Test the pages of the logbook add up to the whole logbook."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start -= timedelta(days=1)
+
+    # Three events in the first window, two in the second and one in the third,
+    # the entity is added before the period
+    for index, minutes in enumerate((-1, 1, 2, 3, 20, 21, 40)):
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=start + timedelta(minutes=minutes),
+        ):
+            hass.states.async_set("switch.test", STATE_ON if index % 2 else STATE_OFF)
+
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    end = (start + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    response = await client.get("/api/logbook/{}".format(start.isoformat()))
+    assert response.status == 200
+    expected = await response.json()
+    assert len(expected) == 6
+
+    entries = []
+    page_start = start.isoformat()
+    sizes = []
+
+    while page_start is not None:
+        response = await client.get(
+            "/api/logbook/page/{}?end_time={}&limit=2".format(page_start, end)
+        )
+        assert response.status == 200
+        page = await response.json()
+        entries.extend(page["entries"])
+        sizes.append(len(page["entries"]))
+        page_start = page["next"]
+
+    # The first window is returned whole, pages end at window starts
+    assert sizes == [3, 2, 1]
+    assert entries == expected
+
+    response = await client.get(
+        "/api/logbook/page/{}?limit=0".format(start.isoformat())
+    )
+    assert response.status == 400
+
+
+async def test_filter_clause(hass):
+    """Test the filter in SQL passes the same states as generate_filter."""
+    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.util import session_scope
+
+    await hass.async_add_job(init_recorder_component, hass)
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    entity_ids = [
+        "light.kitchen",
+        "light.hall",
+        "switch.kitchen",
+        "switch.hall",
+        "sensor.hall",
+    ]
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, STATE_ON)
+
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    configs = [
+        {},
+        {"include": {"domains": ["light"], "entities": ["switch.hall"]}},
+        {"exclude": {"domains": ["light"], "entities": ["switch.hall"]}},
+        {"include": {"domains": ["light"]}, "exclude": {"entities": ["light.hall"]}},
+        {
+            "include": {"entities": ["light.hall"]},
+            "exclude": {"domains": ["light", "sensor"]},
+        },
+        {
+            "include": {"entities": ["light.hall"]},
+            "exclude": {"entities": ["switch.hall"]},
+        },
+    ]
+
+    def filtered(config):
+        """Return the entities passing the clause and the filter."""
+        config = logbook.CONFIG_SCHEMA({logbook.DOMAIN: config})[logbook.DOMAIN]
+        clause = logbook._generate_filter_clause_from_config(config)
+        entities_filter = logbook._generate_filter_from_config(config)
+
+        with session_scope(hass=hass) as session:
+            query = session.query(States.entity_id)
+
+            if clause is not None:
+                query = query.filter(clause)
+
+            passed = sorted(row.entity_id for row in query)
+
+        return passed, sorted(filter(entities_filter, entity_ids))
+
+    for config in configs:
+        passed, expected = await hass.async_add_job(filtered, config)
+        assert passed == expected, config
+
+
 async def test_humanify_alexa_event(hass):
     """Test humanifying Alexa event."""
     hass.states.async_set("light.kitchen", "on", {"friendly_name": "Kitchen Light"})
@@ -5,7 +5,8 @@ from unittest import mock
 
 from homeassistant.setup import setup_component
 import homeassistant.components.logentries as logentries
-from homeassistant.const import STATE_ON, STATE_OFF, EVENT_STATE_CHANGED
+from homeassistant.const import STATE_ON, STATE_OFF
+from homeassistant.helpers.state_exporter import StateRecord
 
 from tests.common import get_test_home_assistant
 
@@ -24,18 +25,22 @@ class TestLogentries(unittest.TestCase):
     def test_setup_config_full(self):
         """Test setup with all data."""
         config = {"logentries": {"token": "secret"}}
-        self.hass.bus.listen = mock.MagicMock()
-        assert setup_component(self.hass, logentries.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(self.hass, logentries.DOMAIN, config)
+        assert mock_subscribe.called
+        assert logentries.DOMAIN == mock_subscribe.call_args[0][1]
 
     def test_setup_config_defaults(self):
         """Test setup with defaults."""
         config = {"logentries": {"token": "token"}}
-        self.hass.bus.listen = mock.MagicMock()
-        assert setup_component(self.hass, logentries.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(self.hass, logentries.DOMAIN, config)
+        assert mock_subscribe.called
+        assert logentries.DOMAIN == mock_subscribe.call_args[0][1]
 
     def _setup(self, mock_requests):
         """Test the setup."""
@@ -43,9 +48,11 @@ class TestLogentries(unittest.TestCase):
         self.mock_request_exception = Exception
         mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {"logentries": {"token": "token"}}
-        self.hass.bus.listen = mock.MagicMock()
-        setup_component(self.hass, logentries.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            setup_component(self.hass, logentries.DOMAIN, config)
+        self.handler_method = mock_subscribe.call_args[0][2]
 
     @mock.patch.object(logentries, "requests")
     @mock.patch("json.dumps")
@@ -73,7 +80,7 @@ class TestLogentries(unittest.TestCase):
                 "host": "https://webhook.logentries.com/noformat/" "logs/token",
                 "event": body,
             }
-            self.handler_method(event)
+            self.handler_method([StateRecord.from_event(event)])
             assert self.mock_post.call_count == 1
             assert self.mock_post.call_args == mock.call(
                 payload["host"], data=payload, timeout=10
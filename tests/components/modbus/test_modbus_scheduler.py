@@ -0,0 +1,261 @@
+"""The tests for the Modbus block read scheduler."""
+from unittest import mock
+
+from pymodbus.bit_read_message import ReadCoilsRequest
+from pymodbus.datastore import (
+    ModbusSequentialDataBlock,
+    ModbusSlaveContext,
+    ModbusSparseDataBlock,
+)
+from pymodbus.register_read_message import (
+    ReadHoldingRegistersRequest,
+    ReadInputRegistersRequest,
+)
+from pymodbus.register_write_message import WriteSingleRegisterRequest
+
+from homeassistant.components.modbus import ModbusHub
+from homeassistant.components.modbus.scheduler import (
+    KIND_COILS,
+    KIND_HOLDING,
+    KIND_INPUT,
+    MAX_READ_REGISTERS,
+    plan_blocks,
+)
+
+
+class SimulatorClient:
+    """Client that runs requests against pymodbus slave contexts."""
+
+    def __init__(self, slaves):
+        """Initialize the client."""
+        self.slaves = slaves
+        self.requests = []
+
+    def _execute(self, request, unit):
+        """Execute a request on a slave like a pymodbus server does."""
+        self.requests.append(
+            (
+                type(request).__name__,
+                unit,
+                request.address,
+                getattr(request, "count", 1),
+            )
+        )
+        return request.execute(self.slaves[unit])
+
+    def read_coils(self, address, count, unit=0):
+        """Read coils."""
+        return self._execute(ReadCoilsRequest(address, count), unit)
+
+    def read_holding_registers(self, address, count, unit=0):
+        """Read holding registers."""
+        return self._execute(ReadHoldingRegistersRequest(address, count), unit)
+
+    def read_input_registers(self, address, count, unit=0):
+        """Read input registers."""
+        return self._execute(ReadInputRegistersRequest(address, count), unit)
+
+    def write_register(self, address, value, unit=0):
+        """Write a holding register."""
+        return self._execute(WriteSingleRegisterRequest(address, value), unit)
+
+
+def slave(holding=None, inputs=None, coils=None):
+    """Return the context of a simulated slave."""
+    return ModbusSlaveContext(
+        hr=holding or ModbusSequentialDataBlock(0, list(range(1000))),
+        ir=inputs or ModbusSequentialDataBlock(0, [value * 2 for value in range(1000)]),
+        co=coils
+        or ModbusSequentialDataBlock(0, [value % 3 == 0 for value in range(1000)]),
+        di=ModbusSequentialDataBlock(0, [False] * 1000),
+        zero_mode=True,
+    )
+
+
+def test_plan_blocks():
+    """Test merging ranges into blocks."""
+    assert plan_blocks([(10, 1), (11, 2), (20, 1)], MAX_READ_REGISTERS, 0) == [
+        ((10, 3), [(10, 1), (11, 2)]),
+        ((20, 1), [(20, 1)]),
+    ]
+    assert plan_blocks([(10, 1), (11, 2), (20, 1)], MAX_READ_REGISTERS, 7) == [
+        ((10, 11), [(10, 1), (11, 2), (20, 1)])
+    ]
+    # Overlapping ranges
+    assert plan_blocks([(10, 4), (11, 1)], MAX_READ_REGISTERS, 0) == [
+        ((10, 4), [(10, 4), (11, 1)])
+    ]
+
+
+def test_plan_blocks_protocol_limit():
+    """Test blocks stay within the most addresses of a request."""
+    ranges = [(address, 1) for address in range(300)]
+
+    assert [block for block, _ in plan_blocks(ranges, MAX_READ_REGISTERS, 0)] == [
+        (0, 125),
+        (125, 125),
+        (250, 50),
+    ]
+
+
+def test_plan_blocks_isolated():
+    """Test isolated ranges are only merged with ranges they overlap."""
+    ranges = [(10, 1), (11, 1), (12, 2), (13, 1), (14, 1)]
+
+    assert plan_blocks(ranges, MAX_READ_REGISTERS, 0, {(12, 2)}) == [
+        ((10, 2), [(10, 1), (11, 1)]),
+        ((12, 2), [(12, 2), (13, 1)]),
+        ((14, 1), [(14, 1)]),
+    ]
+
+
+def test_block_reads():
+    """Test reads of a poll round are served from one block read."""
+    client = SimulatorClient({1: slave(), 2: slave()})
+    hub = ModbusHub(client, "hub", True, 2)
+
+    for address in (100, 101, 104):
+        hub.add_read(1, KIND_HOLDING, address, 1)
+    hub.add_read(1, KIND_HOLDING, 102, 2)
+    hub.add_read(1, KIND_INPUT, 100, 1)
+    hub.add_read(2, KIND_HOLDING, 100, 1)
+
+    for _ in range(2):
+        client.requests.clear()
+
+        assert hub.read_holding_registers(1, 100, 1).registers == [100]
+        assert hub.read_holding_registers(1, 101, 1).registers == [101]
+        assert hub.read_holding_registers(1, 102, 2).registers == [102, 103]
+        assert hub.read_holding_registers(1, 104, 1).registers == [104]
+        assert hub.read_input_registers(1, 100, 1).registers == [200]
+        assert hub.read_holding_registers(2, 100, 1).registers == [100]
+
+        assert client.requests == [
+            ("ReadHoldingRegistersRequest", 1, 100, 5),
+            ("ReadInputRegistersRequest", 1, 100, 1),
+            ("ReadHoldingRegistersRequest", 2, 100, 1),
+        ]
+
+    assert hub.scheduler.block_reads == 6
+    assert hub.scheduler.cached_reads == 6
+
+
+def test_block_reads_coils():
+    """Test coils are merged with a gap counted in registers."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub", True, 1)
+
+    for address in (0, 3, 20):
+        hub.add_read(1, KIND_COILS, address, 1)
+
+    assert hub.read_coils(1, 0, 1).bits == [True]
+    assert hub.read_coils(1, 3, 1).bits == [True]
+    assert hub.read_coils(1, 20, 1).bits == [False]
+    assert client.requests == [("ReadCoilsRequest", 1, 0, 21)]
+
+
+def test_unplanned_read():
+    """Test ranges that were not planned ahead are added on their first read."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub", True, 0)
+
+    assert hub.read_holding_registers(1, 10, 1).registers == [10]
+    assert hub.read_holding_registers(1, 11, 1).registers == [11]
+    client.requests.clear()
+
+    assert hub.read_holding_registers(1, 10, 1).registers == [10]
+    assert hub.read_holding_registers(1, 11, 1).registers == [11]
+    assert client.requests == [("ReadHoldingRegistersRequest", 1, 10, 2)]
+
+
+def test_read_again_reads_block():
+    """Test a range read twice reads its block again."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub", True, 0)
+    hub.add_read(1, KIND_HOLDING, 10, 1)
+    hub.add_read(1, KIND_HOLDING, 11, 1)
+
+    hub.read_holding_registers(1, 10, 1)
+    client.slaves[1].setValues(3, 10, [42])
+
+    assert hub.read_holding_registers(1, 10, 1).registers == [42]
+    assert len(client.requests) == 2
+
+
+def test_old_block_read_again():
+    """Test blocks are not served once too old."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub", True, 0)
+    hub.add_read(1, KIND_HOLDING, 10, 1)
+    hub.add_read(1, KIND_HOLDING, 11, 1)
+
+    with mock.patch(
+        "homeassistant.components.modbus.scheduler.monotonic", return_value=0
+    ):
+        hub.read_holding_registers(1, 10, 1)
+
+    with mock.patch(
+        "homeassistant.components.modbus.scheduler.monotonic", return_value=10
+    ):
+        hub.read_holding_registers(1, 11, 1)
+
+    assert len(client.requests) == 2
+
+
+def test_write_drops_block_read():
+    """Test a write drops the block reads of the written address."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub", True, 0)
+    hub.add_read(1, KIND_HOLDING, 10, 1)
+    hub.add_read(1, KIND_HOLDING, 11, 1)
+
+    hub.read_holding_registers(1, 10, 1)
+    hub.write_register(1, 11, 7)
+
+    assert hub.read_holding_registers(1, 11, 1).registers == [7]
+
+
+def test_failed_block_isolates_ranges():
+    """Test ranges of a block are read on their own when the block fails."""
+    holding = ModbusSparseDataBlock({10: 10, 11: 11, 13: 13})
+    client = SimulatorClient({1: slave(holding=holding)})
+    hub = ModbusHub(client, "hub", True, 1)
+
+    for address in (10, 11, 13):
+        hub.add_read(1, KIND_HOLDING, address, 1)
+
+    assert hub.read_holding_registers(1, 10, 1).registers == [10]
+    assert hub.read_holding_registers(1, 11, 1).registers == [11]
+    assert hub.read_holding_registers(1, 13, 1).registers == [13]
+    assert client.requests == [
+        ("ReadHoldingRegistersRequest", 1, 10, 4),
+        ("ReadHoldingRegistersRequest", 1, 10, 1),
+        ("ReadHoldingRegistersRequest", 1, 11, 1),
+        ("ReadHoldingRegistersRequest", 1, 13, 1),
+    ]
+    assert hub.scheduler.blocks(1, KIND_HOLDING) == [(10, 1), (11, 1), (13, 1)]
+
+
+def test_failed_range_returns_error():
+    """Test the error of a range read on its own is returned."""
+    holding = ModbusSparseDataBlock({10: 10})
+    client = SimulatorClient({1: slave(holding=holding)})
+    hub = ModbusHub(client, "hub", True, 0)
+
+    result = hub.read_holding_registers(1, 20, 1)
+
+    assert not hasattr(result, "registers")
+    assert result.isError()
+
+
+def test_block_reads_disabled():
+    """Test every read is sent when block reads are disabled."""
+    client = SimulatorClient({1: slave()})
+    hub = ModbusHub(client, "hub")
+    hub.add_read(1, KIND_HOLDING, 10, 1)
+    hub.add_read(1, KIND_HOLDING, 11, 1)
+
+    assert hub.read_holding_registers(1, 10, 1).registers == [10]
+    assert hub.read_holding_registers(1, 11, 1).registers == [11]
+    assert hub.scheduler is None
+    assert len(client.requests) == 2
@@ -0,0 +1,143 @@
+"""Test the profiler integration."""
+import asyncio
+import os
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from homeassistant.components import profiler
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.components.profiler.monitor import (
+    SLOT_SECONDS,
+    WINDOW_SLOTS,
+    LoopMonitor,
+    RollingHistogram,
+    describe_callback,
+)
+from homeassistant.setup import async_setup_component
+
+
+def blocking_callback():
+    """Block the event loop."""
+    time.sleep(0.02)
+
+
+async def blocking_coroutine():
+    """Block the event loop from a task."""
+    time.sleep(0.02)
+
+
+async def test_loop_stats(hass, hass_ws_client):
+    """Test lag and slow callbacks are recorded."""
+    assert await async_setup_component(
+        hass,
+        profiler.DOMAIN,
+        {profiler.DOMAIN: {"lag_interval": 0.01, "slow_callback_threshold": 0.01}},
+    )
+    client = await hass_ws_client(hass)
+
+    hass.loop.call_soon(blocking_callback)
+    await hass.async_create_task(blocking_coroutine())
+    await asyncio.sleep(0.05)
+
+    await client.send_json({"id": 5, "type": "profiler/loop_stats"})
+    msg = await client.receive_json()
+    assert msg["success"]
+
+    result = msg["result"]
+    assert result["slow_callbacks_supported"]
+    assert "max_latency" in result["thread_queue"]
+    assert result["lag"]["count"] > 0
+    assert result["slow_callbacks"]["count"] >= 2
+
+    functions = {
+        (stats["integration"], stats["function"])
+        for stats in result["slow_by_function"]
+    }
+    # The tests of an integration are attributed to the integration
+    assert ("profiler", "blocking_callback") in functions
+    assert ("profiler", "blocking_coroutine") in functions
+    assert result["recent"][-1]["duration"] >= 0.01
+
+    run = asyncio.Handle._run
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert asyncio.Handle._run is not run
+
+
+def test_other_loop(caplog):
+    """Test slow callbacks are reported unsupported on loops like uvloop."""
+    run = asyncio.Handle._run
+    loop = Mock(spec=asyncio.AbstractEventLoop)
+    loop.time.return_value = 0
+    monitor = LoopMonitor(loop, 1, 0.01)
+    stop = monitor.async_start()
+
+    assert asyncio.Handle._run is run
+    assert not monitor.as_dict()["slow_callbacks_supported"]
+    assert "only the lag is measured" in caplog.text
+    stop()
+
+
+async def test_patched_again(hass, caplog):
+    """Test a warning is logged when the patch can't be undone."""
+    run = asyncio.Handle._run
+    monitor = LoopMonitor(hass.loop, 1, 0.01)
+    monitor.async_start()
+    patched = asyncio.Handle._run
+    asyncio.Handle._run = lambda handle: patched(handle)
+
+    try:
+        monitor.async_stop()
+    finally:
+        asyncio.Handle._run = run
+
+    assert monitor.threshold == float("inf")
+    assert "was replaced after the loop monitor patched it" in caplog.text
+
+
+@pytest.mark.parametrize("mode, suffix", [("cprofile", "cprof"), ("sample", "stacks")])
+async def test_start_service(hass, tmp_path, mode, suffix):
+    """Test profiles are saved in the configuration directory."""
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(hass, "persistent_notification", {})
+    assert await async_setup_component(hass, profiler.DOMAIN, {})
+
+    await hass.services.async_call(
+        profiler.DOMAIN,
+        profiler.SERVICE_START,
+        {profiler.ATTR_SECONDS: 0.05, profiler.ATTR_MODE: mode},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    assert files[0].endswith(suffix)
+    assert os.path.getsize(tmp_path / files[0]) > 0
+
+    notification = hass.states.get("persistent_notification.profiler_start")
+    assert files[0] in notification.attributes["message"]
+
+
+def test_rolling_histogram():
+    """Test values outside the window are not counted."""
+    histogram = RollingHistogram()
+    histogram.record(0.002, now=0)
+    histogram.record(0.2, now=SLOT_SECONDS)
+
+    data = histogram.as_dict(now=SLOT_SECONDS)
+    assert data["count"] == 2
+    assert data["buckets"]["0.005"] == 1
+    assert data["buckets"]["0.25"] == 1
+    assert data["max"] == 0.2
+
+    data = histogram.as_dict(now=WINDOW_SLOTS * SLOT_SECONDS)
+    assert data["count"] == 1
+
+
+def test_describe_callback():
+    """Test callbacks are attributed to their integration."""
+    assert describe_callback(profiler.async_setup) == ("profiler", "async_setup")
+    assert describe_callback(len) == ("unknown", "len")
@@ -2,7 +2,11 @@
 import asyncio
 import pytest
 
-from homeassistant.const import ENERGY_KILO_WATT_HOUR, DEVICE_CLASS_POWER
+from homeassistant.const import (
+    DEVICE_CLASS_POWER,
+    ENERGY_KILO_WATT_HOUR,
+    STATE_UNAVAILABLE,
+)
 
 from homeassistant import setup
 from homeassistant.components import climate, sensor
@@ -103,3 +107,72 @@ def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
         'entity="sensor.electricity_price",'
         'friendly_name="Electricity price"} 0.123' in body
     )
+
+
+async def test_view_http_metrics(hass, hass_client):
+    """Test the HTTP metrics are exported when enabled."""
+    assert await async_setup_component(hass, "http", {"http": {"metrics": True}})
+    assert await async_setup_component(
+        hass, prometheus.DOMAIN, {prometheus.DOMAIN: {"namespace": "hass"}}
+    )
+    client = await hass_client()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    body = (await resp.text()).split("\n")
+
+    assert 'hass_http_requests_total{route="/api/prometheus",status="200"} 1' in body
+    assert "hass_http_requests_in_flight 1" in body
+
+
+async def test_view_gzip(prometheus_client):  # pylint: disable=redefined-outer-name
+    """Test the metrics are compressed for clients that accept it."""
+    resp = await prometheus_client.get(
+        prometheus.API_ENDPOINT, headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "# TYPE state_change_total counter" in (await resp.text()).split("\n")
+
+    resp = await prometheus_client.get(
+        prometheus.API_ENDPOINT, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in resp.headers
+
+    resp = await prometheus_client.get(
+        prometheus.API_ENDPOINT, headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+    assert "content-encoding" not in resp.headers
+
+
+async def test_stale_series_removed(hass, hass_client):
+    """Test the series of removed entities and of gone values are removed."""
+    assert await async_setup_component(hass, prometheus.DOMAIN, {prometheus.DOMAIN: {}})
+    client = await hass_client()
+    series = 'sensor.phone",friendly_name="None"} 10.0'
+
+    hass.states.async_set("sensor.phone", "5", {"battery_level": 10})
+    hass.states.async_set("sensor.other", "5", {"battery_level": 20})
+    await hass.async_block_till_done()
+    body = await (await client.get(prometheus.API_ENDPOINT)).text()
+    assert f'battery_level_percent{{domain="sensor",entity="{series}' in body
+
+    # Unavailable entities keep the series they no longer get
+    hass.states.async_set("sensor.phone", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    body = await (await client.get(prometheus.API_ENDPOINT)).text()
+    assert f'battery_level_percent{{domain="sensor",entity="{series}' in body
+
+    hass.states.async_set("sensor.phone", "6")
+    await hass.async_block_till_done()
+    body = await (await client.get(prometheus.API_ENDPOINT)).text()
+    assert "sensor.phone" in body
+    assert 'battery_level_percent{domain="sensor",entity="sensor.phone"' not in body
+    assert 'battery_level_percent{domain="sensor",entity="sensor.other"' in body
+
+    hass.states.async_remove("sensor.phone")
+    await hass.async_block_till_done()
+    body = await (await client.get(prometheus.API_ENDPOINT)).text()
+    assert "sensor.phone" not in body
+    assert "sensor.other" in body
@@ -0,0 +1,73 @@
+"""The tests for the registry of the Prometheus metrics of states."""
+from homeassistant.components.prometheus.registry import MetricRegistry, format_value
+
+
+def test_format_value():
+    """Test values are formatted like the Prometheus client library does."""
+    assert format_value(1) == "1.0"
+    assert format_value(15.6) == "15.6"
+    assert format_value(1e20) == "1e+20"
+    assert format_value(float("nan")) == "NaN"
+    assert format_value(float("-inf")) == "-Inf"
+
+
+def test_render():
+    """Test the text exposition format."""
+    registry = MetricRegistry()
+    gauge = registry.gauge("temperature_c", "Temperature\nin \\C")
+    gauge.labels(entity="sensor.a", friendly_name='Say "hi"').set(21.5)
+    counter = registry.counter("state_change", "The number of state changes")
+    counter.labels(entity="sensor.a").inc()
+
+    lines = registry.render().decode().split("\n")
+
+    assert lines[:6] == [
+        "# HELP temperature_c Temperature\\nin \\\\C",
+        "# TYPE temperature_c gauge",
+        'temperature_c{entity="sensor.a",friendly_name="Say \\"hi\\""} 21.5',
+        "# HELP state_change_total The number of state changes",
+        "# TYPE state_change_total counter",
+        'state_change_total{entity="sensor.a"} 1.0',
+    ]
+    assert lines[6] == "# TYPE state_change_created gauge"
+    assert lines[7].startswith('state_change_created{entity="sensor.a"} ')
+
+
+def test_render_cached():
+    """Test only changed metrics are rendered again."""
+    registry = MetricRegistry()
+    first = registry.gauge("first", "First")
+    second = registry.gauge("second", "Second")
+    first.labels(entity="sensor.a").set(1)
+    second.labels(entity="sensor.a").set(2)
+
+    body = registry.render()
+    first.labels(entity="sensor.a").set(1)
+    assert registry.render() is body
+
+    second_text = second.render()
+    first.labels(entity="sensor.a").set(3)
+    assert registry.render() != body
+    assert second.render() is second_text
+
+
+def test_update_removes_untouched_series():
+    """Test series an entity does not get in an update are removed."""
+    registry = MetricRegistry()
+    gauge = registry.gauge("value", "Value")
+
+    with registry.update_entity("sensor.a"):
+        gauge.labels(entity="sensor.a", friendly_name="A").set(1)
+    with registry.update_entity("sensor.b"):
+        gauge.labels(entity="sensor.b", friendly_name="B").set(1)
+    with registry.update_entity("sensor.a"):
+        gauge.labels(entity="sensor.a", friendly_name="Renamed").set(1)
+
+    body = registry.render().decode()
+    assert 'friendly_name="A"' not in body
+    assert 'friendly_name="Renamed"' in body
+
+    registry.remove_entity("sensor.a")
+    body = registry.render().decode()
+    assert "sensor.a" not in body
+    assert "sensor.b" in body
@@ -8,7 +8,15 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
-from homeassistant.components.recorder.models import Base, Events, States, RecorderRuns
+from homeassistant.components.recorder.models import (
+    Base,
+    Events,
+    LAZY_STATE_COLUMNS,
+    LazyState,
+    States,
+    RecorderRuns,
+)
+from homeassistant.helpers.json import json_loads
 
 ENGINE = None
 SESSION = None
@@ -159,3 +167,46 @@ def test_states_from_native_invalid_entity_id():
     event.attributes = "{}"
     state = event.to_native()
     assert state.entity_id == "test.invalid__id"
+
+
+def test_lazy_state_from_row():
+    """Test a lazy state equals the state it was stored from."""
+    session = SESSION()
+    state = ha.State(
+        "sensor.temperature",
+        "18",
+        {"unit_of_measurement": "°C", "nested": {"list": [1, 2]}},
+        context=ha.Context(user_id="abcd"),
+    )
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    session.add(States.from_event(event))
+    session.commit()
+
+    row = (
+        session.query(*LAZY_STATE_COLUMNS)
+        .filter(States.entity_id == "sensor.temperature")
+        .one()
+    )
+    session.rollback()
+
+    lazy_state = LazyState(row)
+    assert lazy_state.get_attribute("hidden") is None
+    assert lazy_state._attributes is None
+    # The JSON is created from the stored attributes
+    assert json_loads(lazy_state.as_json()) == json_loads(state.as_json())
+    assert lazy_state._attributes is None
+
+    assert lazy_state.get_attribute("unit_of_measurement") == "°C"
+    assert lazy_state == state
+    assert lazy_state.last_changed == state.last_changed
+    assert lazy_state.context is lazy_state.context
+
+
+def test_lazy_state_invalid_attributes():
+    """Test a lazy state with attributes that are not valid JSON."""
+    lazy_state = LazyState(("sensor.test", "on", "{invalid", None, None, None, None))
+    assert lazy_state.attributes == {}
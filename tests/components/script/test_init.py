@@ -398,3 +398,38 @@ async def test_async_get_descriptions_script(hass):
         descriptions[script.DOMAIN]["test2"]["fields"]["param"]["example"]
         == "param_example"
     )
+
+
+async def test_reload_keeps_running_scripts(hass):
+    """Test reload does not stop scripts of which the config did not change."""
+    config = {
+        "script": {
+            "test": {"sequence": [{"delay": {"seconds": 5}}]},
+            "test2": {"sequence": [{"delay": {"seconds": 5}}]},
+        }
+    }
+    assert await async_setup_component(hass, "script", config)
+
+    await hass.services.async_call(DOMAIN, "test")
+    await hass.services.async_call(DOMAIN, "test2")
+    await hass.async_block_till_done()
+    assert script.is_on(hass, ENTITY_ID)
+    assert script.is_on(hass, "script.test2")
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        return_value={
+            "script": {
+                "test": {"sequence": [{"delay": {"seconds": 5}}]},
+                "test2": {"sequence": [{"delay": {"seconds": 10}}]},
+            }
+        },
+    ):
+        with patch("homeassistant.config.find_config_file", return_value=""):
+            await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
+            await hass.async_block_till_done()
+
+    assert script.is_on(hass, ENTITY_ID)
+    assert not script.is_on(hass, "script.test2")
+    assert hass.services.has_service(DOMAIN, "test")
+    assert hass.services.has_service(DOMAIN, "test2")
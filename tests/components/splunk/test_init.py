@@ -5,8 +5,9 @@ from unittest import mock
 
 from homeassistant.setup import setup_component
 import homeassistant.components.splunk as splunk
-from homeassistant.const import STATE_ON, STATE_OFF, EVENT_STATE_CHANGED
+from homeassistant.const import STATE_ON, STATE_OFF
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.state_exporter import StateRecord
 import homeassistant.util.dt as dt_util
 from homeassistant.core import State
 
@@ -41,19 +42,23 @@ class TestSplunk(unittest.TestCase):
             }
         }
 
-        self.hass.bus.listen = mock.MagicMock()
-        assert setup_component(self.hass, splunk.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(self.hass, splunk.DOMAIN, config)
+        assert mock_subscribe.called
+        assert splunk.DOMAIN == mock_subscribe.call_args[0][1]
 
     def test_setup_config_defaults(self):
         """Test setup with defaults."""
         config = {"splunk": {"host": "host", "token": "secret"}}
 
-        self.hass.bus.listen = mock.MagicMock()
-        assert setup_component(self.hass, splunk.DOMAIN, config)
-        assert self.hass.bus.listen.called
-        assert EVENT_STATE_CHANGED == self.hass.bus.listen.call_args_list[0][0][0]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            assert setup_component(self.hass, splunk.DOMAIN, config)
+        assert mock_subscribe.called
+        assert splunk.DOMAIN == mock_subscribe.call_args[0][1]
 
     def _setup(self, mock_requests):
         """Test the setup."""
@@ -62,9 +67,11 @@ class TestSplunk(unittest.TestCase):
         mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {"splunk": {"host": "host", "token": "secret", "port": 8088}}
 
-        self.hass.bus.listen = mock.MagicMock()
-        setup_component(self.hass, splunk.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        with mock.patch(
+            "homeassistant.helpers.state_exporter.subscribe"
+        ) as mock_subscribe:
+            setup_component(self.hass, splunk.DOMAIN, config)
+        self.handler_method = mock_subscribe.call_args[0][2]
 
     @mock.patch.object(splunk, "requests")
     def test_event_listener(self, mock_requests):
@@ -103,7 +110,7 @@ class TestSplunk(unittest.TestCase):
                 "host": "http://host:8088/services/collector/event",
                 "event": body,
             }
-            self.handler_method(event)
+            self.handler_method([StateRecord.from_event(event)])
             assert self.mock_post.call_count == 1
             assert self.mock_post.call_args == mock.call(
                 payload["host"],
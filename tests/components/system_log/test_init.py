@@ -151,6 +151,25 @@ async def test_dedup_logs(hass, hass_client):
     assert log[0]["timestamp"] > log[0]["first_occured"]
 
 
+async def test_dedup_skips_stack(hass, hass_client):
+    """Test that repeated entries don't extract the call stack again."""
+    await async_setup_component(hass, system_log.DOMAIN, BASIC_CONFIG)
+
+    with patch("traceback.extract_stack", return_value=[]) as mock_extract:
+        _LOGGER.error("error message")
+        _LOGGER.error("error message")
+        _generate_and_log_exception("exception message", "log message")
+        _generate_and_log_exception("exception message", "log message")
+
+    assert len(mock_extract.mock_calls) == 1
+
+    log = await get_error_log(hass, hass_client, 2)
+    assert_log(log[0], "exception message", "log message", "ERROR")
+    assert log[0]["count"] == 2
+    assert log[0]["root_cause"] is not None
+    assert log[1]["count"] == 2
+
+
 async def test_clear_logs(hass, hass_client):
     """Test that the log can be cleared via a service call."""
     await async_setup_component(hass, system_log.DOMAIN, BASIC_CONFIG)
@@ -1,4 +1,6 @@
 """Tests for WebSocket API commands."""
+import json
+
 from async_timeout import timeout
 
 from homeassistant.core import callback
@@ -187,6 +189,33 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_state_changed(hass, websocket_client):
+    """Test state changed events are sent with the cached state JSON."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    new_state = hass.states.get("light.kitchen")
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 5
+    assert msg["type"] == "event"
+    event = msg["event"]
+
+    assert event["event_type"] == "state_changed"
+    assert event["origin"] == "LOCAL"
+    assert event["data"]["entity_id"] == "light.kitchen"
+    assert event["data"]["old_state"] is None
+    assert event["data"]["new_state"] == json.loads(new_state.as_json().decode())
+    assert event["context"]["id"] == new_state.context.id
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -471,3 +500,36 @@ async def test_render_template_returns_with_match_all(
     assert msg["id"] == 5
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
+
+
+async def test_http_metrics(hass, hass_ws_client, hass_admin_user):
+    """Test getting the HTTP metrics."""
+    assert await async_setup_component(hass, "http", {"http": {"metrics": True}})
+    websocket_client = await hass_ws_client(hass)
+
+    resp = await websocket_client.client.get("/missing")
+    assert resp.status == 404
+
+    await websocket_client.send_json({"id": 5, "type": "http/metrics"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["routes"]["unmatched"]["statuses"] == {"404": 1}
+    # The websocket connection itself is in flight
+    assert msg["result"]["in_flight"] == 1
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 6, "type": "http/metrics"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_http_metrics_disabled(websocket_client):
+    """Test getting the HTTP metrics when they are not enabled."""
+    await websocket_client.send_json({"id": 5, "type": "http/metrics"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
@@ -103,3 +103,16 @@ async def test_invalid_vol(hass, websocket_client):
     assert not msg["success"]
     assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
     assert "expected str for dictionary value" in msg["error"]["message"]
+
+
+def test_json_dump_orjson():
+    """Test messages are encoded with orjson when it is installed."""
+    orjson = Mock(OPT_NON_STR_KEYS=1)
+    orjson.dumps.return_value = b'"orjson"'
+
+    with patch("homeassistant.util.json.orjson", orjson, create=True), patch(
+        "homeassistant.util.json.HAS_ORJSON", True
+    ):
+        assert const.JSON_DUMP({"value": float("nan")}) == '"orjson"'
+
+    assert orjson.dumps.call_count == 1
@@ -244,3 +244,59 @@ async def test_core_config_update(hass):
     assert home_updated.name == "Updated Name"
     assert home_updated.attributes["latitude"] == 10
     assert home_updated.attributes["longitude"] == 20
+
+
+async def test_active_zone_follows_zone_changes(hass):
+    """Test the active zone lookup sees zones that were added, moved or removed."""
+    hass.states.async_set(
+        "zone.near", "zoning", {"latitude": 32.88, "longitude": -117.23, "radius": 250}
+    )
+    hass.states.async_set(
+        "zone.far", "zoning", {"latitude": 52.37, "longitude": 4.89, "radius": 250}
+    )
+    hass.states.async_set(
+        "zone.everywhere", "zoning", {"latitude": 0, "longitude": 0, "radius": 2e7}
+    )
+
+    assert zone.async_active_zone(hass, 32.88, -117.23).entity_id == "zone.near"
+    assert zone.async_active_zone(hass, 52.37, 4.89).entity_id == "zone.far"
+    assert zone.async_active_zone(hass, 10, 10).entity_id == "zone.everywhere"
+
+    hass.states.async_set(
+        "zone.near", "zoning", {"latitude": 40.71, "longitude": -74.0, "radius": 250}
+    )
+    hass.states.async_remove("zone.far")
+    hass.states.async_set(
+        "zone.new", "zoning", {"latitude": 32.881, "longitude": -117.23, "radius": 250}
+    )
+    await hass.async_block_till_done()
+
+    assert zone.async_active_zone(hass, 40.71, -74.0).entity_id == "zone.near"
+    assert zone.async_active_zone(hass, 32.88, -117.23).entity_id == "zone.new"
+    assert zone.async_active_zone(hass, 52.37, 4.89).entity_id == "zone.everywhere"
+
+    # A large accuracy is looked up against all zones
+    assert zone.async_active_zone(hass, 32.9, -117.23, 5e6).entity_id == "zone.new"
+
+    hass.states.async_set(
+        "zone.new",
+        "zoning",
+        {"latitude": 32.881, "longitude": -117.23, "radius": 250, "passive": True},
+    )
+    await hass.async_block_till_done()
+    assert zone.async_active_zone(hass, 32.881, -117.23).entity_id == (
+        "zone.everywhere"
+    )
+
+
+def test_zone_bounds():
+    """Test the bounds contain the circle and are skipped where invalid."""
+    min_lat, max_lat, min_lon, max_lon = zone.zone.zone_bounds(60, 10, 1000)
+
+    assert zone.distance(60, 10, max_lat, 10) > 1000
+    assert zone.distance(60, 10, min_lat, 10) > 1000
+    assert zone.distance(60, 10, 60, max_lon) > 1000
+    assert zone.distance(60, 10, 60, min_lon) > 1000
+
+    assert zone.zone.zone_bounds(89.5, 0, 1000) is None
+    assert zone.zone.zone_bounds(0, 179.999, 1000) is None
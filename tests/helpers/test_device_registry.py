@@ -421,3 +421,47 @@ async def test_loading_race_condition(hass):
 
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_entries_for_area(registry):
+    """Test looking up devices by area follows updates."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "0123")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "4567")}
+    )
+
+    entry = registry.async_update_device(entry.id, area_id="12345A")
+    entry2 = registry.async_update_device(entry2.id, area_id="12345A")
+
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry, entry2]
+
+    entry = registry.async_update_device(entry.id, area_id="67890B")
+
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry2]
+    assert device_registry.async_entries_for_area(registry, "67890B") == [entry]
+
+
+async def test_get_device_after_identifiers_change(registry):
+    """Test looking up a device by replaced identifiers."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("bridgeid", "0123")},
+    )
+
+    registry.async_update_device(entry.id, new_identifiers={("bridgeid", "4567")})
+
+    assert registry.async_get_device({("bridgeid", "0123")}, set()) is None
+    assert registry.async_get_device({("bridgeid", "4567")}, set()).id == entry.id
+    assert (
+        registry.async_get_device(
+            set(), {(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")}
+        ).id
+        == entry.id
+    )
+
+    registry.async_remove_device(entry.id)
+
+    assert registry.async_get_device({("bridgeid", "4567")}, set()) is None
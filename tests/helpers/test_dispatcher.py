@@ -3,7 +3,10 @@ import asyncio
 
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import (
+    DATA_DISPATCHER,
     async_dispatcher_connect,
+    async_dispatcher_send,
+    async_dispatcher_stats,
     dispatcher_send,
     dispatcher_connect,
 )
@@ -153,3 +156,70 @@ async def test_callback_exception_gets_logged(hass, caplog):
     await hass.async_block_till_done()
 
     assert "Exception in bad_handler when dispatching 'test': ('bad',)" in caplog.text
+
+
+async def test_coroutine_and_executor_exceptions_get_logged(hass, caplog):
+    """Test exceptions of coroutine functions and executor jobs are logged."""
+
+    async def bad_coroutine(*args):
+        """Raise."""
+        raise ValueError("Bad coroutine")
+
+    def bad_function(*args):
+        """Raise."""
+        raise ValueError("Bad function")
+
+    async_dispatcher_connect(hass, "test", bad_coroutine)
+    async_dispatcher_connect(hass, "test", bad_function)
+    async_dispatcher_send(hass, "test", "bad")
+    await hass.async_block_till_done()
+
+    assert "Exception in bad_coroutine when dispatching 'test'" in caplog.text
+    assert "Exception in bad_function when dispatching 'test'" in caplog.text
+    assert async_dispatcher_stats(hass) == {
+        "test": {"sent": 1, "delivered": 2, "errors": 2}
+    }
+
+
+async def test_connect_same_target_twice(hass):
+    """Test each connection of a target is removed on its own."""
+    calls = []
+
+    @callback
+    def handler(data):
+        """Record calls."""
+        calls.append(data)
+
+    unsub1 = async_dispatcher_connect(hass, "test", handler)
+    async_dispatcher_connect(hass, "test", handler)
+    async_dispatcher_send(hass, "test", 1)
+    await hass.async_block_till_done()
+    assert calls == [1, 1]
+
+    unsub1()
+    unsub1()
+    async_dispatcher_send(hass, "test", 2)
+    await hass.async_block_till_done()
+    assert calls == [1, 1, 2]
+    assert len(hass.data[DATA_DISPATCHER]["test"]) == 1
+
+
+async def test_remove_many(hass):
+    """Test removing many targets of a signal, in any order."""
+    calls = []
+
+    @callback
+    def handler(data):
+        """Record calls."""
+        calls.append(data)
+
+    unsubs = [async_dispatcher_connect(hass, "test", handler) for _ in range(1000)]
+
+    for unsub in unsubs[::2] + unsubs[1::2][1:]:
+        unsub()
+
+    async_dispatcher_send(hass, "test", 1)
+    await hass.async_block_till_done()
+
+    assert calls == [1]
+    assert async_dispatcher_stats(hass)["test"]["delivered"] == 1
@@ -13,7 +13,7 @@ from homeassistant.const import ATTR_HIDDEN, ATTR_DEVICE_CLASS
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.helpers.entity_values import EntityValues
 
-from tests.common import get_test_home_assistant, mock_registry
+from tests.common import get_test_home_assistant, mock_registry, MockEntityPlatform
 
 
 def test_generate_entity_id_requires_hass_or_ids():
@@ -557,3 +557,28 @@ async def test_disabled_in_entity_registry(hass):
     await hass.async_block_till_done()
     assert entry3 != entry2
     assert ent.registry_entry == entry3
+
+
+async def test_update_in_platform_executor(hass):
+    """Test entities are updated in the executor of their integration."""
+    hass.config.executor_pools = {"test_platform": 1}
+    threads = []
+
+    class UpdateEntity(entity.Entity):
+        """Entity that records the thread it was updated in."""
+
+        def update(self):
+            """Update the entity."""
+            threads.append(threading.current_thread().name)
+
+    ent = UpdateEntity()
+    ent.hass = hass
+    ent.platform = MockEntityPlatform(hass)
+    await ent.async_device_update()
+
+    ent.platform = None
+    await ent.async_device_update()
+
+    assert threads[0].startswith("SyncWorker_test_platform")
+    assert threads[1].startswith("SyncWorker_")
+    assert not threads[1].startswith("SyncWorker_test_platform")
@@ -468,3 +468,41 @@ async def test_extract_all_use_match_all(hass, caplog):
     assert (
         "Not passing an entity ID to a service to target all entities is " "deprecated"
     ) not in caplog.text
+
+
+async def test_update_config_entities(hass):
+    """Test only entities of changed config are recreated."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+
+    def create_entity(key, config):
+        """Create an entity, skipping disabled configs."""
+        if config.get("disabled"):
+            return None
+        return MockEntity(name=key, **config)
+
+    await component.async_update_config_entities(
+        {"keep": {"available": True}, "change": {"available": True}, "drop": {}},
+        create_entity,
+    )
+    keep = component.get_entity("test_domain.keep")
+    change = component.get_entity("test_domain.change")
+    assert keep is not None
+    assert change is not None
+    assert hass.states.get("test_domain.drop") is not None
+
+    await component.async_update_config_entities(
+        {
+            "keep": {"available": True},
+            "change": {"available": False},
+            "new": {},
+            "skip": {"disabled": True},
+        },
+        create_entity,
+    )
+
+    assert component.get_entity("test_domain.keep") is keep
+    assert component.get_entity("test_domain.change") is not change
+    assert component.get_entity("test_domain.change").available is False
+    assert hass.states.get("test_domain.drop") is None
+    assert hass.states.get("test_domain.new") is not None
+    assert hass.states.get("test_domain.skip") is None
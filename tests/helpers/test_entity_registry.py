@@ -418,3 +418,30 @@ async def test_disabled_by_system_options(registry):
         "light", "hue", "BBBB", config_entry=mock_config, disabled_by="user"
     )
     assert entry2.disabled_by == "user"
+
+
+async def test_indexes_follow_updates(registry):
+    """Test lookups by unique id and config entry after updates."""
+    mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config, device_id="mock-dev-id"
+    )
+
+    registry.async_update_entity(
+        entry.entity_id, new_entity_id="light.renamed", new_unique_id="1234"
+    )
+
+    assert registry.async_get_entity_id("light", "hue", "5678") is None
+    assert registry.async_get_entity_id("light", "hue", "1234") == "light.renamed"
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        registry.async_get("light.renamed")
+    ]
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == [
+        registry.async_get("light.renamed")
+    ]
+
+    registry.async_clear_config_entry("mock-id-1")
+
+    assert registry.async_get_entity_id("light", "hue", "1234") is None
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == []
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == []
@@ -2,7 +2,7 @@
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps, json_loads
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +19,15 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dumps_core_objects(hass):
+    """Test the fast paths for core objects."""
+    state = core.State("test.test", "hello", {"now": dt_util.utcnow()})
+    event = core.Event("test_event", {"state": state})
+
+    assert json_loads(json_dumps(state)) == json_loads(
+        json_dumps(state.as_dict(), encoder=JSONEncoder)
+    )
+    assert json_loads(json_dumps(event))["data"]["state"]["entity_id"] == "test.test"
+    assert json_loads(json_dumps(event.context)) == event.context.as_dict()
@@ -0,0 +1,74 @@
+"""Tests for the registry items helper."""
+import attr
+import pytest
+
+from homeassistant.helpers.registry import RegistryItems
+
+
+@attr.s(slots=True, frozen=True)
+class MockEntry:
+    """Mock registry entry."""
+
+    group = attr.ib(type=str, default=None)
+    tags = attr.ib(type=frozenset, default=frozenset())
+
+
+class MockRegistryItems(RegistryItems):
+    """Registry items indexed by group and tags."""
+
+    def _index_keys(self, entry):
+        """Return the index keys of an entry."""
+        if entry.group is not None:
+            yield ("group", entry.group)
+
+        for tag in entry.tags:
+            yield ("tag", tag)
+
+
+def test_index_follows_mutations():
+    """Test the indexes are updated on assignment and deletion."""
+    items = MockRegistryItems({"a": MockEntry("one", frozenset({"x", "y"}))})
+    items["b"] = MockEntry("one", frozenset({"y"}))
+
+    assert items.get_keys("group", "one") == ["a", "b"]
+    assert items.get_keys("tag", "y") == ["a", "b"]
+    assert items.get_first_key("tag", "x") == "a"
+
+    items["a"] = MockEntry("two", frozenset({"y"}))
+
+    # Unchanged index values keep their position
+    assert items.get_keys("tag", "y") == ["a", "b"]
+    assert items.get_keys("group", "one") == ["b"]
+    assert items.get_entries("group", "two") == [items["a"]]
+    assert items.get_first_key("tag", "x") is None
+
+    items.pop("b")
+
+    assert items.get_keys("group", "one") == []
+    assert items.get_keys("tag", "y") == ["a"]
+    assert items._index == {("group", "two"): {"a": None}, ("tag", "y"): {"a": None}}
+
+    del items["a"]
+
+    assert items._index == {}
+    assert len(items) == 0
+
+    with pytest.raises(KeyError):
+        del items["a"]
+
+
+def test_mapping_methods():
+    """Test get, pop and update keep the indexes up to date."""
+    items = MockRegistryItems()
+    items.update({"a": MockEntry("one"), "b": MockEntry("one")})
+
+    assert items.get("a") == MockEntry("one")
+    assert items.get("c") is None
+    assert items.get_keys("group", "one") == ["a", "b"]
+
+    assert items.pop("a") == MockEntry("one")
+    assert items.pop("a", None) is None
+    assert items.get_keys("group", "one") == ["b"]
+
+    with pytest.raises(KeyError):
+        items.pop("a")
@@ -44,6 +44,7 @@ async def test_caching_data(hass):
         "homeassistant.helpers.restore_state.Store.async_save"
     ) as mock_write_data:
         state = await entity.async_get_last_state()
+        await hass.async_block_till_done()
 
     assert state is not None
     assert state.entity_id == "input_boolean.b1"
@@ -165,6 +166,39 @@ async def test_dump_data(hass):
     assert written_states[0]["state"]["state"] == "off"
 
 
+async def test_dump_only_changed(hass):
+    """Test that only changed states are serialized again."""
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    await entity.async_internal_added_to_hass()
+
+    hass.states.async_set("input_boolean.b0", "on")
+    hass.states.async_set("input_boolean.b1", "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data:
+        await data.async_dump_states()
+        hass.states.async_set("input_boolean.b1", "off")
+        await data.async_dump_states()
+
+    first = mock_write_data.mock_calls[0][1][0]
+    second = mock_write_data.mock_calls[1][1][0]
+    assert [item["state"]["state"] for item in second] == ["on", "off"]
+    # The unchanged state is not serialized again
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
@@ -0,0 +1,275 @@
+"""Test the state exporter helper."""
+import asyncio
+import threading
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import State, callback
+from homeassistant.helpers import state_exporter
+from homeassistant.helpers.state_exporter import StateRecord, async_subscribe
+
+
+def _collector(records):
+    """Return an exporter that collects the records it is handed."""
+
+    @callback
+    def collect(batch):
+        """Collect a batch."""
+        records.extend(batch)
+
+    return collect
+
+
+def test_record_from_state():
+    """Test states are normalized."""
+    state = State(
+        "sensor.temperature",
+        "21.5",
+        {"unit_of_measurement": "°C", "friendly_name": "Temp", "battery": 90},
+    )
+    record = StateRecord.from_state(state, None)
+
+    assert record.entity_id == "sensor.temperature"
+    assert record.domain == "sensor"
+    assert record.object_id == "temperature"
+    assert record.value == 21.5
+    assert record.state_is_number
+    assert record.unit == "°C"
+    assert record.numeric_attributes == {"battery": 90}
+    assert record.new_state is state
+
+    record = StateRecord.from_state(State("light.kitchen", "on"), None)
+    assert record.value == 1
+    assert not record.state_is_number
+
+    record = StateRecord.from_state(State("media_player.tv", "playing"), None)
+    assert record.value is None
+    assert not record.state_is_number
+
+
+async def test_records_built_once(hass):
+    """Test one record is built for all exporters of a state change."""
+    first = []
+    second = []
+    async_subscribe(hass, "first", _collector(first))
+    async_subscribe(
+        hass,
+        "second",
+        _collector(second),
+        lambda entity_id: entity_id.startswith("light."),
+    )
+
+    with patch.object(
+        StateRecord, "from_state", wraps=StateRecord.from_state
+    ) as mock_from_state:
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_set("switch.fan", "off")
+        await hass.async_block_till_done()
+
+    assert mock_from_state.call_count == 2
+    assert [record.entity_id for record in first] == ["light.kitchen", "switch.fan"]
+    assert [record.entity_id for record in second] == ["light.kitchen"]
+    assert first[0] is second[0]
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+
+
+async def test_filter_cached(hass):
+    """Test filters are called once per entity."""
+    calls = []
+
+    def entity_filter(entity_id):
+        calls.append(entity_id)
+        return True
+
+    async_subscribe(hass, "test", callback(lambda records: None), entity_filter)
+
+    for value in range(3):
+        hass.states.async_set("light.kitchen", str(value))
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen"]
+
+
+async def test_removed_states_not_exported(hass):
+    """Test removed entities are not handed to exporters."""
+    records = []
+    async_subscribe(hass, "test", _collector(records))
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+
+    assert len(records) == 1
+
+
+async def test_batches_while_busy(hass):
+    """Test records pile up into one batch while the exporter is busy."""
+    batches = []
+    release = threading.Event()
+
+    def export(records):
+        release.wait(5)
+        batches.append([record.state for record in records])
+
+    async_subscribe(hass, "test", export, batch_size=3)
+
+    for value in range(6):
+        hass.states.async_set("sensor.test", str(value))
+
+    release.set()
+    await hass.async_block_till_done()
+
+    assert batches == [["0"], ["1", "2", "3"], ["4", "5"]]
+
+
+async def test_max_queue_drops_oldest(hass):
+    """Test the oldest records are dropped when an exporter falls behind."""
+    batches = []
+    release = threading.Event()
+
+    def export(records):
+        release.wait(5)
+        batches.append([record.state for record in records])
+
+    async_subscribe(hass, "test", export, batch_size=2, max_queue=2)
+
+    for value in range(5):
+        hass.states.async_set("sensor.test", str(value))
+
+    release.set()
+    await hass.async_block_till_done()
+
+    assert batches == [["0"], ["3", "4"]]
+    assert state_exporter.async_export_stats(hass) == [
+        {
+            "name": "test",
+            "queued": 0,
+            "exported": 3,
+            "dropped": 2,
+            "batches": 2,
+            "errors": 0,
+        }
+    ]
+
+
+async def test_removals(hass):
+    """Test removed entities are only handed to exporters asking for them."""
+    records = []
+    removals = []
+    async_subscribe(hass, "test", _collector(records))
+    async_subscribe(hass, "removals", _collector(removals), removals=True)
+
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_remove("sensor.test")
+    await hass.async_block_till_done()
+
+    assert [record.removed for record in records] == [False]
+    assert [record.removed for record in removals] == [False, True]
+    assert removals[1].entity_id == "sensor.test"
+    assert removals[1].new_state is None
+
+
+async def test_exporter_stats(hass):
+    """Test the counters of an exporter are added to the subscription's."""
+    async_subscribe(hass, "test", lambda records: None, stats=lambda: {"sent": 1})
+
+    assert state_exporter.async_export_stats(hass)[0]["exporter"] == {"sent": 1}
+
+
+async def test_batch_timeout(hass):
+    """Test partial batches wait for more records, and are flushed on stop."""
+    records = []
+    async_subscribe(hass, "test", _collector(records), batch_size=3, batch_timeout=60)
+
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_set("sensor.test", "2")
+    await hass.async_block_till_done()
+    assert records == []
+
+    hass.states.async_set("sensor.test", "3")
+    await hass.async_block_till_done()
+    assert len(records) == 3
+
+    hass.states.async_set("sensor.test", "4")
+    await hass.async_block_till_done()
+    assert len(records) == 3
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert len(records) == 4
+
+
+async def test_coroutine_exporter(hass):
+    """Test coroutine functions export batches."""
+    records = []
+
+    async def export(batch):
+        await asyncio.sleep(0)
+        records.extend(batch)
+
+    async_subscribe(hass, "test", export)
+    hass.states.async_set("sensor.test", "1")
+    await hass.async_block_till_done()
+
+    assert len(records) == 1
+
+
+async def test_exporter_error(hass, caplog):
+    """Test an error of an exporter does not stop the next batches."""
+    batches = []
+
+    def export(records):
+        batches.append(records)
+        if len(batches) == 1:
+            raise ValueError("Boom")
+
+    @callback
+    def failing_callback(records):
+        raise ValueError("Bang")
+
+    async_subscribe(hass, "test", export)
+    async_subscribe(hass, "failing", failing_callback)
+
+    hass.states.async_set("sensor.test", "1")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.test", "2")
+    await hass.async_block_till_done()
+
+    assert len(batches) == 2
+    assert "Error exporting states to test" in caplog.text
+    assert "Error exporting states to failing" in caplog.text
+    assert [stats["errors"] for stats in state_exporter.async_export_stats(hass)] == [
+        1,
+        2,
+    ]
+
+
+async def test_unsubscribe(hass):
+    """Test unsubscribing stops the records, and the listener with the last one."""
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    records = []
+    unsub = async_subscribe(hass, "test", _collector(records))
+
+    hass.states.async_set("sensor.test", "1")
+    await hass.async_block_till_done()
+    unsub()
+    hass.states.async_set("sensor.test", "2")
+    await hass.async_block_till_done()
+
+    assert len(records) == 1
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+
+
+async def test_subscribe_from_thread(hass):
+    """Test subscribing from a worker thread."""
+    records = []
+
+    unsub = await hass.async_add_executor_job(
+        state_exporter.subscribe, hass, "test", _collector(records)
+    )
+    hass.states.async_set("sensor.test", "1")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(unsub)
+
+    assert len(records) == 1
+    assert state_exporter.async_export_stats(hass) == []
@@ -10,7 +10,7 @@ from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.helpers import storage
 from homeassistant.util import dt
 
-from tests.common import async_fire_time_changed, mock_coro
+from tests.common import async_fire_time_changed, flush_store, mock_coro
 
 
 MOCK_VERSION = 1
@@ -18,6 +18,10 @@ MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
 
+# The hass fixture mocks loading and writing of stores
+ORIG_ASYNC_LOAD = storage.Store._async_load
+ORIG_WRITE_DATA = storage.Store._write_data
+
 
 @pytest.fixture
 def store(hass):
@@ -188,3 +192,227 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+def test_journal_diff_apply():
+    """Test journal operations turn the old document into the new one."""
+    old = {
+        "version": 1,
+        "data": {"entities": [{"id": 1}, {"id": 2}, {"id": 3}], "name": "a"},
+    }
+    new = {
+        "version": 2,
+        "data": {"entities": [{"id": 1}, {"id": 3}, {"id": 4}], "other": None},
+    }
+    ops = []
+    storage._journal_diff(old, new, [], ops)
+
+    assert storage._journal_apply(json.loads(json.dumps(old)), ops) == new
+    # Unchanged parts of the document are not recorded
+    assert ["s", ["data", "entities", 0], {"id": 1}] not in ops
+
+
+def test_journal_diff_types():
+    """Test values that are equal but of another type are journaled."""
+    ops = []
+    storage._journal_diff(
+        {"a": 1, "b": [1], "c": {"d": 1}},
+        {"a": 1.0, "b": [True], "c": {"d": 1}},
+        [],
+        ops,
+    )
+
+    assert ops == [["s", ["a"], 1.0], ["s", ["b", 0], True]]
+
+
+def test_journal_append_and_load(tmpdir):
+    """Test saves are appended to the journal and replayed on load."""
+    path = str(tmpdir.join("storage-test"))
+    entities = [{"id": idx, "name": "Entity {}".format(idx)} for idx in range(100)]
+
+    journal = storage.StoreJournal(MOCK_KEY)
+    journal.write(path, {"version": 1, "data": {"entities": entities}}, False)
+    base_size = tmpdir.join("storage-test").size()
+
+    entities.append({"id": 100, "name": "New"})
+    entities[5]["name"] = "Renamed"
+    journal.write(path, {"version": 1, "data": {"entities": entities}}, False)
+
+    # The store file is untouched, only the change was appended
+    assert tmpdir.join("storage-test").size() == base_size
+    assert tmpdir.join("storage-test.journal").size() < 200
+
+    loaded = storage.StoreJournal(MOCK_KEY).load(path)
+    assert loaded == {"version": 1, "data": {"entities": entities}}
+
+
+def test_journal_torn_record(tmpdir):
+    """Test an incomplete journal record is dropped."""
+    path = str(tmpdir.join("storage-test"))
+    journal = storage.StoreJournal(MOCK_KEY)
+    journal.write(path, {"data": {"a": 1}}, False)
+    journal.write(path, {"data": {"a": 2}}, False)
+
+    with open(path + storage.JOURNAL_SUFFIX, "a") as fdesc:
+        fdesc.write('[["s",["data","a"],')
+
+    journal = storage.StoreJournal(MOCK_KEY)
+    assert journal.load(path) == {"data": {"a": 2}}
+
+    journal.write(path, {"data": {"a": 3}}, False)
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {"data": {"a": 3}}
+
+
+def test_journal_stale(tmpdir):
+    """Test a journal is ignored if the store file changed."""
+    path = str(tmpdir.join("storage-test"))
+    journal = storage.StoreJournal(MOCK_KEY)
+    journal.write(path, {"data": {"a": 1}}, False)
+    journal.write(path, {"data": {"a": 2}}, False)
+
+    with open(path, "w") as fdesc:
+        fdesc.write('{"data": {"a": "edited"}}')
+
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {"data": {"a": "edited"}}
+
+
+def test_journal_compact(tmpdir):
+    """Test the journal is folded into the store file when it grows."""
+    path = str(tmpdir.join("storage-test"))
+    journal = storage.StoreJournal(MOCK_KEY)
+    journal.write(path, {"data": {"counter": 0}}, False)
+
+    with patch.object(storage, "JOURNAL_MIN_COMPACT_SIZE", 100):
+        for counter in range(1, 20):
+            journal.write(path, {"data": {"counter": counter}}, False)
+
+        assert journal.needs_compaction
+
+    assert tmpdir.join("storage-test.journal").size() > 100
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {"data": {"counter": 19}}
+
+    journal.compact(path, False)
+    assert json.loads(tmpdir.join("storage-test").read()) == {"data": {"counter": 19}}
+
+
+async def test_journal_collection(hass, tmpdir):
+    """Test saves passing the changed items only serialize those."""
+    items = {"a": {"id": "a", "value": 1}, "b": {"id": "b", "value": 2}}
+    data_func = Mock(side_effect=lambda: {"items": list(items.values())})
+    item_func = Mock(side_effect=items.get)
+    path = str(tmpdir.join("storage-test"))
+
+    with patch.object(storage.Store, "path", path), patch.object(
+        storage.Store, "_async_load", ORIG_ASYNC_LOAD
+    ), patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA):
+        store = storage.Store(
+            hass,
+            MOCK_VERSION,
+            MOCK_KEY,
+            journal=True,
+            journal_collections={
+                "items": storage.JournalCollection(["items"], ["id"], item_func)
+            },
+        )
+        assert await store.async_load() is None
+
+        # Nothing to append to yet, the whole data is written
+        store.async_delay_save(data_func, 10, changed={"items": ["a"]})
+        await flush_store(store)
+        assert data_func.call_count == 1
+        assert item_func.call_count == 0
+
+        del items["a"]
+        items["b"] = {"id": "b", "value": 2.0}
+        items["c"] = {"id": "c", "value": 3}
+        store.async_delay_save(data_func, 10, changed={"items": ["a", "b"]})
+        store.async_delay_save(data_func, 10, changed={"items": ["c"]})
+        await flush_store(store)
+
+    assert data_func.call_count == 1
+    assert item_func.call_count == 3
+
+    records = tmpdir.join("storage-test.journal").readlines()
+    assert len(records) == 2
+    assert sorted(op[0] for op in json.loads(records[1])) == ["p", "p", "x"]
+
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {
+        "version": MOCK_VERSION,
+        "key": MOCK_KEY,
+        "data": {"items": list(items.values())},
+    }
+
+
+async def test_journal_background_compact(hass, tmpdir):
+    """Test saves compact the journal in the background once it grew."""
+    path = str(tmpdir.join("storage-test"))
+
+    with patch.object(storage.Store, "path", path), patch.object(
+        storage.Store, "_write_data", ORIG_WRITE_DATA
+    ), patch.object(storage, "JOURNAL_MIN_COMPACT_SIZE", 100):
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+
+        for counter in range(20):
+            await store.async_save({"counter": counter})
+
+        await hass.async_block_till_done()
+
+    assert tmpdir.join("storage-test.journal").size() < 100
+    assert json.loads(tmpdir.join("storage-test").read())["data"]["counter"] >= 5
+    assert storage.StoreJournal(MOCK_KEY).load(path)["data"] == {"counter": 19}
+
+
+async def test_journal_migration(hass, tmpdir):
+    """Test the first save after a migration replaces the old layout."""
+    path = str(tmpdir.join("storage-test"))
+    storage.StoreJournal(MOCK_KEY).write(
+        path, {"version": 1, "key": MOCK_KEY, "data": {"entries": [{"id": "a"}]}}, False
+    )
+    items = {"a": {"id": "a", "value": 2}}
+
+    class MigratingStore(storage.Store):
+        """Store that migrates entries to items."""
+
+        async def _async_migrate_func(self, old_version, old_data):
+            """Migrate to the new version."""
+            return {"items": [dict(entry, value=1) for entry in old_data["entries"]]}
+
+    with patch.object(storage.Store, "path", path), patch.object(
+        storage.Store, "_async_load", ORIG_ASYNC_LOAD
+    ), patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA):
+        store = MigratingStore(
+            hass,
+            2,
+            MOCK_KEY,
+            journal=True,
+            journal_collections={
+                "items": storage.JournalCollection(["items"], ["id"], items.get)
+            },
+        )
+        assert await store.async_load() == {"items": [{"id": "a", "value": 1}]}
+
+        await store.async_save(
+            {"items": list(items.values())}, changed={"items": ["a"]}
+        )
+
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {
+        "version": 2,
+        "key": MOCK_KEY,
+        "data": {"items": [{"id": "a", "value": 2}]},
+    }
+
+
+def test_journal_items_replay(tmpdir):
+    """Test item operations are replayed in order, also after other ones."""
+    path = str(tmpdir.join("storage-test"))
+    collection = storage.JournalCollection(["items"], ["id"], None)
+    journal = storage.StoreJournal(MOCK_KEY)
+    journal.write(path, {"data": {"items": [{"id": 1}, {"id": 2}]}}, False)
+
+    journal.write_items(path, [(collection, 1, None), (collection, 3, {"id": 3})])
+    journal.write(path, {"data": {"items": [{"id": 0}, {"id": 2}, {"id": 3}]}}, False)
+    journal.write_items(path, [(collection, 2, {"id": 2, "x": 1})])
+
+    assert storage.StoreJournal(MOCK_KEY).load(path) == {
+        "data": {"items": [{"id": 0}, {"id": 2, "x": 1}, {"id": 3}]}
+    }
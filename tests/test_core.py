@@ -1,9 +1,12 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+import copy
 import functools
+import json
 import logging
 import os
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
@@ -45,43 +48,43 @@ def test_split_entity_id():
     assert ha.split_entity_id("domain.object_id") == ["domain", "object_id"]
 
 
-def test_async_add_job_schedule_callback():
+def test_async_add_hass_job_schedule_callback():
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock()
     job = MagicMock()
 
-    ha.HomeAssistant.async_add_job(hass, ha.callback(job))
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_partial_callback():
+def test_async_add_hass_job_schedule_partial_callback():
     """Test that we schedule partial coros and add jobs to the job pool."""
     hass = MagicMock()
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_coroutinefunction(loop):
+def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
 
     async def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_partial_coroutinefunction(loop):
+def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
 
@@ -90,25 +93,78 @@ def test_async_add_job_schedule_partial_coroutinefunction(loop):
 
     partial = functools.partial(job)
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_add_threaded_job_to_pool():
+def test_async_add_hass_job_add_threaded_job_to_pool():
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock()
 
     def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.loop.run_in_executor.mock_calls) == 1
 
 
+def test_async_add_job_classifies_target():
+    """Test that jobs are classified and added as jobs."""
+    hass = MagicMock()
+
+    async def job():
+        pass
+
+    ha.HomeAssistant.async_add_job(hass, job)
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+    hassjob = hass.async_add_hass_job.mock_calls[0][1][0]
+    assert hassjob.target is job
+    assert hassjob.job_type == ha.HassJobType.coroutine_function
+
+
+def test_async_add_job_schedule_coroutine(loop):
+    """Test that coroutine objects are scheduled as tasks."""
+    hass = MagicMock(loop=MagicMock(wraps=loop))
+
+    async def job():
+        pass
+
+    ha.HomeAssistant.async_add_job(hass, job())
+    assert len(hass.async_create_task.mock_calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 0
+
+
+def test_hass_job_type():
+    """Test that job targets are classified."""
+
+    async def coro_func():
+        pass
+
+    def func():
+        pass
+
+    @ha.callback
+    def callback_func():
+        pass
+
+    assert ha.HassJob(coro_func).job_type == ha.HassJobType.coroutine_function
+    assert (
+        ha.HassJob(functools.partial(functools.partial(coro_func))).job_type
+        == ha.HassJobType.coroutine_function
+    )
+    assert ha.HassJob(callback_func).job_type == ha.HassJobType.callback
+    assert ha.HassJob(func).job_type == ha.HassJobType.executor
+
+    coro = coro_func()
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+    coro.close()
+
+
 def test_async_create_task_schedule_coroutine(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
@@ -135,6 +191,32 @@ def test_async_run_job_calls_callback():
     assert len(hass.async_add_job.mock_calls) == 0
 
 
+def test_async_run_hass_job_calls_callback():
+    """Test that callback jobs are run right away."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 0
+
+
+def test_async_run_hass_job_delegates_non_async():
+    """Test that other jobs are scheduled."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(job))
+    assert len(calls) == 0
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+
+
 def test_async_run_job_delegates_non_async():
     """Test that the callback annotation is respected."""
     hass = MagicMock()
@@ -505,6 +587,21 @@ def test_state_dict_conversion():
     assert state == ha.State.from_dict(state.as_dict())
 
 
+def test_state_as_json_cached():
+    """Test the JSON representation is created once, the dict every time."""
+    state = ha.State("domain.hello", "world", {"some": "attr"})
+    as_dict = state.as_dict()
+
+    assert state.as_json() is state.as_json()
+    assert json.loads(state.as_json().decode())["attributes"] == {"some": "attr"}
+
+    # The caller owns the dict
+    assert state.as_dict() is not as_dict
+    as_dict["attributes"]["some"] = "changed"
+    assert state.attributes["some"] == "attr"
+    assert copy.deepcopy(as_dict) == as_dict
+
+
 def test_state_dict_conversion_with_wrong_data():
     """Test conversion with wrong data."""
     assert ha.State.from_dict(None) is None
@@ -1176,3 +1273,67 @@ def test_context():
     assert c.user_id == 23
     assert c.parent_id == 100
     assert c.id is not None
+
+
+async def test_unique_entity_id(hass):
+    """Test generating entity ids that are not in use."""
+    states = hass.states
+    reserved = {"light.kitchen_3"}
+
+    assert states.async_unique_entity_id("light.kitchen", reserved) == "light.kitchen"
+
+    states.async_set("light.kitchen", "on")
+    states.async_set("light.kitchen_2", "on")
+
+    assert states.async_unique_entity_id("light.kitchen", reserved) == "light.kitchen_4"
+
+    states.async_set("light.kitchen_4", "on")
+    states.async_set("light.kitchen_5", "on")
+
+    assert states.async_unique_entity_id("light.kitchen", reserved) == "light.kitchen_6"
+
+    # Freed suffixes are handed out again
+    states.async_remove("light.kitchen_2")
+
+    assert states.async_unique_entity_id("light.kitchen", reserved) == "light.kitchen_2"
+    assert states.async_unique_entity_id("light.kitchen") == "light.kitchen_2"
+
+    # Ids reserved in another container do not hide free suffixes
+    states.async_set("light.hall", "on")
+    many_reserved = {"light.hall_{}".format(idx) for idx in range(2, 100)}
+
+    assert (
+        states.async_unique_entity_id("light.hall", many_reserved) == "light.hall_100"
+    )
+    assert states.async_unique_entity_id("light.hall", reserved) == "light.hall_2"
+
+
+async def test_async_get_executor(hass):
+    """Test integrations with a configured pool size get their own executor."""
+    hass.config.executor_pools = {"snmp": 2, "camera": 1}
+
+    assert hass.async_get_executor("rest") is hass.executor
+    assert hass.async_get_executor() is hass.executor
+
+    snmp_executor = hass.async_get_executor("snmp", "sensor")
+    assert snmp_executor is not hass.executor
+    assert hass.async_get_executor("snmp") is snmp_executor
+
+    camera_executor = hass.async_get_executor("generic", "camera")
+    assert camera_executor not in (hass.executor, snmp_executor)
+
+    thread_name = await hass.async_add_executor_job(
+        lambda: threading.current_thread().name, executor=snmp_executor
+    )
+    assert thread_name.startswith("SyncWorker_snmp")
+
+    metrics = hass.async_executor_metrics()
+    assert set(metrics) == {"default", "snmp", "camera"}
+    assert metrics["snmp"]["max_workers"] == 2
+    assert metrics["snmp"]["completed"] == 1
+
+    with patch.object(snmp_executor, "shutdown") as mock_shutdown, patch.object(
+        hass.loop, "stop"
+    ):
+        await hass.async_stop(force=True)
+    assert len(mock_shutdown.mock_calls) == 1
@@ -7,6 +7,8 @@ from pytest import raises
 from homeassistant import setup
 from homeassistant.requirements import (
     CONSTRAINT_FILE,
+    DATA_PKG_CACHE,
+    STORAGE_KEY,
     async_get_integration_with_requirements,
     async_process_requirements,
     PROGRESS_FILE,
@@ -14,7 +16,13 @@ from homeassistant.requirements import (
     RequirementsNotFound,
 )
 
-from tests.common import get_test_home_assistant, MockModule, mock_integration
+from tests.common import (
+    flush_store,
+    get_test_home_assistant,
+    MockModule,
+    mock_integration,
+    mock_storage,
+)
 
 
 class TestRequirements:
@@ -22,15 +30,19 @@ class TestRequirements:
 
     hass = None
     backup_cache = None
+    storage = None
 
     # pylint: disable=invalid-name, no-self-use
     def setup_method(self, method):
         """Set up the test."""
+        self.storage = mock_storage()
+        self.storage.__enter__()
         self.hass = get_test_home_assistant()
 
     def teardown_method(self, method):
         """Clean up."""
         self.hass.stop()
+        self.storage.__exit__(None, None, None)
 
     @patch("os.path.dirname")
     @patch("homeassistant.util.package.is_virtual_env", return_value=True)
@@ -182,3 +194,48 @@ async def test_progress_lock(hass):
         _install(hass, "hello", kwargs)
 
     assert not progress_path.exists()
+
+
+async def test_satisfied_requirements_cached(hass, hass_storage):
+    """Test satisfied requirements are not checked again."""
+    with patch(
+        "homeassistant.util.package.environment_fingerprint", return_value="abc"
+    ), patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 1
+
+    await flush_store(hass.data[DATA_PKG_CACHE]._store)
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        "fingerprint": "abc",
+        "satisfied": ["hello==1.0.0"],
+    }
+
+    # A new run with the same environment doesn't check at all
+    hass.data.pop(DATA_PKG_CACHE)
+    with patch(
+        "homeassistant.util.package.environment_fingerprint", return_value="abc"
+    ), patch("homeassistant.util.package.is_installed") as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 0
+
+
+async def test_requirements_cache_changed_environment(hass, hass_storage):
+    """Test the cache is discarded when the environment changed."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "data": {"fingerprint": "abc", "satisfied": ["hello==1.0.0"]},
+    }
+
+    with patch(
+        "homeassistant.util.package.environment_fingerprint", return_value="def"
+    ), patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 1
@@ -107,6 +107,82 @@ def test_run_callback_threadsafe_from_inside_event_loop(mock_ident, _):
     assert len(loop.call_soon_threadsafe.mock_calls) == 2
 
 
+def test_threadsafe_callback_queue_coalesces():
+    """Test the loop is woken up once for callbacks added before they run."""
+    loop = MagicMock()
+    loop.is_closed.return_value = False
+    queue = hasync.ThreadsafeCallbackQueue(loop)
+    calls = []
+
+    queue.call_soon(calls.append, 1)
+    queue.call_soon(calls.append, 2)
+    assert len(loop.call_soon_threadsafe.mock_calls) == 1
+    assert queue.as_dict()["depth"] == 2
+
+    run = loop.call_soon_threadsafe.mock_calls[0][1][0]
+    run()
+    assert calls == [1, 2]
+
+    queue.call_soon(calls.append, 3)
+    assert len(loop.call_soon_threadsafe.mock_calls) == 2
+
+    metrics = queue.as_dict()
+    assert metrics["depth"] == 1
+    assert metrics["max_depth"] == 2
+    assert metrics["batches"] == 1
+    assert metrics["calls"] == 2
+    assert metrics["latency_sum"] >= metrics["max_latency"] >= 0
+
+
+def test_threadsafe_callback_queue_exception():
+    """Test a failing callback does not stop the other callbacks."""
+    loop = MagicMock()
+    loop.is_closed.return_value = False
+    queue = hasync.ThreadsafeCallbackQueue(loop)
+    calls = []
+
+    def fail():
+        raise ValueError
+
+    queue.call_soon(fail)
+    queue.call_soon(calls.append, 1)
+    loop.call_soon_threadsafe.mock_calls[0][1][0]()
+
+    assert calls == [1]
+    assert len(loop.call_exception_handler.mock_calls) == 1
+    context = loop.call_exception_handler.mock_calls[0][1][0]
+    assert isinstance(context["exception"], ValueError)
+
+
+def test_threadsafe_callback_queue_closed_loop():
+    """Test adding a callback when the loop is closed."""
+    loop = MagicMock()
+    loop.is_closed.return_value = False
+    loop.call_soon_threadsafe.side_effect = RuntimeError
+    queue = hasync.ThreadsafeCallbackQueue(loop)
+
+    with pytest.raises(RuntimeError):
+        queue.call_soon(lambda: None)
+
+    loop.call_soon_threadsafe.side_effect = None
+    queue.call_soon(lambda: None)
+    assert len(loop.call_soon_threadsafe.mock_calls) == 2
+    assert queue.as_dict()["depth"] == 1
+
+
+def test_threadsafe_callback_queue_closed_while_pending():
+    """Test adding a callback raises when the loop closed before the run."""
+    loop = asyncio.new_event_loop()
+    queue = hasync.ThreadsafeCallbackQueue(loop)
+    queue.call_soon(lambda: None)
+    loop.close()
+
+    with pytest.raises(RuntimeError):
+        queue.call_soon(lambda: None)
+
+    assert queue.as_dict()["depth"] == 0
+
+
 class RunThreadsafeTests(TestCase):
     """Test case for hasync.run_coroutine_threadsafe."""
 
@@ -250,3 +326,19 @@ class RunThreadsafeTests(TestCase):
         with self.assertRaises(ValueError) as exc_context:
             self.loop.run_until_complete(future)
         self.assertIn("Invalid!", exc_context.exception.args)
+
+    def test_threadsafe_callback_queue(self):
+        """Test callbacks added from a thread run in the loop in order."""
+        queue = hasync.ThreadsafeCallbackQueue(self.loop)
+        calls = []
+        done = asyncio.Event(loop=self.loop)
+
+        def add_callbacks():
+            for i in range(100):
+                queue.call_soon(calls.append, i)
+            queue.call_soon(done.set)
+
+        self.loop.run_until_complete(self.loop.run_in_executor(None, add_callbacks))
+        self.loop.run_until_complete(done.wait())
+        self.assertEqual(calls, list(range(100)))
+        self.assertEqual(queue.calls, 101)
@@ -0,0 +1,60 @@
+"""Test the instrumented executor."""
+import threading
+
+from homeassistant.util.executor import InstrumentedThreadPoolExecutor
+
+
+def test_executor_metrics():
+    """Test the metrics of the executor jobs."""
+    executor = InstrumentedThreadPoolExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_job(value):
+        """Block until released."""
+        started.set()
+        release.wait()
+        return value
+
+    first = executor.submit(blocking_job, 1)
+    started.wait()
+    second = executor.submit(lambda: 2)
+    cancelled = executor.submit(lambda: 3)
+
+    metrics = executor.as_dict()
+    assert metrics["max_workers"] == 1
+    assert metrics["workers"] == 1
+    assert metrics["active"] == 1
+    assert metrics["queued"] == 2
+
+    assert cancelled.cancel()
+    assert executor.as_dict()["queued"] == 1
+
+    release.set()
+    assert first.result() == 1
+    assert second.result() == 2
+    executor.shutdown()
+
+    metrics = executor.as_dict()
+    assert metrics["active"] == 0
+    assert metrics["queued"] == 0
+    assert metrics["completed"] == 2
+    assert metrics["duration_sum"] >= metrics["max_duration"] > 0
+    assert metrics["wait_sum"] > 0
+
+
+def test_executor_job_exception():
+    """Test failing jobs are counted and raise."""
+    executor = InstrumentedThreadPoolExecutor(max_workers=1)
+
+    def fail():
+        """Fail."""
+        raise ValueError
+
+    future = executor.submit(fail)
+    assert isinstance(future.exception(), ValueError)
+    executor.shutdown()
+
+    metrics = executor.as_dict()
+    assert metrics["completed"] == 1
+    assert metrics["active"] == 0
@@ -1,14 +1,25 @@
 """Test Home Assistant json utility functions."""
+from datetime import datetime
 from json import JSONEncoder
 import os
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import sys
 from tempfile import mkdtemp
 
 import pytest
 
-from homeassistant.util.json import SerializationError, load_json, save_json
+from homeassistant.util import json as json_util
+from homeassistant.util.json import (
+    SerializationError,
+    json_bytes,
+    json_dumps,
+    json_encoder_default,
+    json_loads,
+    load_json,
+    register_json_converter,
+    save_json,
+)
 from homeassistant.exceptions import HomeAssistantError
 
 
@@ -100,3 +111,93 @@ def test_custom_encoder():
     save_json(fname, Mock(), encoder=MockJSONEncoder)
     data = load_json(fname)
     assert data == "9"
+
+
+def test_json_dumps_home_assistant_objects():
+    """Test the codec converts datetimes, sets and objects with as_dict."""
+
+    class MockObject:
+        """Mock object with a dict representation."""
+
+        def as_dict(self):
+            """Return a dict."""
+            return {"mock": True}
+
+    now = datetime(2019, 8, 26, 12, 0, 0)
+    data = {"now": now, "set": {1}, "obj": MockObject()}
+    expected = {"now": now.isoformat(), "set": [1], "obj": {"mock": True}}
+
+    assert json_loads(json_dumps(data)) == expected
+    assert json_loads(json_bytes(data)) == expected
+
+    with pytest.raises(TypeError):
+        json_encoder_default(object())
+
+
+def test_json_dumps_registered_converter():
+    """Test converters registered for a type take precedence."""
+
+    class MockObject:
+        """Mock object."""
+
+    register_json_converter(MockObject, lambda obj: "converted")
+    assert json_dumps([MockObject()]) == '["converted"]'
+
+
+def test_json_dumps_sorted():
+    """Test keys can be sorted."""
+    dumped = json_dumps({"b": 1, "a": 2}, sort_keys=True)
+    assert json_loads(dumped) == {"a": 2, "b": 1}
+    assert dumped.index('"a"') < dumped.index('"b"')
+
+
+@pytest.fixture
+def mock_orjson():
+    """Install a fake orjson module as the backend."""
+    orjson = Mock(OPT_NON_STR_KEYS=1, OPT_SORT_KEYS=2, OPT_INDENT_2=4)
+    orjson.dumps.return_value = b'"orjson"'
+
+    with patch.object(json_util, "orjson", orjson, create=True), patch.object(
+        json_util, "HAS_ORJSON", True
+    ):
+        yield orjson
+
+
+def test_orjson_backend(mock_orjson):
+    """Test orjson encodes when it supports the arguments."""
+    assert json_dumps({"a": 1}) == '"orjson"'
+    assert json_bytes({"a": 1}, sort_keys=True, indent=2) == b'"orjson"'
+
+    assert mock_orjson.dumps.call_count == 2
+    assert mock_orjson.dumps.mock_calls[0][2]["option"] == 1
+    assert mock_orjson.dumps.mock_calls[1][2]["option"] == 1 | 2 | 4
+    assert mock_orjson.dumps.mock_calls[0][2]["default"] is json_encoder_default
+
+
+def test_orjson_disallow_nan(mock_orjson):
+    """Test orjson also encodes when NaN is not allowed."""
+    assert json_dumps({"a": float("nan")}, allow_nan=False) == '"orjson"'
+    assert json_bytes({"a": float("nan")}, allow_nan=False) == b'"orjson"'
+    assert mock_orjson.dumps.call_count == 2
+
+
+def test_orjson_fallback(mock_orjson):
+    """Test arguments orjson does not support use the standard library."""
+    assert json_dumps({"a": 1}, indent=4) == '{\n    "a": 1\n}'
+
+    class MockJSONEncoder(JSONEncoder):
+        """Mock JSON encoder."""
+
+    assert json_bytes({"a": 1}, encoder=MockJSONEncoder) == b'{"a": 1}'
+    assert mock_orjson.dumps.call_count == 0
+
+
+def test_orjson_save_json(mock_orjson):
+    """Test files are written with an indent of 4 with orjson installed."""
+    fname = _path_for("test1")
+    save_json(fname, TEST_JSON_A)
+
+    with open(fname) as fdesc:
+        assert fdesc.read() == '{\n    "B": "two",\n    "a": 1\n}'
+
+    assert mock_orjson.dumps.call_count == 0
@@ -2,6 +2,7 @@
 import asyncio
 import logging
 import threading
+from unittest.mock import MagicMock
 
 import homeassistant.util.logging as logging_util
 
@@ -81,3 +82,36 @@ async def test_async_create_catching_coro(hass, caplog):
         "hass.async_create_task("
         "logging_util.async_create_catching_coro(job()))" in caplog.text
     )
+
+
+async def test_async_handler_drops_when_full(loop):
+    """Test records are dropped and reported when the queue is full."""
+    base_handler = MagicMock(spec=logging.Handler)
+    writing = threading.Event()
+    block = threading.Event()
+
+    def blocking_emit(record):
+        """Block the writer thread on the first record."""
+        writing.set()
+        block.wait()
+
+    base_handler.emit.side_effect = blocking_emit
+
+    handler = logging_util.AsyncHandler(loop, base_handler, max_queue_size=2)
+    handler.emit(logging.makeLogRecord({"msg": "Record 0"}))
+    await loop.run_in_executor(None, writing.wait)
+
+    for idx in range(1, 5):
+        handler.emit(logging.makeLogRecord({"msg": "Record {}".format(idx)}))
+
+    block.set()
+    await handler.async_close(True)
+
+    assert [call[1][0].getMessage() for call in base_handler.emit.mock_calls] == [
+        "Record 0",
+        "Record 1",
+        "Record 2",
+        "Dropped 2 log records because the log writer could not keep up",
+    ]
+    assert handler.dropped == 2
+    assert base_handler.close.called
@@ -250,3 +250,18 @@ def test_check_package_global():
 def test_check_package_zip():
     """Test for an installed zip package."""
     assert not package.is_installed(TEST_ZIP_REQ)
+
+
+def test_environment_fingerprint(tmpdir):
+    """Test only package directories are part of the fingerprint."""
+    site_packages = tmpdir.mkdir("lib").mkdir("site-packages")
+    config = tmpdir.mkdir("config")
+
+    with patch.object(sys, "path", ["", str(config), str(site_packages)]):
+        fingerprint = package.environment_fingerprint()
+
+        config.join("new.yaml").write("")
+        assert package.environment_fingerprint() == fingerprint
+
+        site_packages.mkdir("new_package")
+        assert package.environment_fingerprint() != fingerprint